@@ -7,11 +7,36 @@ Este arquivo permite que o diretório seja tratado como um pacote Python.
 from .indicadores import IndicadoresTecnicos
 from .price_action import PriceAction
 from .estrategias import EstrategiasTrading
-from .gerenciamento_risco import GerenciamentoRisco
+from .gerenciamento_risco import GerenciamentoRisco, TrailingStopIncremental
+from .niveis import AgrupadorNiveis, RastreadorSuporteResistencia
+from .painel import montar_painel
+from .precisao import definir_precisao, usar_precisao
+from .indicadores_incrementais import (
+    MediaMovelSimplesIncremental,
+    MediaMovelExponencialIncremental,
+    MACDIncremental,
+    RSIIncremental,
+    BandasBollingerIncremental,
+    EstocasticoIncremental,
+    ATRIncremental
+)
 
 __all__ = [
     'IndicadoresTecnicos',
     'PriceAction',
     'EstrategiasTrading',
-    'GerenciamentoRisco'
+    'GerenciamentoRisco',
+    'TrailingStopIncremental',
+    'AgrupadorNiveis',
+    'RastreadorSuporteResistencia',
+    'montar_painel',
+    'definir_precisao',
+    'usar_precisao',
+    'MediaMovelSimplesIncremental',
+    'MediaMovelExponencialIncremental',
+    'MACDIncremental',
+    'RSIIncremental',
+    'BandasBollingerIncremental',
+    'EstocasticoIncremental',
+    'ATRIncremental'
 ]
@@ -0,0 +1,312 @@
+"""
+Módulo de Armazenamento Local de Dados Históricos para o Robô Trader
+
+Este módulo guarda barras OHLCV em disco, uma pasta por ativo e intervalo,
+com um arquivo binário por coluna (valores NumPy contíguos, sem cabeçalho)
+e um arquivo de metadados (meta.json) com os tipos, o fuso horário e o
+número de barras.
+
+A leitura usa mapeamento em memória (numpy.memmap): o trecho de datas
+pedido é localizado por busca binária no arquivo de datas e apenas as
+páginas desse trecho são lidas do disco. Novas barras são acrescentadas ao
+fim dos arquivos (as barras armazenadas a partir da primeira data recebida
+são regravadas, o que substitui a barra ainda em formação de um download
+anterior), e o número de barras em meta.json só é atualizado depois que
+todas as colunas foram gravadas, de modo que uma gravação interrompida
+nunca fica visível para a leitura.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Diretório padrão do armazenamento
+DIRETORIO_PADRAO = '/home/ubuntu/robo_trader/dados'
+
+# Colunas gravadas (além das datas), na ordem dos arquivos
+COLUNAS_OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+class ArmazemDados:
+    """
+    Armazenamento colunar de barras OHLCV, particionado por ativo e intervalo.
+    
+    Uso:
+        armazem = ArmazemDados()
+        armazem.acrescentar('PETR4.SA', '1d', dados)
+        dados = armazem.carregar('PETR4.SA', '1d', inicio='2024-01-01')
+    """
+    
+    def __init__(self, diretorio=DIRETORIO_PADRAO):
+        """
+        Inicializa o armazenamento.
+        
+        Args:
+            diretorio (str): Diretório raiz dos dados.
+        """
+        self.diretorio = diretorio
+    
+    def _pasta(self, symbol, intervalo):
+        """
+        Pasta de um ativo e intervalo (símbolos com '/' ou '^' viram nomes de pasta seguros).
+        """
+        nome = symbol.replace('/', '_').replace('^', '_')
+        return os.path.join(self.diretorio, nome, str(intervalo))
+    
+    def _ler_meta(self, pasta):
+        """
+        Lê os metadados de uma pasta (None se ela ainda não tiver dados).
+        """
+        caminho = os.path.join(pasta, 'meta.json')
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho) as f:
+            return json.load(f)
+    
+    def _gravar_meta(self, pasta, meta):
+        """
+        Grava os metadados de forma atômica (arquivo temporário + substituição).
+        """
+        caminho = os.path.join(pasta, 'meta.json')
+        with open(caminho + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(caminho + '.tmp', caminho)
+    
+    def _mapear(self, pasta, coluna, tipo, barras):
+        """
+        Mapeia em memória as `barras` primeiras posições de uma coluna (somente leitura).
+        """
+        if barras == 0:
+            return np.empty(0, dtype=tipo)
+        return np.memmap(os.path.join(pasta, f'{coluna}.bin'), dtype=tipo, mode='r', shape=(barras,))
+    
+    def ativos(self):
+        """
+        Lista os ativos e intervalos armazenados.
+        
+        Returns:
+            list: Tuplas (symbol, intervalo), em ordem alfabética.
+        """
+        if not os.path.isdir(self.diretorio):
+            return []
+        return sorted(
+            (symbol, intervalo)
+            for symbol in os.listdir(self.diretorio)
+            if os.path.isdir(os.path.join(self.diretorio, symbol))
+            for intervalo in os.listdir(os.path.join(self.diretorio, symbol))
+            if os.path.exists(os.path.join(self.diretorio, symbol, intervalo, 'meta.json'))
+        )
+    
+    def resumo(self, symbol, intervalo):
+        """
+        Informa o número de barras e as datas extremas armazenadas.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras ('1d', '5m'...).
+        
+        Returns:
+            dict: 'barras', 'inicio' e 'fim' (None se não houver dados).
+        """
+        pasta = self._pasta(symbol, intervalo)
+        meta = self._ler_meta(pasta)
+        if meta is None or meta['barras'] == 0:
+            return None
+        
+        datas = self._mapear(pasta, 'data', np.int64, meta['barras'])
+        extremos = self._converter_datas(np.array([datas[0], datas[-1]]), meta['fuso'])
+        return {'barras': meta['barras'], 'inicio': extremos[0], 'fim': extremos[1]}
+    
+    @staticmethod
+    def _valores_datas(indice):
+        """
+        Converte o índice em nanossegundos int64 (datas com fuso: em UTC) e devolve o fuso.
+        """
+        if not isinstance(indice, pd.DatetimeIndex):
+            raise ValueError("Os dados precisam de um índice de datas.")
+        fuso = str(indice.tz) if indice.tz is not None else None
+        if fuso is not None:
+            indice = indice.tz_convert('UTC').tz_localize(None)
+        return indice.as_unit('ns').asi8, fuso
+    
+    @staticmethod
+    def _converter_datas(valores, fuso):
+        """
+        Reconstrói o índice de datas a partir dos valores gravados.
+        """
+        indice = pd.DatetimeIndex(np.asarray(valores).view('datetime64[ns]'))
+        return indice.tz_localize('UTC').tz_convert(fuso) if fuso is not None else indice
+    
+    def salvar(self, symbol, intervalo, dados):
+        """
+        Grava os dados de um ativo, substituindo os existentes.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras.
+            dados (pandas.DataFrame): Dados OHLCV com índice de datas em ordem crescente.
+        """
+        pasta = self._pasta(symbol, intervalo)
+        os.makedirs(pasta, exist_ok=True)
+        self._gravar_meta(pasta, {'barras': 0, 'fuso': None, 'colunas': {}})
+        for arquivo in os.listdir(pasta):
+            if arquivo.endswith('.bin'):
+                os.remove(os.path.join(pasta, arquivo))
+        self.acrescentar(symbol, intervalo, dados)
+    
+    def acrescentar(self, symbol, intervalo, dados):
+        """
+        Acrescenta novas barras ao fim dos dados armazenados.
+        
+        As barras armazenadas a partir da primeira data recebida são
+        substituídas pelas recebidas, de modo que baixar de novo um período
+        que se sobrepõe ao armazenado não duplica barras e atualiza a última
+        barra gravada enquanto ainda estava em formação. Barras armazenadas
+        posteriores à última data recebida são mantidas depois dela.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras.
+            dados (pandas.DataFrame): Dados OHLCV com índice de datas em ordem crescente.
+        
+        Returns:
+            int: Número de barras gravadas (novas ou regravadas).
+        """
+        datas, fuso = self._valores_datas(dados.index)
+        if len(datas) > 1 and np.any(np.diff(datas) <= 0):
+            raise ValueError("As datas precisam ser estritamente crescentes.")
+        
+        pasta = self._pasta(symbol, intervalo)
+        os.makedirs(pasta, exist_ok=True)
+        meta = self._ler_meta(pasta) or {'barras': 0, 'fuso': fuso, 'colunas': {}}
+        colunas = [coluna for coluna in COLUNAS_OHLCV if coluna in dados.columns]
+        if meta['barras'] == 0:
+            meta['fuso'] = fuso
+            meta['colunas'] = {coluna: np.dtype(dados[coluna].dtype).str for coluna in colunas}
+        elif list(meta['colunas']) != colunas:
+            raise ValueError(f"Colunas {colunas} diferentes das armazenadas {list(meta['colunas'])}.")
+        elif meta['fuso'] != fuso:
+            raise ValueError(f"Fuso horário '{fuso}' diferente do armazenado '{meta['fuso']}'.")
+        
+        if len(datas) == 0:
+            return 0
+        arquivos = [('data', np.dtype(np.int64), datas)]
+        arquivos += [(coluna, np.dtype(tipo), dados[coluna].to_numpy()) for coluna, tipo in meta['colunas'].items()]
+        
+        # Regravar a partir da primeira data recebida, mantendo as barras armazenadas posteriores à última
+        barras = meta['barras']
+        inicio = barras
+        if barras > 0:
+            armazenadas = self._mapear(pasta, 'data', np.int64, barras)
+            inicio = int(np.searchsorted(armazenadas, datas[0], side='left'))
+            posteriores = int(np.searchsorted(armazenadas, datas[-1], side='right'))
+            if posteriores < barras:
+                arquivos = [
+                    (coluna, tipo, np.concatenate((np.asarray(valores, dtype=tipo),
+                                                   self._mapear(pasta, coluna, tipo, barras)[posteriores:])))
+                    for coluna, tipo, valores in arquivos
+                ]
+            if inicio < barras:
+                # Esconder da leitura as barras que serão regravadas antes de alterar os arquivos
+                meta['barras'] = inicio
+                self._gravar_meta(pasta, meta)
+        
+        # Gravar as colunas (descartando restos de uma gravação interrompida) e só então o total de barras
+        for coluna, tipo, valores in arquivos:
+            with open(os.path.join(pasta, f'{coluna}.bin'), 'r+b' if inicio > 0 else 'wb') as f:
+                f.truncate(inicio * tipo.itemsize)
+                f.seek(inicio * tipo.itemsize)
+                f.write(np.ascontiguousarray(valores, dtype=tipo).tobytes())
+        
+        meta['barras'] = inicio + len(arquivos[0][2])
+        self._gravar_meta(pasta, meta)
+        return len(datas)
+    
+    def carregar(self, symbol, intervalo, inicio=None, fim=None, copiar=True):
+        """
+        Carrega os dados de um ativo, opcionalmente apenas um trecho de datas.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras.
+            inicio: Data inicial (inclusiva; padrão: primeira barra).
+            fim: Data final (inclusiva; padrão: última barra).
+            copiar (bool): Se False, as colunas do DataFrame podem continuar
+                apoiadas no mapeamento do arquivo (somente leitura).
+        
+        Returns:
+            pandas.DataFrame: Dados OHLCV do trecho (None se o ativo não estiver armazenado).
+        """
+        trecho = self.localizar(symbol, intervalo, inicio, fim)
+        if trecho is None:
+            return None
+        return self.carregar_barras(symbol, intervalo, *trecho, copiar=copiar)
+    
+    def localizar(self, symbol, intervalo, inicio=None, fim=None):
+        """
+        Localiza as posições das barras de um trecho de datas.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras.
+            inicio: Data inicial (inclusiva; padrão: primeira barra).
+            fim: Data final (inclusiva; padrão: última barra).
+        
+        Returns:
+            tuple: Posições (primeira, ultima) do trecho, com a última exclusiva
+                (None se o ativo não estiver armazenado).
+        """
+        pasta = self._pasta(symbol, intervalo)
+        meta = self._ler_meta(pasta)
+        if meta is None:
+            return None
+        
+        datas = self._mapear(pasta, 'data', np.int64, meta['barras'])
+        primeira = self._posicao(datas, inicio, meta['fuso'], 'left') if inicio is not None else 0
+        ultima = self._posicao(datas, fim, meta['fuso'], 'right') if fim is not None else len(datas)
+        return primeira, max(primeira, ultima)
+    
+    def carregar_barras(self, symbol, intervalo, primeira, ultima, copiar=True):
+        """
+        Carrega as barras entre duas posições, lendo do disco apenas esse trecho.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras.
+            primeira (int): Posição da primeira barra.
+            ultima (int): Posição seguinte à última barra (exclusiva).
+            copiar (bool): Se False, as colunas do DataFrame podem continuar
+                apoiadas no mapeamento do arquivo (somente leitura).
+        
+        Returns:
+            pandas.DataFrame: Dados OHLCV do trecho (None se o ativo não estiver armazenado).
+        """
+        pasta = self._pasta(symbol, intervalo)
+        meta = self._ler_meta(pasta)
+        if meta is None:
+            return None
+        
+        datas = self._mapear(pasta, 'data', np.int64, meta['barras'])
+        trecho = slice(primeira, max(primeira, ultima))
+        
+        colunas = {
+            coluna: self._mapear(pasta, coluna, np.dtype(tipo), meta['barras'])[trecho]
+            for coluna, tipo in meta['colunas'].items()
+        }
+        if copiar:
+            colunas = {coluna: np.array(valores) for coluna, valores in colunas.items()}
+        return pd.DataFrame(colunas, index=self._converter_datas(datas[trecho], meta['fuso']), copy=False)
+    
+    @staticmethod
+    def _posicao(datas, data, fuso, lado):
+        """
+        Localiza uma data nos valores gravados por busca binária (lê apenas O(log n) páginas).
+        """
+        data = pd.Timestamp(data)
+        if fuso is not None:
+            data = data.tz_localize(fuso) if data.tz is None else data
+            data = data.tz_convert('UTC').tz_localize(None)
+        elif data.tz is not None:
+            data = data.tz_localize(None)
+        return int(np.searchsorted(datas, data.as_unit('ns').value, side=lado))
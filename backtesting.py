@@ -14,14 +14,20 @@ sys.path.append('/home/ubuntu/robo_trader/src')
 from analise_tecnica.indicadores import IndicadoresTecnicos
 from analise_tecnica.price_action import PriceAction
 from analise_tecnica.estrategias import EstrategiasTrading
-from analise_tecnica.gerenciamento_risco import GerenciamentoRisco
+from analise_tecnica.gerenciamento_risco import GerenciamentoRisco, TrailingStopIncremental
+from analise_tecnica.precisao import converter, obter_precisao, usar_precisao
+from analise_tecnica.livro_operacoes import TIPOS_OPERACAO, criar_livro, livro_de_dicionarios, tabela_operacoes
+from analise_tecnica.intradiario import SESSAO_PADRAO, converter_intervalo, fins_sessao, inferir_intervalo, periodos_por_ano
+from analise_tecnica.metricas_incrementais import MetricasIncrementais
+from analise_tecnica.simulacao import simular_eventos, simular_operacoes
 
 class Backtesting:
     """
     Classe para realizar backtesting das estratégias de trading.
     """
     
-    def __init__(self, dados_historicos, capital_inicial=10000.0, comissao=0.0):
+    def __init__(self, dados_historicos, capital_inicial=10000.0, comissao=0.0, precisao=None, intervalo=None,
+                 sessao=SESSAO_PADRAO):
         """
         Inicializa o ambiente de backtesting.
         
@@ -29,13 +35,23 @@ class Backtesting:
             dados_historicos (pandas.DataFrame): DataFrame com dados históricos (OHLCV).
             capital_inicial (float): Capital inicial para simulação.
             comissao (float): Valor da comissão por operação (percentual).
+            precisao (str): Precisão dos dados e indicadores ('float64' ou 'float32';
+                None usa a precisão padrão, ver precisao.definir_precisao).
+            intervalo (str): Intervalo das barras ('1m', '5m', '1d'...; None: inferido do índice).
+            sessao (tuple): Horário do pregão (início, fim), usado na anualização de barras intradiárias.
         """
-        self.dados = dados_historicos
+        self.precisao = obter_precisao(precisao)
+        self.dados = converter(dados_historicos, self.precisao)
         self.capital_inicial = capital_inicial
         self.comissao = comissao
+        self.intervalo = converter_intervalo(intervalo) if intervalo is not None else inferir_intervalo(self.dados.index)
+        self.periodos_por_ano = periodos_por_ano(self.intervalo, sessao)
         self.resultados = None
+        self.features = {}
+        self._periodo_atr = None
     
-    def executar_backtest(self, estrategia, params=None, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0):
+    def executar_backtest(self, estrategia, params=None, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0,
+                          modo='barras', encerrar_sessao=False, trailing_stop=0.0):
         """
         Executa o backtesting de uma estratégia específica.
         
@@ -45,136 +61,155 @@ class Backtesting:
             risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
             stop_atr (float): Multiplicador do ATR para stop loss.
             take_profit_rr (float): Relação risco/retorno para take profit.
-            
+            modo (str): 'barras' (percorre todas as barras) ou 'eventos' (salta entre
+                sinais e saídas; mais rápido para estratégias com poucos sinais).
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão (day trade).
+            trailing_stop (float): Distância percentual do trailing stop a partir do fechamento
+                mais favorável desde a entrada (0: desativado).
+        
         Returns:
             dict: Resultados do backtesting.
         """
+        sinais = self.gerar_sinais(estrategia, params)
+        
+        return self.simular(sinais, risco_por_operacao, stop_atr, take_profit_rr, modo, encerrar_sessao=encerrar_sessao,
+                            trailing_stop=trailing_stop)
+    
+    def gerar_sinais(self, estrategia, params=None):
+        """
+        Gera os sinais de uma estratégia sobre todo o histórico, na precisão do backtest.
+        
+        Args:
+            estrategia (str): Nome da estratégia.
+            params (dict): Parâmetros específicos da estratégia.
+        
+        Returns:
+            pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
+        """
         # Preparar dados
         dados_open = self.dados['open']
         dados_high = self.dados['high']
         dados_low = self.dados['low']
         dados_close = self.dados['close']
-        dados_volume = self.dados['volume']
         
         # Gerar sinais com base na estratégia selecionada
-        sinais = self._gerar_sinais(estrategia, dados_open, dados_high, dados_low, dados_close, params)
-        
-        # Inicializar variáveis para simulação
-        capital = self.capital_inicial
-        posicao = 0  # 0: sem posição, 1: comprado, -1: vendido
-        preco_entrada = 0
-        stop_loss = 0
-        take_profit = 0
-        
-        # Registros para análise
-        capital_historico = [capital]
-        posicoes = []
-        operacoes = []
+        with usar_precisao(self.precisao):
+            return self._gerar_sinais(estrategia, dados_open, dados_high, dados_low, dados_close, params)
+    
+    def simular(self, sinais, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, modo='barras', barras=None,
+                acompanhamento=None, encerrar_sessao=False, trailing_stop=0.0):
+        """
+        Simula as operações a partir de sinais já calculados.
         
-        # Simular operações
-        for i in range(1, len(sinais)):
-            # Verificar se há posição aberta
-            if posicao != 0:
-                # Verificar se atingiu stop loss
-                if (posicao == 1 and dados_low.iloc[i] <= stop_loss) or \
-                   (posicao == -1 and dados_high.iloc[i] >= stop_loss):
-                    # Fechar posição com stop loss
-                    preco_saida = stop_loss
-                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
-                    resultado_liquido = resultado - self.comissao
-                    
-                    # Atualizar capital
-                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
-                    
-                    # Registrar operação
-                    operacoes.append({
-                        'data_entrada': self.dados.index[i-1],
-                        'data_saida': self.dados.index[i],
-                        'tipo': 'Compra' if posicao == 1 else 'Venda',
-                        'preco_entrada': preco_entrada,
-                        'preco_saida': preco_saida,
-                        'resultado': resultado_liquido,
-                        'motivo_saida': 'Stop Loss'
-                    })
-                    
-                    # Resetar posição
-                    posicao = 0
-                
-                # Verificar se atingiu take profit
-                elif (posicao == 1 and dados_high.iloc[i] >= take_profit) or \
-                     (posicao == -1 and dados_low.iloc[i] <= take_profit):
-                    # Fechar posição com take profit
-                    preco_saida = take_profit
-                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
-                    resultado_liquido = resultado - self.comissao
-                    
-                    # Atualizar capital
-                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
-                    
-                    # Registrar operação
-                    operacoes.append({
-                        'data_entrada': self.dados.index[i-1],
-                        'data_saida': self.dados.index[i],
-                        'tipo': 'Compra' if posicao == 1 else 'Venda',
-                        'preco_entrada': preco_entrada,
-                        'preco_saida': preco_saida,
-                        'resultado': resultado_liquido,
-                        'motivo_saida': 'Take Profit'
-                    })
-                    
-                    # Resetar posição
-                    posicao = 0
-                
-                # Verificar se há sinal contrário
-                elif (posicao == 1 and sinais.iloc[i] == -1) or \
-                     (posicao == -1 and sinais.iloc[i] == 1):
-                    # Fechar posição com sinal contrário
-                    preco_saida = dados_open.iloc[i]
-                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
-                    resultado_liquido = resultado - self.comissao
-                    
-                    # Atualizar capital
-                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
-                    
-                    # Registrar operação
-                    operacoes.append({
-                        'data_entrada': self.dados.index[i-1],
-                        'data_saida': self.dados.index[i],
-                        'tipo': 'Compra' if posicao == 1 else 'Venda',
-                        'preco_entrada': preco_entrada,
-                        'preco_saida': preco_saida,
-                        'resultado': resultado_liquido,
-                        'motivo_saida': 'Sinal Contrário'
-                    })
-                    
-                    # Resetar posição
-                    posicao = 0
-            
-            # Verificar se há sinal para abrir nova posição
-            if posicao == 0 and sinais.iloc[i] != 0:
-                posicao = sinais.iloc[i]  # 1 para compra, -1 para venda
-                preco_entrada = dados_open.iloc[i]
-                
-                # Calcular stop loss e take profit
-                atr = IndicadoresTecnicos.atr(dados_high, dados_low, dados_close, 14).iloc[i]
-                
-                if posicao == 1:  # Compra
-                    stop_loss = preco_entrada - (stop_atr * atr)
-                    take_profit = preco_entrada + (stop_atr * atr * take_profit_rr)
-                else:  # Venda
-                    stop_loss = preco_entrada + (stop_atr * atr)
-                    take_profit = preco_entrada - (stop_atr * atr * take_profit_rr)
-            
-            # Registrar capital e posição
-            capital_historico.append(capital)
-            posicoes.append(posicao)
+        A simulação roda sobre arrays NumPy (ver simulacao.simular_operacoes,
+        compilada com numba quando disponível), o que permite reaproveitar os
+        mesmos sinais com diferentes parâmetros de gestão de risco. No modo
+        'eventos' (simulacao.simular_eventos), as barras sem sinal e sem
+        posição são saltadas e o resultado é o mesmo.
+        
+        Com `barras`, apenas um trecho do histórico é simulado, começando com o
+        capital inicial e sem posição, mas com os sinais e o ATR calculados
+        sobre o histórico completo (sem período de aquecimento no trecho).
+        
+        As métricas são acumuladas durante a própria simulação (ver
+        metricas_incrementais), sem passadas extras sobre os históricos. Para
+        acompanhar uma simulação longa, passe um MetricasIncrementais em
+        `acompanhamento` e consulte `acompanhamento.instantaneo()` de outra thread.
+        O Sharpe Ratio é anualizado pelo número de barras por ano do intervalo
+        dos dados (`self.periodos_por_ano`).
+        
+        Args:
+            sinais (pandas.Series): Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro),
+                com uma posição por barra do histórico completo.
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            modo (str): 'barras' ou 'eventos'.
+            barras (slice): Trecho do histórico a simular (padrão: todo o histórico).
+            acompanhamento (MetricasIncrementais): Acumulador novo, atualizado durante a simulação.
+            encerrar_sessao (bool): Se True, zera as posições no fechamento da última barra de
+                cada pregão (motivo 'Fim do Pregão').
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado); saídas
+                em um stop já puxado pelo trailing têm o motivo 'Trailing Stop'.
+        
+        Returns:
+            dict: Resultados do backtesting.
+        """
+        simuladores = {'barras': simular_operacoes, 'eventos': simular_eventos}
+        if modo not in simuladores:
+            raise ValueError(f"Modo de simulação '{modo}' não reconhecido.")
+        
+        barras = barras if barras is not None else slice(None)
+        dados = self.dados.iloc[barras]
+        
+        # Indicadores da gestão de risco, calculados uma vez por conjunto de dados
+        atr = self._preparar_features()['atr'][barras]
+        fim_sessao = self._preparar_sessoes()[barras] if encerrar_sessao else None
+        
+        simulacao = simuladores[modo](
+            dados['open'].to_numpy(), dados['high'].to_numpy(), dados['low'].to_numpy(),
+            np.asarray(sinais)[barras], atr, self.capital_inicial, self.comissao,
+            risco_por_operacao, stop_atr, take_profit_rr, dados['close'].to_numpy(), fim_sessao,
+            acompanhamento or MetricasIncrementais(self.capital_inicial, self.periodos_por_ano),
+            trailing_stop=trailing_stop
+        )
+        
+        # Registrar operações (a entrada é datada na barra anterior à saída, como no laço original)
+        indice = dados.index
+        barras_saida = simulacao['barra_saida']
+        operacoes = criar_livro(
+            indice[barras_saida - 1], indice[barras_saida], simulacao['tipo'], simulacao['preco_entrada'],
+            simulacao['preco_saida'], simulacao['resultado'], simulacao['motivo_saida']
+        )
         
         # Calcular métricas de desempenho
-        resultados = self._calcular_metricas(capital_historico, operacoes)
+        resultados = {
+            **simulacao['metricas'].instantaneo(),
+            'capital_historico': simulacao['capital_historico'],
+            'operacoes': operacoes,
+            'drawdown': simulacao['drawdown_historico'],
+            'posicoes': simulacao['posicoes']
+        }
         self.resultados = resultados
         
         return resultados
     
+    def _preparar_features(self, periodo_atr=14):
+        """
+        Prepara os indicadores usados pela gestão de risco durante a simulação.
+        
+        Os indicadores são calculados uma única vez por conjunto de dados e
+        guardados em `self.features` como arrays NumPy contíguos (na precisão
+        do backtest), lidos por índice no laço de simulação.
+        
+        Args:
+            periodo_atr (int): Período do ATR usado no stop loss e take profit.
+        
+        Returns:
+            dict: Dicionário {nome: numpy.ndarray} com uma posição por barra.
+        """
+        if self._periodo_atr != periodo_atr:
+            atr = IndicadoresTecnicos.atr(self.dados['high'], self.dados['low'], self.dados['close'], periodo_atr,
+                                          precisao=self.precisao)
+            self.features['atr'] = np.ascontiguousarray(atr.to_numpy(dtype=self.precisao))
+            self._periodo_atr = periodo_atr
+        
+        return self.features
+    
+    def _preparar_sessoes(self):
+        """
+        Marca, uma única vez por conjunto de dados, a última barra de cada pregão.
+        
+        Returns:
+            numpy.ndarray: Array booleano guardado em `self.features['fim_sessao']`.
+        """
+        if 'fim_sessao' not in self.features:
+            if not isinstance(self.dados.index, pd.DatetimeIndex):
+                raise ValueError("A zeragem no fim do pregão exige dados com índice de datas.")
+            self.features['fim_sessao'] = fins_sessao(self.dados.index)
+        
+        return self.features['fim_sessao']
+    
     def _gerar_sinais(self, estrategia, dados_open, dados_high, dados_low, dados_close, params=None):
         """
         Gera sinais de trading com base na estratégia selecionada.
@@ -186,7 +221,7 @@ class Backtesting:
             dados_low (pandas.Series): Série de preços mínimos.
             dados_close (pandas.Series): Série de preços de fechamento.
             params (dict): Parâmetros específicos da estratégia.
-            
+        
         Returns:
             pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
         """
@@ -254,87 +289,43 @@ class Backtesting:
     
     def _calcular_metricas(self, capital_historico, operacoes):
         """
-        Calcula métricas de desempenho com base nos resultados do backtesting.
+        Calcula métricas de desempenho a partir de históricos já completos.
+        
+        Usado quando as métricas não foram acumuladas durante a simulação
+        (laço de referência, curvas emendadas do walk-forward). Os históricos
+        entram de uma vez em um MetricasIncrementais, com operações vetorizadas.
         
         Args:
-            capital_historico (list): Histórico de capital.
-            operacoes (list): Lista de operações realizadas.
-            
+            capital_historico (numpy.ndarray): Histórico de capital (uma posição por barra,
+                começando no capital inicial).
+            operacoes (numpy.ndarray ou list): Livro de operações (ver livro_operacoes);
+                listas de dicionários no formato do laço original são convertidas.
+        
         Returns:
             dict: Métricas de desempenho.
         """
-        # Converter para DataFrame
-        df_operacoes = pd.DataFrame(operacoes)
-        
-        # Métricas básicas
-        capital_final = capital_historico[-1]
-        retorno_total = (capital_final / self.capital_inicial - 1) * 100
-        
-        # Métricas de operações
-        if len(operacoes) > 0:
-            total_operacoes = len(operacoes)
-            operacoes_ganhadoras = sum(1 for op in operacoes if op['resultado'] > 0)
-            operacoes_perdedoras = total_operacoes - operacoes_ganhadoras
-            
-            win_rate = (operacoes_ganhadoras / total_operacoes) * 100 if total_operacoes > 0 else 0
-            
-            ganhos = sum(op['resultado'] for op in operacoes if op['resultado'] > 0)
-            perdas = abs(sum(op['resultado'] for op in operacoes if op['resultado'] <= 0))
-            
-            profit_factor = ganhos / perdas if perdas > 0 else float('inf')
-            
-            media_ganhos = ganhos / operacoes_ganhadoras if operacoes_ganhadoras > 0 else 0
-            media_perdas = perdas / operacoes_perdedoras if operacoes_perdedoras > 0 else 0
-            
-            expectativa = (win_rate / 100 * media_ganhos) - ((100 - win_rate) / 100 * media_perdas)
-        else:
-            total_operacoes = 0
-            operacoes_ganhadoras = 0
-            operacoes_perdedoras = 0
-            win_rate = 0
-            profit_factor = 0
-            media_ganhos = 0
-            media_perdas = 0
-            expectativa = 0
-        
-        # Calcular drawdown
-        capital_historico_series = pd.Series(capital_historico)
-        pico_maximo = capital_historico_series.cummax()
-        drawdown = (capital_historico_series - pico_maximo) / pico_maximo * 100
-        max_drawdown = drawdown.min()
-        
-        # Calcular volatilidade
-        retornos_diarios = np.diff(capital_historico) / capital_historico[:-1]
-        volatilidade = np.std(retornos_diarios) * 100
-        
-        # Calcular Sharpe Ratio (assumindo retorno livre de risco de 0%)
-        sharpe_ratio = (np.mean(retornos_diarios) / np.std(retornos_diarios)) * np.sqrt(252) if np.std(retornos_diarios) > 0 else 0
+        capital_historico = np.asarray(capital_historico, dtype=np.float64)
+        if not isinstance(operacoes, np.ndarray):
+            operacoes = livro_de_dicionarios(operacoes, self.dados.index)
+        
+        metricas = MetricasIncrementais(self.capital_inicial, self.periodos_por_ano)
+        drawdown = np.concatenate(([0.0], metricas.atualizar_lote(capital_historico[1:])))
+        metricas.registrar_operacoes(operacoes['resultado'])
         
         return {
-            'capital_inicial': self.capital_inicial,
-            'capital_final': capital_final,
-            'retorno_total': retorno_total,
-            'total_operacoes': total_operacoes,
-            'operacoes_ganhadoras': operacoes_ganhadoras,
-            'operacoes_perdedoras': operacoes_perdedoras,
-            'win_rate': win_rate,
-            'profit_factor': profit_factor,
-            'media_ganhos': media_ganhos,
-            'media_perdas': media_perdas,
-            'expectativa': expectativa,
-            'max_drawdown': max_drawdown,
-            'volatilidade': volatilidade,
-            'sharpe_ratio': sharpe_ratio,
+            **metricas.instantaneo(),
             'capital_historico': capital_historico,
-            'operacoes': operacoes
+            'operacoes': operacoes,
+            'drawdown': drawdown
         }
     
-    def plotar_resultados(self, titulo=None):
+    def plotar_resultados(self, titulo=None, caminho_arquivo='/home/ubuntu/robo_trader/resultados_backtest.png'):
         """
         Plota os resultados do backtesting.
         
         Args:
             titulo (str): Título do gráfico.
+            caminho_arquivo (str): Caminho para salvar o gráfico.
         """
         if self.resultados is None:
             raise ValueError("Execute o backtesting primeiro.")
@@ -348,10 +339,8 @@ class Backtesting:
         plt.grid(True)
         plt.ylabel('Capital (R$)')
         
-        # Plotar drawdown
-        capital_historico_series = pd.Series(self.resultados['capital_historico'])
-        pico_maximo = capital_historico_series.cummax()
-        drawdown = (capital_historico_series - pico_maximo) / pico_maximo * 100
+        # Plotar drawdown (acumulado durante a simulação)
+        drawdown = self.resultados['drawdown']
         
         plt.subplot(2, 1, 2)
         plt.fill_between(range(len(drawdown)), 0, drawdown, color='red', alpha=0.3)
@@ -361,7 +350,7 @@ class Backtesting:
         plt.title('Drawdown')
         
         plt.tight_layout()
-        plt.savefig('/home/ubuntu/robo_trader/resultados_backtest.png')
+        plt.savefig(caminho_arquivo)
         plt.close()
     
     def gerar_relatorio(self, caminho_arquivo):
@@ -378,4 +367,208 @@ class Backtesting:
             f.write("# Relatório de Backtesting\n\n")
             
             f.write("## Métricas de Desempenho\n\n")
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+            f.write(f"- **Capital Inicial**: R$ {self.resultados['capital_inicial']:.2f}\n")
+            f.write(f"- **Capital Final**: R$ {self.resultados['capital_final']:.2f}\n")
+            f.write(f"- **Retorno Total**: {self.resultados['retorno_total']:.2f}%\n")
+            f.write(f"- **Total de Operações**: {self.resultados['total_operacoes']}\n")
+            f.write(f"- **Operações Ganhadoras**: {self.resultados['operacoes_ganhadoras']}\n")
+            f.write(f"- **Operações Perdedoras**: {self.resultados['operacoes_perdedoras']}\n")
+            f.write(f"- **Win Rate**: {self.resultados['win_rate']:.2f}%\n")
+            f.write(f"- **Profit Factor**: {self.resultados['profit_factor']:.2f}\n")
+            f.write(f"- **Média de Ganhos**: {self.resultados['media_ganhos']:.2f}%\n")
+            f.write(f"- **Média de Perdas**: {self.resultados['media_perdas']:.2f}%\n")
+            f.write(f"- **Expectativa**: {self.resultados['expectativa']:.2f}%\n")
+            f.write(f"- **Drawdown Máximo**: {self.resultados['max_drawdown']:.2f}%\n")
+            f.write(f"- **Volatilidade**: {self.resultados['volatilidade']:.2f}%\n")
+            f.write(f"- **Sharpe Ratio**: {self.resultados['sharpe_ratio']:.2f}\n\n")
+            
+            f.write("## Operações Realizadas\n\n")
+            f.write("| Data Entrada | Data Saída | Tipo | Preço Entrada | Preço Saída | Resultado (%) | Motivo Saída |\n")
+            f.write("|--------------|------------|------|---------------|-------------|---------------|--------------|\n")
+            
+            for op in tabela_operacoes(self.resultados['operacoes'], getattr(self.dados.index, 'tz', None)).to_dict('records'):
+                f.write(f"| {op['data_entrada']} | {op['data_saida']} | {op['tipo']} | {op['preco_entrada']:.2f} | {op['preco_saida']:.2f} | {op['resultado']:.2f} | {op['motivo_saida']} |\n")
+
+class PaperTrading:
+    """
+    Classe para simular operações em tempo real (paper trading).
+    
+    Acompanha as posições abertas a cada atualização de preços com as mesmas
+    regras do Backtesting: stop loss pelo ATR, take profit pela relação
+    risco/retorno, saída no sinal contrário e, opcionalmente, trailing stop.
+    Cada posição guarda um TrailingStopIncremental, atualizado em O(1) a cada
+    barra, sem recalcular séries de preços.
+    """
+    
+    def __init__(self, capital_inicial=10000.0, comissao=0.0, trailing_stop=0.0):
+        """
+        Inicializa o ambiente de paper trading.
+        
+        Args:
+            capital_inicial (float): Capital inicial para simulação.
+            comissao (float): Valor da comissão por operação (percentual).
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+        """
+        self.capital_inicial = capital_inicial
+        self.capital_atual = capital_inicial
+        self.comissao = comissao
+        self.trailing_stop = trailing_stop
+        self.posicoes = {}
+        self.historico_operacoes = []
+    
+    def processar_sinal(self, symbol, sinal, preco, timestamp, estrategia=None, confianca=None, risco_por_operacao=1.0,
+                        stop_atr=2.0, take_profit_rr=2.0, atr=None):
+        """
+        Processa um sinal de trading, abrindo ou invertendo a posição do ativo.
+        
+        Um sinal contrário à posição aberta a encerra no preço atual antes de
+        abrir a nova; um sinal na direção da posição aberta é ignorado.
+        
+        Args:
+            symbol (str): Símbolo do ativo.
+            sinal (int): 1 para compra, -1 para venda, 0 para neutro.
+            preco (float): Preço atual do ativo (preço de entrada).
+            timestamp (datetime): Momento do sinal.
+            estrategia (str): Nome da estratégia que gerou o sinal.
+            confianca (float): Confiança do sinal.
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            atr (float): ATR atual do ativo.
+        
+        Returns:
+            dict: 'acao' ('Compra', 'Venda' ou 'Nenhuma'), 'symbol', 'preco' e
+                'operacao_encerrada' (operação encerrada pelo sinal contrário, se houver).
+        """
+        resultado = {'acao': 'Nenhuma', 'symbol': symbol, 'preco': preco, 'operacao_encerrada': None}
+        posicao = self.posicoes.get(symbol)
+        if sinal == 0 or (posicao is not None and posicao['tipo'] == sinal):
+            return resultado
+        
+        if posicao is not None:
+            resultado['operacao_encerrada'] = self._encerrar_posicao(symbol, preco, timestamp, 'Sinal Contrário')
+        
+        if atr is None or not atr > 0:
+            return resultado
+        
+        stop_loss = preco - sinal * stop_atr * atr
+        self.posicoes[symbol] = {
+            'tipo': sinal,
+            'preco_entrada': preco,
+            'data_entrada': timestamp,
+            'stop_loss': stop_loss,
+            'take_profit': GerenciamentoRisco.calcular_take_profit(preco, stop_loss, take_profit_rr),
+            'risco_por_operacao': risco_por_operacao,
+            'estrategia': estrategia,
+            'confianca': confianca,
+            'trailing': (TrailingStopIncremental(sinal, preco, self.trailing_stop, stop_loss)
+                         if self.trailing_stop > 0 else None)
+        }
+        resultado['acao'] = TIPOS_OPERACAO[sinal]
+        return resultado
+    
+    def atualizar_precos(self, dados, timestamp):
+        """
+        Atualiza as posições abertas com uma nova barra de preços.
+        
+        Verifica o stop (ou trailing stop) e o take profit de cada posição
+        com a máxima e a mínima da barra e, se a posição continuar aberta,
+        puxa o trailing stop com o fechamento.
+        
+        Args:
+            dados (dict): Dicionário {symbol: {'open', 'high', 'low', 'close', ...}}.
+            timestamp (datetime): Momento da atualização.
+        
+        Returns:
+            list: Operações encerradas nesta atualização.
+        """
+        operacoes = []
+        for symbol, posicao in list(self.posicoes.items()):
+            barra = dados.get(symbol)
+            if barra is None:
+                continue
+            
+            high = barra.get('high', barra['close'])
+            low = barra.get('low', barra['close'])
+            tipo = posicao['tipo']
+            trailing = posicao['trailing']
+            
+            if trailing is not None:
+                stop_acionado = trailing.acionado(high, low)
+            else:
+                stop_acionado = (tipo == 1 and low <= posicao['stop_loss']) or (tipo == -1 and high >= posicao['stop_loss'])
+            
+            if stop_acionado:
+                motivo = 'Trailing Stop' if trailing is not None and trailing.movido else 'Stop Loss'
+                operacoes.append(self._encerrar_posicao(symbol, posicao['stop_loss'], timestamp, motivo))
+            elif (tipo == 1 and high >= posicao['take_profit']) or (tipo == -1 and low <= posicao['take_profit']):
+                operacoes.append(self._encerrar_posicao(symbol, posicao['take_profit'], timestamp, 'Take Profit'))
+            elif trailing is not None:
+                posicao['stop_loss'] = trailing.atualizar(barra['close'])
+        
+        return operacoes
+    
+    def _encerrar_posicao(self, symbol, preco_saida, timestamp, motivo):
+        """
+        Encerra a posição de um ativo e atualiza o capital (mesma regra do Backtesting).
+        
+        Returns:
+            dict: Operação encerrada.
+        """
+        posicao = self.posicoes.pop(symbol)
+        resultado = posicao['tipo'] * (preco_saida - posicao['preco_entrada']) / posicao['preco_entrada'] * 100
+        resultado_liquido = resultado - self.comissao
+        self.capital_atual *= 1 + (resultado_liquido / 100) * (posicao['risco_por_operacao'] / 100) * 100
+        
+        operacao = {
+            'symbol': symbol,
+            'acao': f"Encerrar {TIPOS_OPERACAO[posicao['tipo']]}",
+            'tipo': TIPOS_OPERACAO[posicao['tipo']],
+            'estrategia': posicao['estrategia'],
+            'confianca': posicao['confianca'],
+            'data_entrada': posicao['data_entrada'],
+            'data_saida': timestamp,
+            'preco_entrada': posicao['preco_entrada'],
+            'preco_saida': preco_saida,
+            'resultado_percentual': resultado_liquido,
+            'motivo_saida': motivo,
+            'capital': self.capital_atual
+        }
+        self.historico_operacoes.append(operacao)
+        return operacao
+    
+    def gerar_relatorio(self, caminho_arquivo):
+        """
+        Gera um relatório das operações e das posições abertas.
+        
+        Args:
+            caminho_arquivo (str): Caminho para salvar o relatório.
+        """
+        ganhadoras = sum(1 for op in self.historico_operacoes if op['resultado_percentual'] > 0)
+        total = len(self.historico_operacoes)
+        
+        with open(caminho_arquivo, 'w') as f:
+            f.write("# Relatório de Paper Trading\n\n")
+            
+            f.write("## Resumo\n\n")
+            f.write(f"- **Capital Inicial**: R$ {self.capital_inicial:.2f}\n")
+            f.write(f"- **Capital Atual**: R$ {self.capital_atual:.2f}\n")
+            f.write(f"- **Retorno Total**: {(self.capital_atual / self.capital_inicial - 1) * 100:.2f}%\n")
+            f.write(f"- **Total de Operações**: {total}\n")
+            f.write(f"- **Win Rate**: {(ganhadoras / total * 100) if total > 0 else 0:.2f}%\n")
+            f.write(f"- **Posições Abertas**: {len(self.posicoes)}\n\n")
+            
+            f.write("## Operações Realizadas\n\n")
+            f.write("| Ativo | Data Entrada | Data Saída | Tipo | Preço Entrada | Preço Saída | Resultado (%) | Motivo Saída |\n")
+            f.write("|-------|--------------|------------|------|---------------|-------------|---------------|--------------|\n")
+            
+            for op in self.historico_operacoes:
+                f.write(f"| {op['symbol']} | {op['data_entrada']} | {op['data_saida']} | {op['tipo']} | {op['preco_entrada']:.2f} | {op['preco_saida']:.2f} | {op['resultado_percentual']:.2f} | {op['motivo_saida']} |\n")
+            
+            if self.posicoes:
+                f.write("\n## Posições Abertas\n\n")
+                f.write("| Ativo | Data Entrada | Tipo | Preço Entrada | Stop | Take Profit |\n")
+                f.write("|-------|--------------|------|---------------|------|-------------|\n")
+                
+                for symbol, posicao in self.posicoes.items():
+                    f.write(f"| {symbol} | {posicao['data_entrada']} | {TIPOS_OPERACAO[posicao['tipo']]} | {posicao['preco_entrada']:.2f} | {posicao['stop_loss']:.2f} | {posicao['take_profit']:.2f} |\n")
@@ -0,0 +1,170 @@
+"""
+Módulo de Backtesting em Blocos para o Robô Trader
+
+Este módulo executa o backtesting de históricos maiores que a memória,
+lendo as barras do armazenamento local (ver armazem_dados) em blocos de
+tamanho fixo, de modo que a memória ocupada depende do tamanho do bloco e
+não do tamanho do histórico.
+
+Cada bloco é lido junto com um período de aquecimento (as barras
+anteriores a ele), sobre o qual os indicadores e os sinais são
+recalculados; apenas os sinais das barras do próprio bloco são usados. A
+simulação continua exatamente de onde o bloco anterior parou: a última
+barra simulada é a primeira do bloco seguinte, e a posição aberta (ver
+simulacao.simular_operacoes, `estado_posicao`), o capital e as métricas
+(MetricasIncrementais) passam de um bloco para o outro.
+"""
+
+import numpy as np
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from analise_tecnica.armazem_dados import ArmazemDados
+from analise_tecnica.indicadores import IndicadoresTecnicos
+from analise_tecnica.intradiario import SESSAO_PADRAO, converter_intervalo, fins_sessao, periodos_por_ano
+from analise_tecnica.livro_operacoes import criar_livro, tipo_livro
+from analise_tecnica.metricas_incrementais import MetricasIncrementais
+from analise_tecnica.simulacao import simular_operacoes
+from testes.backtesting import Backtesting
+
+# Barras por bloco e barras de aquecimento padrão
+BARRAS_POR_BLOCO = 250_000
+AQUECIMENTO_PADRAO = 2000
+
+class BacktestingBlocos:
+    """
+    Classe para realizar o backtesting de um ativo armazenado, bloco a bloco.
+    
+    Uso:
+        backtest = BacktestingBlocos(ArmazemDados(), 'PETR4.SA', '1m')
+        resultados = backtest.executar_backtest('cruzamento_medias', barras_por_bloco=500_000)
+    """
+    
+    def __init__(self, armazem, symbol, intervalo, capital_inicial=10000.0, comissao=0.0, precisao=None,
+                 sessao=SESSAO_PADRAO, inicio=None, fim=None):
+        """
+        Inicializa o backtesting em blocos.
+        
+        Args:
+            armazem (ArmazemDados): Armazenamento com o histórico do ativo.
+            symbol (str): Símbolo do ativo.
+            intervalo (str): Intervalo das barras armazenadas ('1m', '5m', '1d'...).
+            capital_inicial (float): Capital inicial para simulação.
+            comissao (float): Valor da comissão por operação (percentual).
+            precisao (str): Precisão dos dados e indicadores ('float64' ou 'float32').
+            sessao (tuple): Horário do pregão (início, fim), usado na anualização de barras intradiárias.
+            inicio: Data inicial do histórico testado (inclusiva; padrão: primeira barra).
+            fim: Data final do histórico testado (inclusiva; padrão: última barra).
+        """
+        self.armazem = armazem if armazem is not None else ArmazemDados()
+        self.symbol = symbol
+        self.intervalo = intervalo
+        self.capital_inicial = capital_inicial
+        self.comissao = comissao
+        self.precisao = precisao
+        self.sessao = sessao
+        self.periodos_por_ano = periodos_por_ano(converter_intervalo(intervalo), sessao)
+        
+        trecho = self.armazem.localizar(symbol, intervalo, inicio, fim)
+        if trecho is None:
+            raise ValueError(f"Ativo '{symbol}' ({intervalo}) não encontrado no armazenamento.")
+        self.primeira, self.ultima = trecho
+        self.resultados = None
+    
+    def executar_backtest(self, estrategia, params=None, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0,
+                          encerrar_sessao=False, trailing_stop=0.0, barras_por_bloco=BARRAS_POR_BLOCO,
+                          aquecimento=AQUECIMENTO_PADRAO, historicos=True):
+        """
+        Executa o backtesting de uma estratégia sobre o histórico, bloco a bloco.
+        
+        O resultado é o mesmo de Backtesting.executar_backtest sobre o
+        histórico inteiro desde que o aquecimento cubra a memória dos
+        indicadores da estratégia (o maior período das médias e, nas médias
+        exponenciais, o suficiente para o peso das barras anteriores se
+        tornar desprezível). Somas móveis recalculadas sobre outra janela
+        podem diferir nos últimos bits, o que não altera os sinais.
+        
+        Args:
+            estrategia (str): Nome da estratégia (ver Backtesting._gerar_sinais).
+            params (dict): Parâmetros específicos da estratégia.
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão (day trade).
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+            barras_por_bloco (int): Barras simuladas por bloco.
+            aquecimento (int): Barras anteriores ao bloco lidas para recalcular os indicadores.
+            historicos (bool): Se False, não guarda o capital, o drawdown e as posições
+                barra a barra (apenas métricas e operações), e a memória passa a
+                depender só do tamanho do bloco e do número de operações.
+        
+        Returns:
+            dict: Resultados do backtesting, no formato de Backtesting.simular.
+        """
+        if barras_por_bloco < 1 or aquecimento < 0:
+            raise ValueError("O bloco precisa de pelo menos uma barra e o aquecimento não pode ser negativo.")
+        
+        metricas = MetricasIncrementais(self.capital_inicial, self.periodos_por_ano)
+        capital = self.capital_inicial
+        estado_posicao = None
+        livros, capitais, drawdowns, posicoes = [], [], [], []
+        
+        # Os indicadores de cada bloco são usados uma única vez: não vale a pena guardá-los no cache
+        cache = IndicadoresTecnicos.cache
+        habilitado = cache.habilitado
+        cache.habilitado = False
+        try:
+            for inicio_bloco in range(self.primeira, self.ultima, barras_por_bloco):
+                fim_bloco = min(inicio_bloco + barras_por_bloco, self.ultima)
+                
+                # A simulação recomeça na última barra do bloco anterior (a barra de referência)
+                inicio_simulacao = max(inicio_bloco - 1, self.primeira)
+                inicio_leitura = max(inicio_simulacao - aquecimento, self.primeira)
+                
+                # Uma barra a mais, se houver, para saber se a última do bloco fecha o pregão
+                dados = self.armazem.carregar_barras(self.symbol, self.intervalo, inicio_leitura,
+                                                     min(fim_bloco + 1, self.ultima))
+                fim_sessao = fins_sessao(dados.index)[:fim_bloco - inicio_leitura] if encerrar_sessao else None
+                
+                backtest = Backtesting(dados.iloc[:fim_bloco - inicio_leitura], self.capital_inicial, self.comissao,
+                                       self.precisao, self.intervalo, self.sessao)
+                sinais = np.asarray(backtest.gerar_sinais(estrategia, params))
+                atr = backtest._preparar_features()['atr']
+                
+                trecho = slice(inicio_simulacao - inicio_leitura, None)
+                precos = backtest.dados.iloc[trecho]
+                simulacao = simular_operacoes(
+                    precos['open'].to_numpy(), precos['high'].to_numpy(), precos['low'].to_numpy(),
+                    sinais[trecho], atr[trecho], capital, self.comissao, risco_por_operacao, stop_atr,
+                    take_profit_rr, precos['close'].to_numpy(),
+                    fim_sessao[trecho] if fim_sessao is not None else None, metricas,
+                    trailing_stop=trailing_stop, estado_posicao=estado_posicao
+                )
+                capital = simulacao['capital_historico'][-1]
+                estado_posicao = simulacao['estado_posicao']
+                
+                indice = precos.index
+                barras_saida = simulacao['barra_saida']
+                livros.append(criar_livro(
+                    indice[barras_saida - 1], indice[barras_saida], simulacao['tipo'], simulacao['preco_entrada'],
+                    simulacao['preco_saida'], simulacao['resultado'], simulacao['motivo_saida']
+                ))
+                if historicos:
+                    # A barra de referência já foi registrada pelo bloco anterior
+                    referencia = 1 if inicio_simulacao < inicio_bloco else 0
+                    capitais.append(simulacao['capital_historico'][referencia:])
+                    drawdowns.append(simulacao['drawdown_historico'][referencia:])
+                    posicoes.append(simulacao['posicoes'])
+        finally:
+            cache.habilitado = habilitado
+        
+        operacoes = np.concatenate(livros) if livros else np.empty(0, dtype=tipo_livro(np.dtype('datetime64[ns]')))
+        resultados = {
+            **metricas.instantaneo(),
+            'capital_historico': np.concatenate(capitais) if historicos and capitais else None,
+            'operacoes': operacoes,
+            'drawdown': np.concatenate(drawdowns) if historicos and drawdowns else None,
+            'posicoes': np.concatenate(posicoes) if historicos and posicoes else None
+        }
+        self.resultados = resultados
+        
+        return resultados
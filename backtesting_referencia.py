@@ -0,0 +1,160 @@
+"""
+Implementação de referência da simulação do Robô Trader
+
+Este módulo preserva o laço original (barra a barra, com acesso às Series)
+de Backtesting.executar_backtest. Ele é usado apenas para validar e medir o
+núcleo de simulação sobre arrays de simulacao.py.
+"""
+
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from analise_tecnica.precisao import usar_precisao
+from testes.backtesting import Backtesting
+
+class BacktestingReferencia(Backtesting):
+    """
+    Backtesting com o laço de simulação original, mantido como referência.
+    """
+    
+    def executar_backtest(self, estrategia, params=None, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0):
+        """
+        Executa o backtesting de uma estratégia específica com o laço original.
+        
+        Args:
+            estrategia (str): Nome da estratégia a ser testada.
+            params (dict): Parâmetros específicos da estratégia.
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+        
+        Returns:
+            dict: Resultados do backtesting.
+        """
+        # Preparar dados
+        dados_open = self.dados['open']
+        dados_high = self.dados['high']
+        dados_low = self.dados['low']
+        dados_close = self.dados['close']
+        dados_volume = self.dados['volume']
+        
+        # Gerar sinais com base na estratégia selecionada
+        with usar_precisao(self.precisao):
+            sinais = self._gerar_sinais(estrategia, dados_open, dados_high, dados_low, dados_close, params)
+        
+        # Indicadores da gestão de risco, calculados uma vez por conjunto de dados
+        atr = self._preparar_features()['atr']
+        
+        # Inicializar variáveis para simulação
+        capital = self.capital_inicial
+        posicao = 0  # 0: sem posição, 1: comprado, -1: vendido
+        preco_entrada = 0
+        stop_loss = 0
+        take_profit = 0
+        
+        # Registros para análise
+        capital_historico = [capital]
+        posicoes = []
+        operacoes = []
+        
+        # Simular operações
+        for i in range(1, len(sinais)):
+            # Verificar se há posição aberta
+            if posicao != 0:
+                # Verificar se atingiu stop loss
+                if (posicao == 1 and dados_low.iloc[i] <= stop_loss) or \
+                   (posicao == -1 and dados_high.iloc[i] >= stop_loss):
+                    # Fechar posição com stop loss
+                    preco_saida = stop_loss
+                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
+                    resultado_liquido = resultado - self.comissao
+                    
+                    # Atualizar capital
+                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
+                    
+                    # Registrar operação
+                    operacoes.append({
+                        'data_entrada': self.dados.index[i-1],
+                        'data_saida': self.dados.index[i],
+                        'tipo': 'Compra' if posicao == 1 else 'Venda',
+                        'preco_entrada': preco_entrada,
+                        'preco_saida': preco_saida,
+                        'resultado': resultado_liquido,
+                        'motivo_saida': 'Stop Loss'
+                    })
+                    
+                    # Resetar posição
+                    posicao = 0
+                
+                # Verificar se atingiu take profit
+                elif (posicao == 1 and dados_high.iloc[i] >= take_profit) or \
+                     (posicao == -1 and dados_low.iloc[i] <= take_profit):
+                    # Fechar posição com take profit
+                    preco_saida = take_profit
+                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
+                    resultado_liquido = resultado - self.comissao
+                    
+                    # Atualizar capital
+                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
+                    
+                    # Registrar operação
+                    operacoes.append({
+                        'data_entrada': self.dados.index[i-1],
+                        'data_saida': self.dados.index[i],
+                        'tipo': 'Compra' if posicao == 1 else 'Venda',
+                        'preco_entrada': preco_entrada,
+                        'preco_saida': preco_saida,
+                        'resultado': resultado_liquido,
+                        'motivo_saida': 'Take Profit'
+                    })
+                    
+                    # Resetar posição
+                    posicao = 0
+                
+                # Verificar se há sinal contrário
+                elif (posicao == 1 and sinais.iloc[i] == -1) or \
+                     (posicao == -1 and sinais.iloc[i] == 1):
+                    # Fechar posição com sinal contrário
+                    preco_saida = float(dados_open.iloc[i])
+                    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
+                    resultado_liquido = resultado - self.comissao
+                    
+                    # Atualizar capital
+                    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
+                    
+                    # Registrar operação
+                    operacoes.append({
+                        'data_entrada': self.dados.index[i-1],
+                        'data_saida': self.dados.index[i],
+                        'tipo': 'Compra' if posicao == 1 else 'Venda',
+                        'preco_entrada': preco_entrada,
+                        'preco_saida': preco_saida,
+                        'resultado': resultado_liquido,
+                        'motivo_saida': 'Sinal Contrário'
+                    })
+                    
+                    # Resetar posição
+                    posicao = 0
+            
+            # Verificar se há sinal para abrir nova posição
+            if posicao == 0 and sinais.iloc[i] != 0:
+                posicao = sinais.iloc[i]  # 1 para compra, -1 para venda
+                preco_entrada = float(dados_open.iloc[i])
+                distancia_stop = stop_atr * float(atr[i])
+                
+                # Calcular stop loss e take profit
+                if posicao == 1:  # Compra
+                    stop_loss = preco_entrada - distancia_stop
+                    take_profit = preco_entrada + (distancia_stop * take_profit_rr)
+                else:  # Venda
+                    stop_loss = preco_entrada + distancia_stop
+                    take_profit = preco_entrada - (distancia_stop * take_profit_rr)
+            
+            # Registrar capital e posição
+            capital_historico.append(capital)
+            posicoes.append(posicao)
+        
+        # Calcular métricas de desempenho
+        resultados = self._calcular_metricas(capital_historico, operacoes)
+        self.resultados = resultados
+        
+        return resultados
@@ -0,0 +1,236 @@
+"""
+Módulo de Cache de Indicadores para o Robô Trader
+
+Este módulo implementa a memoização dos indicadores técnicos. Os resultados
+são indexados pelo nome do indicador, pelos parâmetros e por uma impressão
+digital (hash) dos dados de entrada, e descartados por LRU quando o número
+de entradas ou o orçamento de memória é excedido.
+"""
+
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+def _atualizar_hash(hash_valores, valores):
+    """
+    Acrescenta ao hash todos os valores de um array (objetos, como textos, pelo hash do pandas).
+    """
+    if valores.dtype.kind == 'O':
+        valores = pd.util.hash_array(valores.ravel())
+    hash_valores.update(memoryview(np.ascontiguousarray(valores)).cast('B'))
+    
+def impressao_digital(dados):
+    """
+    Calcula uma impressão digital de uma série, DataFrame ou array.
+    
+    Combina formato, tipo e um hash (blake2b) de todos os valores e do
+    índice, de modo que dados diferentes em qualquer barra geram chaves
+    diferentes. O custo é uma passada sobre os dados, pequeno perto do
+    cálculo de um indicador.
+    
+    Args:
+        dados (pandas.Series, pandas.DataFrame ou numpy.ndarray): Dados de entrada.
+    
+    Returns:
+        tuple: Impressão digital (hashable) dos dados.
+    """
+    if isinstance(dados, (pd.Series, pd.DataFrame)):
+        valores = dados.to_numpy()
+        indice = dados.index
+    else:
+        valores = np.asarray(dados)
+        indice = None
+    
+    hash_valores = hashlib.blake2b(digest_size=16)
+    _atualizar_hash(hash_valores, valores)
+    partes = (type(dados).__name__, valores.shape, str(valores.dtype))
+    if isinstance(indice, pd.DatetimeIndex):
+        # Datas com fuso entram pelos nanossegundos em UTC, mais o fuso
+        _atualizar_hash(hash_valores, indice.asi8)
+        partes += (str(indice.tz), str(indice.dtype))
+    elif isinstance(indice, pd.RangeIndex):
+        partes += (indice.start, indice.stop, indice.step)
+    elif indice is not None:
+        _atualizar_hash(hash_valores, indice.to_numpy())
+    
+    partes += (hash_valores.hexdigest(),)
+    if isinstance(dados, pd.DataFrame):
+        partes += (tuple(dados.columns),)
+    return partes
+
+def _tamanho(valor):
+    """
+    Estima a memória ocupada por um resultado em bytes.
+    """
+    if isinstance(valor, (tuple, list)):
+        return sum(_tamanho(v) for v in valor)
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True))
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True).sum())
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    return 0
+
+def _copiar(valor):
+    """
+    Copia um resultado para que o chamador não altere o valor em cache.
+    """
+    if isinstance(valor, tuple):
+        return tuple(_copiar(v) for v in valor)
+    if isinstance(valor, (pd.Series, pd.DataFrame, np.ndarray)):
+        return valor.copy()
+    return valor
+
+class CacheIndicadores:
+    """
+    Cache LRU de resultados de indicadores com orçamento de memória.
+    """
+    
+    def __init__(self, max_entradas=256, limite_memoria=512 * 1024 ** 2):
+        """
+        Inicializa o cache.
+        
+        Args:
+            max_entradas (int): Número máximo de resultados mantidos.
+            limite_memoria (int): Memória máxima (em bytes) ocupada pelos resultados.
+        """
+        self.max_entradas = max_entradas
+        self.limite_memoria = limite_memoria
+        self.habilitado = True
+        self._entradas = OrderedDict()
+        self._memoria = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+    
+    def chave(self, nome, argumentos):
+        """
+        Monta a chave de cache de uma chamada.
+        
+        Args:
+            nome (str): Nome do indicador.
+            argumentos (dict): Argumentos da chamada, já com os valores padrão.
+        
+        Returns:
+            tuple: Chave da chamada.
+        """
+        partes = [nome]
+        for parametro, valor in argumentos.items():
+            if isinstance(valor, (pd.Series, pd.DataFrame, np.ndarray)):
+                valor = impressao_digital(valor)
+            elif isinstance(valor, list):
+                valor = tuple(valor)
+            partes.append((parametro, valor))
+        return tuple(partes)
+    
+    def obter(self, chave):
+        """
+        Busca um resultado no cache.
+        
+        Args:
+            chave (tuple): Chave da chamada.
+        
+        Returns:
+            object: Resultado em cache (None se ausente).
+        """
+        with self._trava:
+            valor = self._entradas.get(chave)
+            if valor is None:
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+    
+    def armazenar(self, chave, valor):
+        """
+        Armazena um resultado, removendo os menos usados se necessário.
+        
+        Args:
+            chave (tuple): Chave da chamada.
+            valor (object): Resultado do indicador.
+        """
+        tamanho = _tamanho(valor)
+        if tamanho > self.limite_memoria:
+            return
+        
+        with self._trava:
+            if chave in self._entradas:
+                self._memoria -= _tamanho(self._entradas.pop(chave))
+            self._entradas[chave] = valor
+            self._memoria += tamanho
+            
+            while len(self._entradas) > self.max_entradas or self._memoria > self.limite_memoria:
+                _, removido = self._entradas.popitem(last=False)
+                self._memoria -= _tamanho(removido)
+                self.remocoes += 1
+    
+    def limpar(self):
+        """
+        Remove todos os resultados e zera os contadores.
+        """
+        with self._trava:
+            self._entradas.clear()
+            self._memoria = 0
+            self.acertos = 0
+            self.falhas = 0
+            self.remocoes = 0
+    
+    def estatisticas(self):
+        """
+        Retorna os contadores do cache.
+        
+        Returns:
+            dict: Acertos, falhas, remoções, entradas, memória usada e taxa de acerto.
+        """
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'remocoes': self.remocoes,
+                'entradas': len(self._entradas),
+                'memoria': self._memoria,
+                'taxa_acerto': self.acertos / consultas if consultas > 0 else 0.0
+            }
+
+# Cache compartilhado por todos os indicadores do processo
+cache = CacheIndicadores()
+
+def memoizar(funcao):
+    """
+    Decorador que memoiza um indicador no cache compartilhado.
+    
+    Args:
+        funcao (callable): Função do indicador.
+    
+    Returns:
+        callable: Função memoizada.
+    """
+    assinatura = inspect.signature(funcao)
+    nome = funcao.__qualname__
+    
+    @functools.wraps(funcao)
+    def wrapper(*args, **kwargs):
+        if not cache.habilitado:
+            return funcao(*args, **kwargs)
+        
+        argumentos = assinatura.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        chave = cache.chave(nome, argumentos.arguments)
+        
+        resultado = cache.obter(chave)
+        if resultado is None:
+            resultado = funcao(*args, **kwargs)
+            cache.armazenar(chave, resultado)
+        
+        return _copiar(resultado)
+    
+    return wrapper
@@ -0,0 +1,403 @@
+"""
+Módulo de Carregamento Assíncrono de Dados de Mercado para o Robô Trader
+
+Este módulo baixa os dados históricos de muitos ativos ao mesmo tempo: as
+requisições de todos os ativos são disparadas juntas em um laço asyncio e
+passam por um cliente HTTP com conexões reutilizáveis (keep-alive), limite
+de conexões simultâneas, limite opcional de requisições por segundo e novas
+tentativas com espera exponencial. O tempo total fica próximo ao da
+requisição mais lenta, e não à soma de todas.
+
+O cliente usa apenas a biblioteca padrão (asyncio e ssl). As respostas
+válidas são gravadas em um cache em disco com validade, e as datas são
+convertidas de uma vez (vetorizado) para o horário local da bolsa.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import ssl
+import time
+from collections import defaultdict
+from urllib.parse import quote, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+# Endereço do gráfico do Yahoo Finance (um ativo por requisição)
+URL_YAHOO = 'https://query1.finance.yahoo.com/v8/finance/chart/'
+
+# Diretório padrão do cache de respostas
+DIRETORIO_CACHE = '/home/ubuntu/robo_trader/cache_mercado'
+
+# Situações HTTP que justificam uma nova tentativa
+SITUACOES_REPETIR = (429, 500, 502, 503, 504)
+
+def converter_grafico(dados):
+    """
+    Converte a resposta do gráfico do Yahoo Finance em um DataFrame OHLCV.
+    
+    Args:
+        dados (dict): Resposta da API ('chart' -> 'result').
+    
+    Returns:
+        pandas.DataFrame: Dados OHLCV no horário local da bolsa, sem barras
+            incompletas (None se a resposta não tiver dados).
+    """
+    if not dados or not dados.get('chart', {}).get('result'):
+        return None
+    
+    result = dados['chart']['result'][0]
+    if not result.get('timestamp'):
+        return None
+    cotacoes = result['indicators']['quote'][0]
+    fuso = result.get('meta', {}).get('exchangeTimezoneName') or 'UTC'
+    colunas = ('open', 'high', 'low', 'close', 'volume')
+    
+    # Valores ausentes (null) viram NaN; barras com algum NaN são descartadas
+    valores = np.array([cotacoes[coluna] for coluna in colunas], dtype=np.float64)
+    validas = ~np.isnan(valores).any(axis=0)
+    datas = pd.DatetimeIndex(np.asarray(result['timestamp'], dtype=np.int64)[validas].astype('datetime64[s]'))
+    datas = datas.as_unit('ns').tz_localize('UTC').tz_convert(fuso).tz_localize(None)
+    return pd.DataFrame(dict(zip(colunas, valores[:, validas])), index=datas)
+
+class CacheDisco:
+    """
+    Cache de respostas em disco, com validade por tempo.
+    """
+    
+    def __init__(self, diretorio=DIRETORIO_CACHE, validade=900.0):
+        """
+        Inicializa o cache (o diretório é criado na primeira gravação).
+        
+        Args:
+            diretorio (str): Diretório dos arquivos do cache.
+            validade (float): Validade de cada resposta, em segundos.
+        """
+        self.diretorio = diretorio
+        self.validade = validade
+    
+    def _caminho(self, chave):
+        """
+        Caminho do arquivo em que a resposta de uma chave é guardada.
+        """
+        return os.path.join(self.diretorio, hashlib.sha256(chave.encode()).hexdigest() + '.json')
+    
+    def ler(self, chave):
+        """
+        Lê uma resposta ainda válida.
+        
+        Args:
+            chave (str): Chave da resposta (ex: URL da requisição).
+        
+        Returns:
+            bytes: Corpo da resposta (None se ausente ou expirada).
+        """
+        caminho = self._caminho(chave)
+        try:
+            if time.time() - os.path.getmtime(caminho) > self.validade:
+                return None
+            with open(caminho, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def gravar(self, chave, corpo):
+        """
+        Grava uma resposta de forma atômica (arquivo temporário + substituição).
+        
+        Args:
+            chave (str): Chave da resposta.
+            corpo (bytes): Corpo da resposta.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = f'{caminho}.{os.getpid()}.{id(corpo)}.tmp'
+        with open(temporario, 'wb') as f:
+            f.write(corpo)
+        os.replace(temporario, caminho)
+
+class ClienteHttpAssincrono:
+    """
+    Cliente HTTP/1.1 assíncrono mínimo, com conexões reutilizáveis.
+    
+    Uso:
+        async with ClienteHttpAssincrono(limite_conexoes=32) as cliente:
+            corpo = await cliente.obter('https://...')
+    """
+    
+    def __init__(self, limite_conexoes=64, requisicoes_por_segundo=None, tentativas=3, espera_inicial=0.5,
+                 tempo_limite=30.0):
+        """
+        Inicializa o cliente, sem abrir conexões.
+        
+        Args:
+            limite_conexoes (int): Máximo de requisições (e conexões) simultâneas.
+            requisicoes_por_segundo (float): Ritmo máximo de novas requisições (None: sem limite).
+            tentativas (int): Número máximo de tentativas por requisição.
+            espera_inicial (float): Espera antes da segunda tentativa, dobrada a cada nova falha (segundos).
+            tempo_limite (float): Tempo máximo de cada tentativa (segundos).
+        """
+        self.limite_conexoes = limite_conexoes
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.tempo_limite = tempo_limite
+        self._semaforo = None
+        self._livres = defaultdict(list)
+        self._proxima_liberacao = 0.0
+        self._ssl = None
+    
+    async def __aenter__(self):
+        """
+        Cria o semáforo que limita as requisições simultâneas.
+        """
+        self._semaforo = asyncio.Semaphore(self.limite_conexoes)
+        return self
+    
+    async def __aexit__(self, *excecao):
+        """
+        Fecha as conexões livres ao sair do bloco (ver fechar).
+        """
+        await self.fechar()
+    
+    async def fechar(self):
+        """
+        Fecha as conexões livres.
+        """
+        for conexoes in self._livres.values():
+            for _, escritor in conexoes:
+                escritor.close()
+        self._livres.clear()
+    
+    async def _aguardar_ritmo(self):
+        """
+        Espaça o início das requisições para respeitar requisicoes_por_segundo.
+        """
+        if not self.requisicoes_por_segundo:
+            return
+        agora = time.monotonic()
+        liberacao = max(agora, self._proxima_liberacao)
+        self._proxima_liberacao = liberacao + 1 / self.requisicoes_por_segundo
+        if liberacao > agora:
+            await asyncio.sleep(liberacao - agora)
+    
+    async def _abrir(self, destino):
+        """
+        Abre uma nova conexão (TLS para https).
+        """
+        esquema, servidor, porta = destino
+        if esquema == 'https' and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return await asyncio.open_connection(servidor, porta, ssl=self._ssl if esquema == 'https' else None)
+    
+    @staticmethod
+    async def _trocar(conexao, servidor, caminho):
+        """
+        Envia uma requisição GET e lê a resposta (Content-Length, chunked ou até o fim da conexão).
+        
+        Returns:
+            tuple: (situação HTTP, cabeçalhos em minúsculas, corpo, conexão reutilizável)
+        """
+        leitor, escritor = conexao
+        escritor.write(
+            f'GET {caminho} HTTP/1.1\r\nHost: {servidor}\r\nUser-Agent: Mozilla/5.0 (robo-trader)\r\n'
+            f'Accept: application/json\r\nConnection: keep-alive\r\n\r\n'.encode('latin-1')
+        )
+        await escritor.drain()
+        
+        linha = await leitor.readline()
+        if not linha:
+            raise ConnectionResetError("Conexão encerrada pelo servidor.")
+        situacao = int(linha.split()[1])
+        cabecalhos = {}
+        while (linha := await leitor.readline()) not in (b'\r\n', b'\n', b''):
+            nome, _, valor = linha.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        
+        reutilizavel = cabecalhos.get('connection', '').lower() != 'close'
+        if cabecalhos.get('transfer-encoding', '').lower() == 'chunked':
+            partes = []
+            while (tamanho := int((await leitor.readline()).split(b';')[0], 16)) > 0:
+                partes.append(await leitor.readexactly(tamanho))
+                await leitor.readline()
+            while await leitor.readline() not in (b'\r\n', b'\n', b''):
+                pass
+            corpo = b''.join(partes)
+        elif 'content-length' in cabecalhos:
+            corpo = await leitor.readexactly(int(cabecalhos['content-length']))
+        else:
+            corpo = await leitor.read()
+            reutilizavel = False
+        return situacao, cabecalhos, corpo, reutilizavel
+    
+    async def _requisitar(self, url):
+        """
+        Executa uma tentativa, reaproveitando uma conexão livre do mesmo servidor.
+        
+        Uma conexão reaproveitada que o servidor já tenha fechado é trocada
+        por uma nova sem contar como tentativa.
+        """
+        partes = urlsplit(url)
+        destino = (partes.scheme, partes.hostname, partes.port or (443 if partes.scheme == 'https' else 80))
+        caminho = (partes.path or '/') + (f'?{partes.query}' if partes.query else '')
+        
+        while True:
+            reaproveitada = bool(self._livres[destino])
+            conexao = self._livres[destino].pop() if reaproveitada else await self._abrir(destino)
+            try:
+                situacao, cabecalhos, corpo, reutilizavel = await asyncio.wait_for(
+                    self._trocar(conexao, partes.hostname, caminho), self.tempo_limite
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conexao[1].close()
+                if reaproveitada:
+                    continue
+                raise
+            except BaseException:
+                conexao[1].close()
+                raise
+            
+            if reutilizavel:
+                self._livres[destino].append(conexao)
+            else:
+                conexao[1].close()
+            return situacao, cabecalhos, corpo
+    
+    async def obter(self, url):
+        """
+        Baixa o corpo de uma URL, com novas tentativas em falhas temporárias.
+        
+        Falhas de conexão, tempo esgotado e as situações de SITUACOES_REPETIR
+        são repetidas com espera exponencial (ou a indicada em Retry-After).
+        
+        Args:
+            url (str): URL completa (http ou https).
+        
+        Returns:
+            bytes: Corpo da resposta.
+        
+        Raises:
+            ConnectionError: Se todas as tentativas falharem ou a situação HTTP não for repetível.
+        """
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.limite_conexoes)
+        
+        espera = self.espera_inicial
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                async with self._semaforo:
+                    await self._aguardar_ritmo()
+                    situacao, cabecalhos, corpo = await self._requisitar(url)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as excecao:
+                erro, atraso = excecao, espera
+            else:
+                if situacao == 200:
+                    return corpo
+                erro = ConnectionError(f"HTTP {situacao} em {url}")
+                if situacao not in SITUACOES_REPETIR:
+                    raise erro
+                retry_after = cabecalhos.get('retry-after', '')
+                atraso = float(retry_after) if retry_after.isdigit() else espera
+            
+            if tentativa < self.tentativas:
+                await asyncio.sleep(atraso)
+                espera *= 2
+        
+        raise ConnectionError(f"Falha ao baixar {url} após {self.tentativas} tentativas: {erro}")
+
+class CarregadorDadosMercado:
+    """
+    Carrega os dados históricos de vários ativos de uma vez.
+    
+    Uso:
+        carregador = CarregadorDadosMercado()
+        dados = carregador.carregar_todos(['PETR4.SA', 'VALE3.SA'], periodo='1y', intervalo='1d')
+    """
+    
+    def __init__(self, url_base=URL_YAHOO, limite_conexoes=64, requisicoes_por_segundo=None, tentativas=3,
+                 espera_inicial=0.5, tempo_limite=30.0, diretorio_cache=DIRETORIO_CACHE, validade_cache=900.0):
+        """
+        Inicializa o carregador.
+        
+        Args:
+            url_base (str): Endereço do gráfico, ao qual é acrescentado o símbolo
+                (ex: um servidor local de testes).
+            limite_conexoes (int): Máximo de requisições simultâneas.
+            requisicoes_por_segundo (float): Ritmo máximo de novas requisições (None: sem limite).
+            tentativas (int): Número máximo de tentativas por ativo.
+            espera_inicial (float): Espera antes da segunda tentativa, dobrada a cada nova falha (segundos).
+            tempo_limite (float): Tempo máximo de cada tentativa (segundos).
+            diretorio_cache (str): Diretório do cache de respostas (None: sem cache).
+            validade_cache (float): Validade das respostas no cache (segundos).
+        """
+        self.url_base = url_base
+        self.parametros_cliente = {
+            'limite_conexoes': limite_conexoes,
+            'requisicoes_por_segundo': requisicoes_por_segundo,
+            'tentativas': tentativas,
+            'espera_inicial': espera_inicial,
+            'tempo_limite': tempo_limite
+        }
+        self.cache = CacheDisco(diretorio_cache, validade_cache) if diretorio_cache else None
+    
+    def _url(self, symbol, periodo, intervalo):
+        """
+        Endereço da requisição do gráfico de um ativo.
+        """
+        return f"{self.url_base}{quote(symbol)}?{urlencode({'interval': intervalo, 'range': periodo})}"
+    
+    async def _carregar(self, cliente, symbol, periodo, intervalo):
+        """
+        Carrega um ativo do cache ou da API.
+        
+        Returns:
+            pandas.DataFrame: Dados OHLCV (None em caso de falha).
+        """
+        url = self._url(symbol, periodo, intervalo)
+        corpo = self.cache.ler(url) if self.cache else None
+        try:
+            em_cache = corpo is not None
+            if not em_cache:
+                corpo = await cliente.obter(url)
+            dados = converter_grafico(json.loads(corpo))
+        except (ConnectionError, ValueError, KeyError, IndexError) as e:
+            print(f"Erro ao carregar dados de {symbol}: {e}.")
+            return None
+        
+        if dados is not None and self.cache and not em_cache:
+            self.cache.gravar(url, corpo)
+        return dados
+    
+    async def carregar_varios(self, symbols, periodo='1y', intervalo='1d'):
+        """
+        Carrega vários ativos concorrentemente.
+        
+        Args:
+            symbols (list): Símbolos dos ativos.
+            periodo (str): Período de dados a carregar.
+            intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        
+        Returns:
+            dict: Dicionário {symbol: DataFrame OHLCV ou None em caso de falha}.
+        """
+        async with ClienteHttpAssincrono(**self.parametros_cliente) as cliente:
+            resultados = await asyncio.gather(*(
+                self._carregar(cliente, symbol, periodo, intervalo) for symbol in symbols
+            ))
+        return dict(zip(symbols, resultados))
+    
+    def carregar_todos(self, symbols, periodo='1y', intervalo='1d'):
+        """
+        Versão síncrona de carregar_varios (executa o próprio laço asyncio).
+        
+        Args:
+            symbols (list): Símbolos dos ativos.
+            periodo (str): Período de dados a carregar.
+            intervalo (str): Intervalo das barras.
+        
+        Returns:
+            dict: Dicionário {symbol: DataFrame OHLCV ou None em caso de falha}.
+        """
+        return asyncio.run(self.carregar_varios(symbols, periodo, intervalo))
@@ -0,0 +1,277 @@
+"""
+Módulo de Backtesting de Carteira para o Robô Trader
+
+Este módulo simula vários ativos ao mesmo tempo sobre um único capital:
+cada entrada é dimensionada por GerenciamentoRisco.calcular_tamanho_posicao
+a partir do patrimônio da carteira, e a exposição total das posições
+abertas é limitada por GerenciamentoRisco.calcular_exposicao_maxima.
+
+Os dados dos ativos são alinhados em matrizes (barras x ativos) e a
+simulação percorre as barras uma única vez; em cada barra, stops, alvos,
+sinais contrários, entradas e a marcação a mercado são calculados para
+todos os ativos de uma vez, com operações vetorizadas do NumPy.
+"""
+
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from analise_tecnica.gerenciamento_risco import GerenciamentoRisco
+from analise_tecnica.intradiario import SESSAO_PADRAO, converter_intervalo, fins_sessao, inferir_intervalo, periodos_por_ano
+from analise_tecnica.livro_operacoes import criar_livro
+from analise_tecnica.metricas_incrementais import MetricasIncrementais
+from testes.backtesting import Backtesting
+
+class BacktestingCarteira:
+    """
+    Classe para realizar o backtesting de uma estratégia sobre uma carteira de ativos.
+    """
+    
+    def __init__(self, dados_ativos, capital_inicial=100000.0, comissao=0.0, precisao=None, intervalo=None,
+                 sessao=SESSAO_PADRAO):
+        """
+        Inicializa o backtesting da carteira.
+        
+        Args:
+            dados_ativos (dict): Dicionário {ativo: DataFrame com dados históricos (OHLCV)}.
+                Os históricos podem ter datas diferentes; as barras ausentes de um
+                ativo não negociam e mantêm o último preço na marcação a mercado.
+            capital_inicial (float): Capital inicial compartilhado pelos ativos.
+            comissao (float): Valor da comissão por operação (percentual do valor de entrada).
+            precisao (str): Precisão dos dados e indicadores ('float64' ou 'float32').
+            intervalo (str): Intervalo das barras ('1m', '5m', '1d'...; None: inferido das datas).
+            sessao (tuple): Horário do pregão (início, fim), usado na anualização de barras intradiárias.
+        """
+        if not dados_ativos:
+            raise ValueError("A carteira precisa de pelo menos um ativo.")
+        
+        self.ativos = list(dados_ativos)
+        self.backtests = {
+            ativo: Backtesting(dados, capital_inicial, comissao, precisao, intervalo, sessao)
+            for ativo, dados in dados_ativos.items()
+        }
+        self.capital_inicial = capital_inicial
+        self.comissao = comissao
+        
+        # Alinhar os ativos nas datas de todos os históricos (barras x ativos)
+        self.precos = {
+            coluna: pd.concat({ativo: backtest.dados[coluna] for ativo, backtest in self.backtests.items()}, axis=1)
+            for coluna in ('open', 'high', 'low', 'close')
+        }
+        self.indice = self.precos['close'].index
+        self.intervalo = converter_intervalo(intervalo) if intervalo is not None else inferir_intervalo(self.indice)
+        self.periodos_por_ano = periodos_por_ano(self.intervalo, sessao)
+        self.resultados = None
+    
+    def executar_backtest(self, estrategia, params=None, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0,
+                          exposicao_maxima=100.0, encerrar_sessao=False):
+        """
+        Executa o backtesting de uma estratégia em todos os ativos da carteira.
+        
+        Args:
+            estrategia (str): Nome da estratégia (ver Backtesting._gerar_sinais).
+            params (dict): Parâmetros específicos da estratégia.
+            risco_por_operacao (float): Percentual do patrimônio a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            exposicao_maxima (float): Exposição máxima das posições abertas (percentual do patrimônio).
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão.
+        
+        Returns:
+            dict: Resultados do backtesting.
+        """
+        sinais = self.gerar_sinais(estrategia, params)
+        
+        return self.simular(sinais, risco_por_operacao, stop_atr, take_profit_rr, exposicao_maxima, encerrar_sessao)
+    
+    def gerar_sinais(self, estrategia, params=None):
+        """
+        Gera os sinais de uma estratégia para cada ativo, alinhados nas datas da carteira.
+        
+        Args:
+            estrategia (str): Nome da estratégia.
+            params (dict): Parâmetros específicos da estratégia.
+        
+        Returns:
+            pandas.DataFrame: Sinais (barras x ativos), 0 nas barras ausentes de cada ativo.
+        """
+        sinais = pd.concat({
+            ativo: backtest.gerar_sinais(estrategia, params) for ativo, backtest in self.backtests.items()
+        }, axis=1)
+        return sinais.reindex(self.indice).fillna(0).astype(np.int8)
+    
+    def _preparar_atr(self):
+        """
+        Alinha o ATR de cada ativo (calculado uma vez por Backtesting) nas datas da carteira.
+        """
+        return pd.concat({
+            ativo: pd.Series(backtest._preparar_features()['atr'], index=backtest.dados.index)
+            for ativo, backtest in self.backtests.items()
+        }, axis=1).reindex(self.indice).to_numpy(dtype=np.float64)
+    
+    def simular(self, sinais, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, exposicao_maxima=100.0,
+                encerrar_sessao=False):
+        """
+        Simula as operações da carteira a partir de sinais já calculados.
+        
+        As regras de cada posição são as de Backtesting (stop loss e take profit
+        pelo ATR, saída no sinal contrário, entrada na abertura da barra do
+        sinal), mas o tamanho vem do patrimônio da carteira: em cada barra,
+        as entradas são dimensionadas pelo risco e, se juntas ultrapassarem a
+        exposição disponível, reduzidas na mesma proporção. O capital é
+        marcado a mercado no fechamento de cada barra.
+        
+        Args:
+            sinais (pandas.DataFrame): Sinais (barras x ativos), como em gerar_sinais.
+            risco_por_operacao (float): Percentual do patrimônio a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            exposicao_maxima (float): Exposição máxima das posições abertas (percentual do patrimônio).
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão.
+        
+        Returns:
+            dict: Métricas de desempenho da carteira, 'capital_historico',
+                'drawdown', 'exposicao' (percentual do patrimônio em cada barra),
+                'operacoes' (livro com os campos extras 'ativo' e 'quantidade') e
+                'posicoes_abertas' (DataFrame com as posições abertas ao final).
+        """
+        abertura = self.precos['open'].to_numpy(dtype=np.float64)
+        maxima = self.precos['high'].to_numpy(dtype=np.float64)
+        minima = self.precos['low'].to_numpy(dtype=np.float64)
+        fechamento = self.precos['close'].to_numpy(dtype=np.float64)
+        sinais = sinais[self.ativos].to_numpy(dtype=np.int8)
+        atr = self._preparar_atr()
+        
+        # Último fechamento conhecido de cada ativo (0 antes do início do histórico)
+        marcacao = self.precos['close'].ffill().fillna(0).to_numpy(dtype=np.float64)
+        entrada_valida = np.isfinite(abertura) & np.isfinite(atr) & (atr > 0)
+        tem_sinal = (sinais != 0).any(axis=1)
+        fim_sessao = fins_sessao(self.indice) if encerrar_sessao else np.zeros(len(self.indice), dtype=bool)
+        
+        n, total_ativos = fechamento.shape
+        direcoes = np.zeros(total_ativos, dtype=np.int8)
+        quantidades = np.zeros(total_ativos)
+        precos_entrada = np.zeros(total_ativos)
+        barras_entrada = np.zeros(total_ativos, dtype=np.int64)
+        stops = np.zeros(total_ativos)
+        alvos = np.zeros(total_ativos)
+        caixa = self.capital_inicial
+        
+        capital_historico = np.empty(n)
+        exposicao = np.zeros(n)
+        capital_historico[0] = caixa
+        saidas = []
+        
+        def encerrar(i, selecao, precos_saida, motivos):
+            # Registra as saídas selecionadas e devolve o valor creditado no caixa
+            ativos = np.flatnonzero(selecao)
+            precos_saida = precos_saida[ativos]
+            quantidade = quantidades[ativos]
+            entrada = precos_entrada[ativos]
+            saidas.append((barras_entrada[ativos], np.full(len(ativos), i), ativos, direcoes[ativos], entrada,
+                           precos_saida, np.abs(quantidade), motivos[ativos]))
+            credito = np.sum(quantidade * precos_saida - self.comissao / 100 * np.abs(quantidade) * entrada)
+            direcoes[ativos] = 0
+            quantidades[ativos] = 0.0
+            return credito
+        
+        for i in range(1, n):
+            abertas = direcoes != 0
+            if not tem_sinal[i] and not abertas.any():
+                capital_historico[i] = caixa
+                continue
+            
+            # Stop loss, take profit e sinal contrário, nesta ordem de prioridade
+            if abertas.any():
+                comprado = direcoes == 1
+                vendido = direcoes == -1
+                stop = (comprado & (minima[i] <= stops)) | (vendido & (maxima[i] >= stops))
+                alvo = ~stop & ((comprado & (maxima[i] >= alvos)) | (vendido & (minima[i] <= alvos)))
+                contrario = ~stop & ~alvo & abertas & (sinais[i] == -direcoes)
+                saida = stop | alvo | contrario
+                if saida.any():
+                    precos_saida = np.where(stop, stops, np.where(alvo, alvos, abertura[i]))
+                    motivos = np.where(stop, 0, np.where(alvo, 1, 2))
+                    caixa += encerrar(i, saida, precos_saida, motivos)
+            
+            # Abrir novas posições na abertura, dimensionadas pelo patrimônio da carteira
+            novas = (direcoes == 0) & (sinais[i] != 0) & entrada_valida[i]
+            if novas.any():
+                referencia = np.where(np.isfinite(abertura[i]), abertura[i], marcacao[i - 1])
+                patrimonio = caixa + quantidades @ referencia
+                exposicao_atual = np.abs(quantidades) @ referencia
+                
+                direcao = sinais[i][novas]
+                preco = abertura[i][novas]
+                distancia_stop = stop_atr * atr[i][novas]
+                preco_stop = preco - direcao * distancia_stop
+                tamanhos = GerenciamentoRisco.calcular_tamanho_posicao(patrimonio, risco_por_operacao, preco,
+                                                                       preco_stop)
+                
+                # Reduzir as entradas na mesma proporção se ultrapassarem a exposição disponível
+                folga = GerenciamentoRisco.calcular_exposicao_maxima(patrimonio, exposicao_maxima) - exposicao_atual
+                nocional = tamanhos @ preco
+                if nocional > max(folga, 0.0):
+                    tamanhos *= max(folga, 0.0) / nocional
+                
+                selecao = tamanhos > 0
+                ativos = np.flatnonzero(novas)[selecao]
+                direcao, preco, distancia_stop, tamanhos = (direcao[selecao], preco[selecao],
+                                                            distancia_stop[selecao], tamanhos[selecao])
+                direcoes[ativos] = direcao
+                quantidades[ativos] = direcao * tamanhos
+                precos_entrada[ativos] = preco
+                barras_entrada[ativos] = i
+                stops[ativos] = preco - direcao * distancia_stop
+                alvos[ativos] = preco + direcao * distancia_stop * take_profit_rr
+                caixa -= quantidades[ativos] @ preco
+            
+            # Zerar as posições no fechamento da última barra do pregão
+            if fim_sessao[i] and (direcoes != 0).any():
+                caixa += encerrar(i, direcoes != 0, marcacao[i], np.full(total_ativos, 3))
+            
+            # Marcar a carteira a mercado no fechamento
+            capital_historico[i] = caixa + quantidades @ marcacao[i]
+            exposicao[i] = np.abs(quantidades) @ marcacao[i] / capital_historico[i] * 100
+        
+        operacoes = self._montar_livro(saidas)
+        abertas = direcoes != 0
+        posicoes_abertas = pd.DataFrame({
+            'tipo': direcoes[abertas],
+            'quantidade': np.abs(quantidades[abertas]),
+            'preco_entrada': precos_entrada[abertas],
+            'data_entrada': self.indice[barras_entrada[abertas]]
+        }, index=pd.Index(self.ativos)[abertas])
+        
+        metricas = MetricasIncrementais(self.capital_inicial, self.periodos_por_ano)
+        drawdown = np.concatenate(([0.0], metricas.atualizar_lote(capital_historico[1:])))
+        metricas.registrar_operacoes(operacoes['resultado'])
+        
+        resultados = {
+            **metricas.instantaneo(),
+            'capital_historico': capital_historico,
+            'drawdown': drawdown,
+            'exposicao': exposicao,
+            'operacoes': operacoes,
+            'posicoes_abertas': posicoes_abertas
+        }
+        self.resultados = resultados
+        
+        return resultados
+    
+    def _montar_livro(self, saidas):
+        """
+        Monta o livro de operações da carteira, em ordem de saída.
+        
+        O resultado de cada operação é percentual sobre o preço de entrada,
+        líquido da comissão, como em Backtesting.
+        """
+        colunas = [np.concatenate(coluna) for coluna in zip(*saidas)] if saidas else [np.empty(0, dtype=np.int64)] * 8
+        barras_entrada, barras_saida, ativos, tipos, precos_entrada, precos_saida, quantidades, motivos = colunas
+        tipos = tipos.astype(np.int8)
+        resultados = tipos * (precos_saida - precos_entrada) / precos_entrada * 100 - self.comissao
+        
+        return criar_livro(
+            self.indice[barras_entrada], self.indice[barras_saida], tipos, precos_entrada, precos_saida, resultados,
+            motivos, ativo=np.asarray(self.ativos)[ativos], quantidade=quantidades.astype(np.float64)
+        )
@@ -0,0 +1,132 @@
+"""
+Módulo de Dados Compartilhados entre Processos para o Robô Trader
+
+Este módulo publica um DataFrame OHLCV em memória compartilhada para que
+processos de trabalho (otimização, execução paralela de backtests) leiam
+os mesmos dados sem copiá-los nem serializá-los a cada tarefa.
+"""
+
+import sys
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+def _anexar_segmento(nome):
+    """
+    Anexa um segmento existente sem assumir a responsabilidade de removê-lo.
+    
+    Os processos filhos compartilham o resource_tracker do processo que criou
+    o segmento, e só este o remove (DadosCompartilhados.fechar); a partir do
+    Python 3.13 o anexo nem chega a ser rastreado.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=nome, track=False)
+    return SharedMemory(name=nome)
+
+class DadosCompartilhados:
+    """
+    DataFrame publicado em um segmento de memória compartilhada.
+    
+    O processo principal cria o segmento e repassa `descritor` (pequeno e
+    serializável) aos processos de trabalho, que reconstroem o DataFrame
+    com DadosCompartilhados.anexar sem copiar os valores. Colunas numéricas
+    e índices de datas ou inteiros são compartilhados; índices de outros
+    tipos seguem no próprio descritor.
+    
+    Uso:
+        with DadosCompartilhados(dados) as compartilhados:
+            ... repassar compartilhados.descritor aos processos ...
+    """
+    
+    def __init__(self, dados):
+        """
+        Copia os dados para um novo segmento de memória compartilhada.
+        
+        Args:
+            dados (pandas.DataFrame): DataFrame com colunas numéricas (OHLCV).
+        """
+        colunas = []
+        deslocamento = 0
+        for coluna in dados.columns:
+            valores = dados[coluna].to_numpy()
+            if valores.dtype.kind not in 'biuf':
+                raise ValueError(f"Coluna '{coluna}' não é numérica e não pode ser compartilhada.")
+            colunas.append((coluna, valores.dtype.str, deslocamento))
+            deslocamento += -(-valores.nbytes // 8) * 8  # alinhar em 8 bytes
+        
+        indice = dados.index
+        if isinstance(indice, pd.DatetimeIndex):
+            fuso = str(indice.tz) if indice.tz is not None else None
+            descritor_indice = ('datas', deslocamento, indice.unit, fuso, indice.name)
+            deslocamento += 8 * len(indice)
+        elif isinstance(indice, pd.RangeIndex):
+            descritor_indice = ('intervalo', indice.start, indice.stop, indice.step, indice.name)
+        else:
+            descritor_indice = ('valores', indice)
+        
+        self._segmento = SharedMemory(create=True, size=max(deslocamento, 8))
+        self.descritor = {
+            'nome': self._segmento.name,
+            'barras': len(dados),
+            'colunas': colunas,
+            'indice': descritor_indice
+        }
+        
+        for coluna, dtype, inicio in colunas:
+            destino = np.ndarray(len(dados), dtype=dtype, buffer=self._segmento.buf, offset=inicio)
+            destino[:] = dados[coluna].to_numpy()
+        if descritor_indice[0] == 'datas':
+            destino = np.ndarray(len(dados), dtype=np.int64, buffer=self._segmento.buf, offset=descritor_indice[1])
+            destino[:] = indice.asi8
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.fechar()
+    
+    def fechar(self):
+        """
+        Libera e remove o segmento (apenas no processo que o criou).
+        """
+        if self._segmento is not None:
+            self._segmento.close()
+            self._segmento.unlink()
+            self._segmento = None
+    
+    @staticmethod
+    def anexar(descritor):
+        """
+        Reconstrói o DataFrame compartilhado em outro processo, sem cópia.
+        
+        O segmento devolvido deve ser mantido vivo enquanto o DataFrame for usado.
+        
+        Args:
+            descritor (dict): Descritor criado por DadosCompartilhados.
+        
+        Returns:
+            tuple: (SharedMemory, pandas.DataFrame somente leitura)
+        """
+        segmento = _anexar_segmento(descritor['nome'])
+        barras = descritor['barras']
+        
+        valores = {}
+        for coluna, dtype, inicio in descritor['colunas']:
+            valores[coluna] = np.ndarray(barras, dtype=dtype, buffer=segmento.buf, offset=inicio)
+            valores[coluna].flags.writeable = False
+        
+        tipo_indice = descritor['indice'][0]
+        if tipo_indice == 'datas':
+            _, inicio, unidade, fuso, nome = descritor['indice']
+            datas = np.ndarray(barras, dtype=np.int64, buffer=segmento.buf, offset=inicio).view(f'datetime64[{unidade}]')
+            indice = pd.DatetimeIndex(datas, name=nome)
+            if fuso is not None:
+                indice = indice.tz_localize('UTC').tz_convert(fuso)
+        elif tipo_indice == 'intervalo':
+            _, inicio, fim, passo, nome = descritor['indice']
+            indice = pd.RangeIndex(inicio, fim, passo, name=nome)
+        else:
+            indice = descritor['indice'][1]
+        
+        return segmento, pd.DataFrame(valores, index=indice, copy=False)
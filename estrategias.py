@@ -9,13 +9,77 @@ import pandas as pd
 import numpy as np
 from .indicadores import IndicadoresTecnicos
 from .price_action import PriceAction
+from .niveis import RastreadorSuporteResistencia
+from .painel import como_dados, suportar_painel
+
+def _sinais_cruzamento(valores, nivel_compra, nivel_venda=None):
+    """
+    Gera sinais de cruzamento de forma vetorizada.
+    
+    Compra quando `valores` cruza `nivel_compra` para cima e venda quando cruza
+    `nivel_venda` para baixo (a compra tem prioridade na mesma barra), como nos
+    laços originais das estratégias de cruzamento.
+    
+    Args:
+        valores (array-like): Série que cruza os níveis.
+        nivel_compra (array-like ou float): Nível de referência para compra.
+        nivel_venda (array-like ou float): Nível de referência para venda (padrão: nivel_compra).
+        
+    Returns:
+        numpy.ndarray: Array de sinais (1 para compra, -1 para venda, 0 para neutro).
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    nivel_compra = np.broadcast_to(np.asarray(nivel_compra, dtype=np.float64), valores.shape)
+    if nivel_venda is None:
+        nivel_venda = nivel_compra
+    else:
+        nivel_venda = np.broadcast_to(np.asarray(nivel_venda, dtype=np.float64), valores.shape)
+    
+    atual, anterior = valores[1:], valores[:-1]
+    cruza_para_cima = (atual > nivel_compra[1:]) & (anterior <= nivel_compra[:-1])
+    cruza_para_baixo = (atual < nivel_venda[1:]) & (anterior >= nivel_venda[:-1])
+    
+    sinais = np.zeros(valores.shape, dtype=np.int64)
+    sinais[1:] = np.where(cruza_para_cima, 1, np.where(cruza_para_baixo, -1, 0))
+    return sinais
+
+def _sinais_toque_bandas(dados_close, banda_superior, banda_inferior):
+    """
+    Gera sinais de reversão nas bandas de forma vetorizada.
+    
+    O sinal da barra i depende do fechamento e das bandas da barra i-1; o toque
+    na banda inferior tem prioridade sobre o toque na superior.
+    
+    Args:
+        dados_close (array-like): Preços de fechamento.
+        banda_superior (array-like): Banda superior.
+        banda_inferior (array-like): Banda inferior.
+        
+    Returns:
+        numpy.ndarray: Array de sinais (1 para compra, -1 para venda, 0 para neutro).
+    """
+    dados_close = np.asarray(dados_close, dtype=np.float64)
+    banda_superior = np.asarray(banda_superior, dtype=np.float64)
+    banda_inferior = np.asarray(banda_inferior, dtype=np.float64)
+    
+    anterior = dados_close[:-1]
+    toca_inferior = anterior <= banda_inferior[:-1]
+    toca_superior = anterior >= banda_superior[:-1]
+    
+    sinais = np.zeros(dados_close.shape, dtype=np.int64)
+    sinais[1:] = np.where(toca_inferior, 1, np.where(toca_superior, -1, 0))
+    return sinais
 
 class EstrategiasTrading:
     """
     Classe que implementa estratégias de trading para day trading.
+    
+    Todas as estratégias aceitam Series de um ativo ou painéis (DataFrame
+    barras x ativos) e, neste caso, devolvem um DataFrame de sinais.
     """
     
     @staticmethod
+    @suportar_painel
     def cruzamento_medias_moveis(dados_close, periodo_curto=9, periodo_longo=21):
         """
         Estratégia baseada no cruzamento de médias móveis.
@@ -31,22 +95,13 @@ class EstrategiasTrading:
         ma_curta = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_curto)
         ma_longa = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_longo)
         
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
-        
         # Gerar sinais de cruzamento
-        for i in range(1, len(dados_close)):
-            # Cruzamento para cima (compra)
-            if ma_curta.iloc[i] > ma_longa.iloc[i] and ma_curta.iloc[i-1] <= ma_longa.iloc[i-1]:
-                sinais.iloc[i] = 1
-            
-            # Cruzamento para baixo (venda)
-            elif ma_curta.iloc[i] < ma_longa.iloc[i] and ma_curta.iloc[i-1] >= ma_longa.iloc[i-1]:
-                sinais.iloc[i] = -1
+        sinais = _sinais_cruzamento(ma_curta, ma_longa)
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def rsi_sobrecomprado_sobrevendido(dados_close, periodo=14, nivel_sobrecomprado=70, nivel_sobrevendido=30):
         """
         Estratégia baseada em níveis de sobrecompra e sobrevenda do RSI.
@@ -62,22 +117,13 @@ class EstrategiasTrading:
         """
         rsi = IndicadoresTecnicos.rsi(dados_close, periodo)
         
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
-        
-        # Gerar sinais baseados em níveis de RSI
-        for i in range(1, len(dados_close)):
-            # Sinal de compra: RSI saindo da região de sobrevenda
-            if rsi.iloc[i] > nivel_sobrevendido and rsi.iloc[i-1] <= nivel_sobrevendido:
-                sinais.iloc[i] = 1
-            
-            # Sinal de venda: RSI saindo da região de sobrecompra
-            elif rsi.iloc[i] < nivel_sobrecomprado and rsi.iloc[i-1] >= nivel_sobrecomprado:
-                sinais.iloc[i] = -1
+        # Compra: RSI saindo da sobrevenda; venda: RSI saindo da sobrecompra
+        sinais = _sinais_cruzamento(rsi, nivel_sobrevendido, nivel_sobrecomprado)
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def macd_crossover(dados_close, periodo_rapido=12, periodo_lento=26, periodo_sinal=9):
         """
         Estratégia baseada no cruzamento da linha MACD com a linha de sinal.
@@ -95,22 +141,13 @@ class EstrategiasTrading:
             dados_close, periodo_rapido, periodo_lento, periodo_sinal
         )
         
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
-        
         # Gerar sinais de cruzamento
-        for i in range(1, len(dados_close)):
-            # Cruzamento para cima (compra)
-            if macd_linha.iloc[i] > sinal.iloc[i] and macd_linha.iloc[i-1] <= sinal.iloc[i-1]:
-                sinais.iloc[i] = 1
-            
-            # Cruzamento para baixo (venda)
-            elif macd_linha.iloc[i] < sinal.iloc[i] and macd_linha.iloc[i-1] >= sinal.iloc[i-1]:
-                sinais.iloc[i] = -1
+        sinais = _sinais_cruzamento(macd_linha, sinal)
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def bollinger_bands_reversal(dados_close, periodo=20, desvios=2):
         """
         Estratégia de reversão baseada nas Bandas de Bollinger.
@@ -127,22 +164,13 @@ class EstrategiasTrading:
             dados_close, periodo, desvios
         )
         
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
-        
         # Gerar sinais baseados em toques nas bandas
-        for i in range(1, len(dados_close)):
-            # Preço toca ou cruza a banda inferior (compra)
-            if dados_close.iloc[i-1] <= banda_inferior.iloc[i-1]:
-                sinais.iloc[i] = 1
-            
-            # Preço toca ou cruza a banda superior (venda)
-            elif dados_close.iloc[i-1] >= banda_superior.iloc[i-1]:
-                sinais.iloc[i] = -1
+        sinais = _sinais_toque_bandas(dados_close, banda_superior, banda_inferior)
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def price_action_pin_bar(dados_open, dados_high, dados_low, dados_close, fator_sombra=2.0):
         """
         Estratégia baseada em pin bars (barras de reversão).
@@ -161,20 +189,21 @@ class EstrategiasTrading:
             dados_open, dados_high, dados_low, dados_close, fator_sombra
         )
         
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
-        
         # Gerar sinais baseados em pin bars
-        sinais[pin_bar_alta] = 1  # Pin bar de alta (sinal de compra)
-        sinais[pin_bar_baixa] = -1  # Pin bar de baixa (sinal de venda)
+        sinais = np.where(pin_bar_alta, 1, 0)  # Pin bar de alta (sinal de compra)
+        sinais = np.where(pin_bar_baixa, -1, sinais)  # Pin bar de baixa (sinal de venda)
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def suporte_resistencia_breakout(dados_open, dados_high, dados_low, dados_close, periodo=14, threshold=0.03):
         """
         Estratégia baseada em rompimentos de níveis de suporte e resistência.
         
+        Os níveis vêm dos pivôs das últimas `periodo` barras, mantidos por um
+        RastreadorSuporteResistencia que é atualizado barra a barra.
+        
         Args:
             dados_open (pandas.Series): Série de preços de abertura.
             dados_high (pandas.Series): Série de preços máximos.
@@ -186,32 +215,46 @@ class EstrategiasTrading:
         Returns:
             pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
         """
-        # Inicializar série de sinais
-        sinais = pd.Series(0, index=dados_close.index)
+        # O rastreador é sequencial; em painéis, cada ativo é percorrido separadamente
+        if isinstance(dados_close, pd.DataFrame):
+            return pd.DataFrame({
+                ativo: EstrategiasTrading.suporte_resistencia_breakout(
+                    dados_open[ativo], dados_high[ativo], dados_low[ativo], dados_close[ativo], periodo, threshold
+                )
+                for ativo in dados_close.columns
+            }, index=dados_close.index)
         
-        # Analisar janelas móveis para identificar rompimentos
-        for i in range(periodo, len(dados_close)):
-            # Obter níveis de suporte e resistência para a janela atual
-            janela_high = dados_high.iloc[i-periodo:i]
-            janela_low = dados_low.iloc[i-periodo:i]
-            
-            suportes, resistencias = PriceAction.identificar_suporte_resistencia(
-                janela_high, janela_low, dados_close.iloc[i-periodo:i], periodo, threshold
-            )
-            
-            # Verificar rompimentos
-            if suportes and resistencias:
-                # Rompimento de resistência (compra)
-                if dados_close.iloc[i] > min(resistencias) * (1 + threshold/2):
-                    sinais.iloc[i] = 1
+        rastreador = RastreadorSuporteResistencia(periodo, threshold)
+        
+        highs = np.asarray(dados_high, dtype=np.float64).tolist()
+        lows = np.asarray(dados_low, dtype=np.float64).tolist()
+        closes = np.asarray(dados_close, dtype=np.float64).tolist()
+        
+        # Inicializar sinais
+        sinais = np.zeros(len(closes), dtype=np.int64)
+        
+        # Uma passada: os níveis da janela [i-periodo, i) são avaliados contra o fechamento i
+        for i in range(len(closes)):
+            if i >= periodo:
+                menor_resistencia = rastreador.menor_resistencia()
+                maior_suporte = rastreador.maior_suporte()
                 
-                # Rompimento de suporte (venda)
-                elif dados_close.iloc[i] < max(suportes) * (1 - threshold/2):
-                    sinais.iloc[i] = -1
+                # Verificar rompimentos
+                if menor_resistencia is not None and maior_suporte is not None:
+                    # Rompimento de resistência (compra)
+                    if closes[i] > menor_resistencia * (1 + threshold/2):
+                        sinais[i] = 1
+                    
+                    # Rompimento de suporte (venda)
+                    elif closes[i] < maior_suporte * (1 - threshold/2):
+                        sinais[i] = -1
+            
+            rastreador.atualizar(highs[i], lows[i])
         
-        return sinais
+        return como_dados(sinais, dados_close)
     
     @staticmethod
+    @suportar_painel
     def estrategia_combinada(dados_open, dados_high, dados_low, dados_close, pesos=None):
         """
         Estratégia combinada que utiliza múltiplos indicadores e técnicas de price action.
@@ -259,8 +302,7 @@ class EstrategiasTrading:
         sinais_combinados = sinais_combinados / soma_pesos
         
         # Converter para sinais discretos
-        sinais = pd.Series(0, index=dados_close.index)
-        sinais[sinais_combinados > 0.3] = 1  # Sinal forte de compra
-        sinais[sinais_combinados < -0.3] = -1  # Sinal forte de venda
+        sinais = np.where(sinais_combinados > 0.3, 1, 0)  # Sinal forte de compra
+        sinais = np.where(sinais_combinados < -0.3, -1, sinais)  # Sinal forte de venda
         
-        return sinais
+        return como_dados(sinais, dados_close)
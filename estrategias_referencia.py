@@ -0,0 +1,142 @@
+"""
+Implementações de referência das estratégias de cruzamento do Robô Trader
+
+Este módulo preserva os laços originais (barra a barra) de EstrategiasTrading.
+Eles são usados apenas para validar e medir os kernels vetorizados que geram
+os sinais em estrategias.py.
+"""
+
+import pandas as pd
+from .indicadores import IndicadoresTecnicos
+
+class EstrategiasReferencia:
+    """
+    Versões em laço das estratégias de cruzamento, mantidas como referência.
+    """
+    
+    @staticmethod
+    def cruzamento_medias_moveis(dados_close, periodo_curto=9, periodo_longo=21):
+        """
+        Estratégia baseada no cruzamento de médias móveis.
+        
+        Args:
+            dados_close (pandas.Series): Série de preços de fechamento.
+            periodo_curto (int): Período para média móvel de curto prazo.
+            periodo_longo (int): Período para média móvel de longo prazo.
+            
+        Returns:
+            pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
+        """
+        ma_curta = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_curto)
+        ma_longa = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_longo)
+        
+        # Inicializar série de sinais
+        sinais = pd.Series(0, index=dados_close.index)
+        
+        # Gerar sinais de cruzamento
+        for i in range(1, len(dados_close)):
+            # Cruzamento para cima (compra)
+            if ma_curta.iloc[i] > ma_longa.iloc[i] and ma_curta.iloc[i-1] <= ma_longa.iloc[i-1]:
+                sinais.iloc[i] = 1
+            
+            # Cruzamento para baixo (venda)
+            elif ma_curta.iloc[i] < ma_longa.iloc[i] and ma_curta.iloc[i-1] >= ma_longa.iloc[i-1]:
+                sinais.iloc[i] = -1
+        
+        return sinais
+    
+    @staticmethod
+    def rsi_sobrecomprado_sobrevendido(dados_close, periodo=14, nivel_sobrecomprado=70, nivel_sobrevendido=30):
+        """
+        Estratégia baseada em níveis de sobrecompra e sobrevenda do RSI.
+        
+        Args:
+            dados_close (pandas.Series): Série de preços de fechamento.
+            periodo (int): Período para cálculo do RSI.
+            nivel_sobrecomprado (int): Nível que indica sobrecompra.
+            nivel_sobrevendido (int): Nível que indica sobrevenda.
+            
+        Returns:
+            pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
+        """
+        rsi = IndicadoresTecnicos.rsi(dados_close, periodo)
+        
+        # Inicializar série de sinais
+        sinais = pd.Series(0, index=dados_close.index)
+        
+        # Gerar sinais baseados em níveis de RSI
+        for i in range(1, len(dados_close)):
+            # Sinal de compra: RSI saindo da região de sobrevenda
+            if rsi.iloc[i] > nivel_sobrevendido and rsi.iloc[i-1] <= nivel_sobrevendido:
+                sinais.iloc[i] = 1
+            
+            # Sinal de venda: RSI saindo da região de sobrecompra
+            elif rsi.iloc[i] < nivel_sobrecomprado and rsi.iloc[i-1] >= nivel_sobrecomprado:
+                sinais.iloc[i] = -1
+        
+        return sinais
+    
+    @staticmethod
+    def macd_crossover(dados_close, periodo_rapido=12, periodo_lento=26, periodo_sinal=9):
+        """
+        Estratégia baseada no cruzamento da linha MACD com a linha de sinal.
+        
+        Args:
+            dados_close (pandas.Series): Série de preços de fechamento.
+            periodo_rapido (int): Período para a média móvel rápida.
+            periodo_lento (int): Período para a média móvel lenta.
+            periodo_sinal (int): Período para a linha de sinal.
+            
+        Returns:
+            pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
+        """
+        macd_linha, sinal, _ = IndicadoresTecnicos.macd(
+            dados_close, periodo_rapido, periodo_lento, periodo_sinal
+        )
+        
+        # Inicializar série de sinais
+        sinais = pd.Series(0, index=dados_close.index)
+        
+        # Gerar sinais de cruzamento
+        for i in range(1, len(dados_close)):
+            # Cruzamento para cima (compra)
+            if macd_linha.iloc[i] > sinal.iloc[i] and macd_linha.iloc[i-1] <= sinal.iloc[i-1]:
+                sinais.iloc[i] = 1
+            
+            # Cruzamento para baixo (venda)
+            elif macd_linha.iloc[i] < sinal.iloc[i] and macd_linha.iloc[i-1] >= sinal.iloc[i-1]:
+                sinais.iloc[i] = -1
+        
+        return sinais
+    
+    @staticmethod
+    def bollinger_bands_reversal(dados_close, periodo=20, desvios=2):
+        """
+        Estratégia de reversão baseada nas Bandas de Bollinger.
+        
+        Args:
+            dados_close (pandas.Series): Série de preços de fechamento.
+            periodo (int): Período para cálculo das Bandas de Bollinger.
+            desvios (int): Número de desvios padrão para as bandas.
+            
+        Returns:
+            pandas.Series: Série com sinais de trading (1 para compra, -1 para venda, 0 para neutro).
+        """
+        banda_superior, _, banda_inferior = IndicadoresTecnicos.bandas_bollinger(
+            dados_close, periodo, desvios
+        )
+        
+        # Inicializar série de sinais
+        sinais = pd.Series(0, index=dados_close.index)
+        
+        # Gerar sinais baseados em toques nas bandas
+        for i in range(1, len(dados_close)):
+            # Preço toca ou cruza a banda inferior (compra)
+            if dados_close.iloc[i-1] <= banda_inferior.iloc[i-1]:
+                sinais.iloc[i] = 1
+            
+            # Preço toca ou cruza a banda superior (venda)
+            elif dados_close.iloc[i-1] >= banda_superior.iloc[i-1]:
+                sinais.iloc[i] = -1
+        
+        return sinais
@@ -8,69 +8,67 @@ implementadas no robô trader com dados históricos.
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
 import sys
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 sys.path.append('/home/ubuntu/robo_trader/src')
 from testes.backtesting import Backtesting
+from testes.armazem_dados import ArmazemDados
+from testes.carregador_mercado import CarregadorDadosMercado, converter_grafico
+from testes.dados_compartilhados import DadosCompartilhados
+from testes.gerador_sintetico import GeradorSintetico
+from analise_tecnica.indicadores import IndicadoresTecnicos
+from analise_tecnica.intradiario import (
+    DIAS_POR_ANO, FUSO_BOLSA, SESSAO_PADRAO, converter_intervalo, eh_intradiario, proximo_fechamento
+)
+
+# Maior período disponível no Yahoo Finance para cada intervalo intradiário
+PERIODOS_INTRADIARIOS = {'1m': '7d', '2m': '60d', '5m': '60d', '15m': '60d', '30m': '60d', '60m': '730d',
+                         '90m': '60d', '1h': '730d'}
 
 # Função para gerar dados sintéticos para teste
-def gerar_dados_sinteticos(dias=100, volatilidade=0.015, tendencia=0.0005):
+def gerar_dados_sinteticos(dias=100, volatilidade=0.015, tendencia=0.0005, intervalo='1d', sessao=SESSAO_PADRAO):
     """
     Gera dados sintéticos para teste de backtesting.
     
+    Os preços seguem um movimento browniano geométrico (ver GeradorSintetico)
+    ao longo de `dias` pregões (dias úteis) terminados hoje; com intervalos
+    intradiários, as barras ficam dentro do horário da sessão, com
+    volatilidade e tendência por barra proporcionais às diárias.
+    
     Args:
         dias (int): Número de dias a gerar.
         volatilidade (float): Volatilidade diária.
         tendencia (float): Tendência diária (positiva ou negativa).
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        sessao (tuple): Horário do pregão (início, fim), para barras intradiárias.
         
     Returns:
         pandas.DataFrame: DataFrame com dados OHLCV.
     """
-    # Gerar datas
-    data_final = datetime.now()
-    data_inicial = data_final - timedelta(days=dias)
-    datas = pd.date_range(start=data_inicial, end=data_final, freq='D')
-    
-    # Gerar preços de fechamento com caminhada aleatória
-    np.random.seed(42)  # Para reprodutibilidade
-    retornos = np.random.normal(tendencia, volatilidade, dias)
-    precos_close = 100 * (1 + np.cumsum(retornos))
-    
-    # Gerar preços de abertura, máxima e mínima
-    precos_open = precos_close.copy()
-    precos_open[1:] = precos_close[:-1]
-    precos_open[0] = precos_close[0] * (1 - volatilidade)
-    
-    precos_high = np.maximum(precos_close, precos_open) * (1 + np.random.uniform(0, volatilidade, dias))
-    precos_low = np.minimum(precos_close, precos_open) * (1 - np.random.uniform(0, volatilidade, dias))
-    
-    # Gerar volume
-    volume = np.random.uniform(1000, 10000, dias) * (1 + np.abs(retornos) * 10)
-    
-    # Criar DataFrame
-    df = pd.DataFrame({
-        'open': precos_open,
-        'high': precos_high,
-        'low': precos_low,
-        'close': precos_close,
-        'volume': volume
-    }, index=datas)
-    
-    return df
+    gerador = GeradorSintetico(['SINTETICO'], intervalo, sessao, tendencia=tendencia * DIAS_POR_ANO,
+                               volatilidade=volatilidade * np.sqrt(DIAS_POR_ANO), semente=42)
+    return gerador.gerar(dias)['SINTETICO']
 
 # Função para carregar dados reais da API do Yahoo Finance
-def carregar_dados_yahoo(symbol, periodo='1y'):
+def baixar_dados_yahoo(symbol, periodo='1y', intervalo='1d'):
     """
-    Carrega dados históricos da API do Yahoo Finance.
+    Baixa dados históricos da API do Yahoo Finance.
+    
+    As datas são convertidas de uma vez (vetorizado) para o horário local
+    da bolsa, de modo que os pregões de barras intradiárias fiquem alinhados
+    ao horário da sessão.
     
     Args:
         symbol (str): Símbolo do ativo.
-        periodo (str): Período de dados a carregar.
+        periodo (str): Período de dados a carregar (o Yahoo limita barras de
+            1 minuto a 7 dias e de 5 minutos a 60 dias; ver PERIODOS_INTRADIARIOS).
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
         
     Returns:
-        pandas.DataFrame: DataFrame com dados OHLCV.
+        pandas.DataFrame: DataFrame com dados OHLCV (None se a API não responder com dados).
     """
     try:
         import sys
@@ -80,117 +78,258 @@ def carregar_dados_yahoo(symbol, periodo='1y'):
         client = ApiClient()
         dados = client.call_api('YahooFinance/get_stock_chart', query={
             'symbol': symbol,
-            'interval': '1d',
+            'interval': intervalo,
             'range': periodo
         })
         
-        # Extrair dados do resultado
-        if dados and 'chart' in dados and 'result' in dados['chart'] and dados['chart']['result']:
-            result = dados['chart']['result'][0]
-            timestamps = result['timestamp']
-            quote = result['indicators']['quote'][0]
-            
-            # Criar DataFrame
-            df = pd.DataFrame({
-                'open': quote['open'],
-                'high': quote['high'],
-                'low': quote['low'],
-                'close': quote['close'],
-                'volume': quote['volume']
-            }, index=pd.to_datetime([datetime.fromtimestamp(ts) for ts in timestamps]))
-            
-            # Remover valores NaN
-            df = df.dropna()
-            
-            return df
-        else:
-            print("Erro ao carregar dados do Yahoo Finance. Usando dados sintéticos.")
-            return gerar_dados_sinteticos()
+        df = converter_grafico(dados)
+        if df is None:
+            print(f"Erro ao carregar dados do Yahoo Finance para {symbol}.")
+        return df
     except Exception as e:
-        print(f"Erro ao carregar dados do Yahoo Finance: {e}. Usando dados sintéticos.")
-        return gerar_dados_sinteticos()
+        print(f"Erro ao carregar dados do Yahoo Finance para {symbol}: {e}.")
+        return None
 
-# Função principal para executar backtesting
-def executar_backtesting():
+# Função para carregar dados reais da API do Yahoo Finance
+def carregar_dados_yahoo(symbol, periodo='1y', intervalo='1d'):
     """
-    Executa backtesting de várias estratégias e gera relatórios.
+    Carrega dados históricos da API do Yahoo Finance, com dados sintéticos em caso de falha.
+    
+    Args:
+        symbol (str): Símbolo do ativo.
+        periodo (str): Período de dados a carregar.
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        
+    Returns:
+        pandas.DataFrame: DataFrame com dados OHLCV.
     """
-    # Criar diretório para resultados
-    os.makedirs('/home/ubuntu/robo_trader/resultados', exist_ok=True)
+    dados = baixar_dados_yahoo(symbol, periodo, intervalo)
+    if dados is None or dados.empty:
+        print("Usando dados sintéticos.")
+        return gerar_dados_sinteticos(intervalo=intervalo)
+    return dados
+
+# Função para calcular a data inicial de um período no formato do Yahoo Finance
+def _inicio_periodo(fim, periodo):
+    """
+    Converte um período ('7d', '60d', '1mo', '1y', 'ytd', 'max') na data inicial correspondente.
     
-    # Lista de ativos para teste
-    ativos = ['PETR4.SA', 'VALE3.SA', 'ITUB4.SA', 'BBDC4.SA']
+    Args:
+        fim (pandas.Timestamp): Data final do período.
+        periodo (str): Período no formato do Yahoo Finance.
+        
+    Returns:
+        pandas.Timestamp: Data inicial (None para 'max').
+    """
+    if periodo == 'max':
+        return None
+    if periodo == 'ytd':
+        return fim.normalize().replace(month=1, day=1)
     
-    # Lista de estratégias para teste
-    estrategias = [
-        {'nome': 'cruzamento_medias', 'params': {'periodo_curto': 9, 'periodo_longo': 21}},
-        {'nome': 'rsi', 'params': {'periodo': 14, 'nivel_sobrecomprado': 70, 'nivel_sobrevendido': 30}},
-        {'nome': 'macd', 'params': {'periodo_rapido': 12, 'periodo_lento': 26, 'periodo_sinal': 9}},
-        {'nome': 'bollinger', 'params': {'periodo': 20, 'desvios': 2}},
-        {'nome': 'price_action', 'params': {'fator_sombra': 2.0}},
-        {'nome': 'combinada', 'params': {'pesos': {
-            'cruzamento_medias': 1.0,
-            'rsi': 1.0,
-            'macd': 1.0,
-            'bollinger': 0.8,
-            'pin_bar': 0.8,
-            'suporte_resistencia': 0.5
-        }}}
-    ]
+    quantidade, unidade = re.fullmatch(r'(\d+)(d|wk|mo|y)', periodo).groups()
+    deslocamentos = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+    return fim - pd.DateOffset(**{deslocamentos[unidade]: int(quantidade)})
+
+# Função para verificar se os dados armazenados de um ativo precisam ser atualizados
+def _desatualizado(resumo, intervalo, sessao=SESSAO_PADRAO, agora=None):
+    """
+    Indica se não há dados armazenados ou se eles ficaram para trás do mercado.
     
-    # Parâmetros de gerenciamento de risco
-    risco_por_operacao = 1.0  # 1% do capital por operação
-    stop_atr = 2.0  # 2x ATR para stop loss
-    take_profit_rr = 2.0  # Relação risco/retorno de 1:2
+    Os dados estão desatualizados quando algum pregão fechou depois do fim
+    da última barra armazenada ou, com o pregão aberto, quando a última
+    barra é mais antiga que um intervalo. Fora do pregão (à noite, nos fins
+    de semana) dados completos até o último fechamento continuam atuais. As
+    datas são comparadas no horário local da bolsa.
     
-    # Resultados consolidados
-    resultados_consolidados = []
+    Args:
+        resumo (dict): Resumo do ativo no armazenamento (None se não houver dados).
+        intervalo (str): Intervalo das barras.
+        sessao (tuple): Horário do pregão (início, fim).
+        agora (pandas.Timestamp): Data atual (padrão: agora, no fuso da bolsa).
     
-    # Executar backtesting para cada ativo e estratégia
-    for ativo in ativos:
-        print(f"\nCarregando dados para {ativo}...")
-        dados = carregar_dados_yahoo(ativo)
-        print(f"Dados carregados: {len(dados)} registros de {dados.index[0]} a {dados.index[-1]}")
+    Returns:
+        bool: True se os dados precisam ser atualizados.
+    """
+    if resumo is None:
+        return True
+    
+    # Índices sem fuso já estão no horário local da bolsa (ver converter_grafico)
+    fim = resumo['fim']
+    fuso = fim.tz or FUSO_BOLSA
+    agora = pd.Timestamp.now(tz=fuso) if agora is None else pd.Timestamp(agora)
+    if agora.tz is not None:
+        agora = agora.tz_convert(fuso).tz_localize(None)
+    if fim.tz is not None:
+        fim = fim.tz_localize(None)
+    
+    duracao = converter_intervalo(intervalo)
+    if agora >= proximo_fechamento(fim + duracao, sessao):
+        return True
+    
+    inicio_pregao = agora.normalize() + pd.Timedelta(f'{sessao[0]}:00')
+    pregao_aberto = agora.dayofweek < 5 and inicio_pregao <= agora < proximo_fechamento(inicio_pregao, sessao)
+    return pregao_aberto and agora - fim > duracao
+
+# Função para gravar dados baixados no armazenamento local
+def _gravar_armazem(armazem, symbol, intervalo, dados, resumo):
+    """
+    Grava os dados baixados de um ativo e devolve o novo resumo do armazenamento.
+    
+    Um download que começa antes do armazenado o substitui; caso contrário,
+    as barras a partir da primeira data baixada são regravadas (a última
+    barra de um download anterior pode ter sido gravada ainda em formação).
+    """
+    if resumo is None or dados.index[0] < resumo['inicio']:
+        armazem.salvar(symbol, intervalo, dados)
+    else:
+        armazem.acrescentar(symbol, intervalo, dados)
+    return armazem.resumo(symbol, intervalo)
+
+# Função para atualizar de uma vez o armazenamento local de vários ativos
+def atualizar_armazem(symbols, periodo='1y', intervalo='1d', armazem=None, carregador=None):
+    """
+    Baixa concorrentemente os ativos desatualizados e os grava no armazenamento local.
+    
+    Todas as requisições são feitas juntas (ver CarregadorDadosMercado), de
+    modo que o tempo total fica próximo ao da requisição mais lenta.
+    
+    Args:
+        symbols (list): Símbolos dos ativos.
+        periodo (str): Período de dados a baixar.
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        armazem (ArmazemDados): Armazenamento local (padrão: diretório padrão).
+        carregador (CarregadorDadosMercado): Carregador assíncrono (padrão: Yahoo Finance).
+    
+    Returns:
+        set: Ativos com dados armazenados em dia (já atualizados ou baixados agora).
+    """
+    armazem = armazem or ArmazemDados()
+    carregador = carregador or CarregadorDadosMercado()
+    resumos = {symbol: armazem.resumo(symbol, intervalo) for symbol in symbols}
+    atualizados = {symbol for symbol, resumo in resumos.items() if not _desatualizado(resumo, intervalo)}
+    
+    pendentes = [symbol for symbol in symbols if symbol not in atualizados]
+    if pendentes:
+        for symbol, dados in carregador.carregar_todos(pendentes, periodo, intervalo).items():
+            if dados is not None and not dados.empty:
+                _gravar_armazem(armazem, symbol, intervalo, dados, resumos[symbol])
+                atualizados.add(symbol)
+    return atualizados
+
+# Função para carregar dados do armazenamento local, atualizando-o pela API quando necessário
+def carregar_dados(symbol, periodo='1y', intervalo='1d', armazem=None, offline=False):
+    """
+    Carrega dados históricos do armazenamento local (ver ArmazemDados).
+    
+    Se as barras armazenadas estiverem desatualizadas (algum pregão fechou
+    depois da última barra, ver _desatualizado), as barras novas
+    são baixadas do Yahoo Finance e acrescentadas ao armazenamento; execuções
+    repetidas leem apenas o trecho pedido dos arquivos mapeados em memória,
+    sem acesso à rede. Dados sintéticos são usados apenas se não houver
+    dados armazenados nem acesso à API, e nunca são armazenados.
+    
+    Args:
+        symbol (str): Símbolo do ativo.
+        periodo (str): Período de dados a carregar (a partir da última barra).
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        armazem (ArmazemDados): Armazenamento local (padrão: diretório padrão).
+        offline (bool): Se True, usa apenas os dados armazenados.
         
-        for estrategia in estrategias:
-            print(f"\nExecutando backtesting de {estrategia['nome']} para {ativo}...")
-            
-            # Criar instância de backtesting
-            backtest = Backtesting(dados, capital_inicial=10000.0, comissao=0.1)
-            
-            # Executar backtesting
-            resultados = backtest.executar_backtest(
-                estrategia=estrategia['nome'],
-                params=estrategia['params'],
-                risco_por_operacao=risco_por_operacao,
-                stop_atr=stop_atr,
-                take_profit_rr=take_profit_rr
-            )
-            
-            # Plotar resultados
-            backtest.plotar_resultados(f"{ativo} - {estrategia['nome']}")
-            
-            # Gerar relatório
-            caminho_relatorio = f"/home/ubuntu/robo_trader/resultados/backtest_{ativo}_{estrategia['nome']}.md"
-            backtest.gerar_relatorio(caminho_relatorio)
-            
-            # Adicionar aos resultados consolidados
-            resultados_consolidados.append({
-                'ativo': ativo,
-                'estrategia': estrategia['nome'],
-                'retorno_total': resultados['retorno_total'],
-                'win_rate': resultados['win_rate'],
-                'profit_factor': resultados['profit_factor'],
-                'max_drawdown': resultados['max_drawdown'],
-                'sharpe_ratio': resultados['sharpe_ratio'],
-                'total_operacoes': resultados['total_operacoes']
-            })
-            
-            print(f"Backtesting concluído. Relatório salvo em {caminho_relatorio}")
+    Returns:
+        pandas.DataFrame: DataFrame com dados OHLCV.
+    """
+    armazem = armazem or ArmazemDados()
+    resumo = armazem.resumo(symbol, intervalo)
+    if _desatualizado(resumo, intervalo) and not offline:
+        dados = baixar_dados_yahoo(symbol, periodo, intervalo)
+        if dados is not None and not dados.empty:
+            resumo = _gravar_armazem(armazem, symbol, intervalo, dados, resumo)
     
-    # Gerar relatório consolidado
-    df_resultados = pd.DataFrame(resultados_consolidados)
+    if resumo is None:
+        print(f"Sem dados armazenados para {symbol}. Usando dados sintéticos.")
+        return gerar_dados_sinteticos(intervalo=intervalo)
+    return armazem.carregar(symbol, intervalo, inicio=_inicio_periodo(resumo['fim'], periodo))
+
+# Estado dos processos de trabalho: Backtesting por ativo, sobre os dados compartilhados
+_backtests = {}
+
+# Função para obter o Backtesting de um ativo no processo de trabalho
+def _obter_backtest(descritor):
+    """
+    Retorna o Backtesting do ativo, anexando os dados compartilhados na primeira chamada.
+    
+    Args:
+        descritor (dict): Descritor de DadosCompartilhados do ativo.
+        
+    Returns:
+        Backtesting: Instância de backtesting do ativo neste processo.
+    """
+    if descritor['nome'] not in _backtests:
+        segmento, dados = DadosCompartilhados.anexar(descritor)
+        _backtests[descritor['nome']] = (segmento, Backtesting(dados, capital_inicial=10000.0, comissao=0.1))
+    return _backtests[descritor['nome']][1]
+
+# Função executada nos processos de trabalho para um par ativo x estratégia
+def _executar_backtest_ativo(descritor, estrategia, parametros_risco):
+    """
+    Executa o backtesting de uma estratégia sobre os dados compartilhados de um ativo.
     
+    Args:
+        descritor (dict): Descritor de DadosCompartilhados do ativo.
+        estrategia (dict): Nome e parâmetros da estratégia.
+        parametros_risco (dict): Risco por operação, stop ATR e take profit.
+        
+    Returns:
+        tuple: (Resultados do backtesting, PID do processo, Estatísticas do cache de indicadores)
+    """
+    backtest = _obter_backtest(descritor)
+    resultados = backtest.executar_backtest(
+        estrategia=estrategia['nome'],
+        params=estrategia['params'],
+        **parametros_risco
+    )
+    return resultados, os.getpid(), IndicadoresTecnicos.cache.estatisticas()
+
+# Função executada nos processos de trabalho para gerar gráfico e relatório de um par
+def _gerar_saidas_ativo(descritor, ativo, nome_estrategia, resultados, gerar_graficos, gerar_relatorios):
+    """
+    Gera o gráfico e o relatório individual de um par ativo x estratégia.
+    
+    Args:
+        descritor (dict): Descritor de DadosCompartilhados do ativo.
+        ativo (str): Símbolo do ativo.
+        nome_estrategia (str): Nome da estratégia.
+        resultados (dict): Resultados do backtesting.
+        gerar_graficos (bool): Se True, salva o gráfico de capital e drawdown.
+        gerar_relatorios (bool): Se True, salva o relatório em Markdown.
+        
+    Returns:
+        str: Caminho do relatório (None se não gerado).
+    """
+    backtest = _obter_backtest(descritor)
+    backtest.resultados = resultados
+    
+    if gerar_graficos:
+        backtest.plotar_resultados(
+            f"{ativo} - {nome_estrategia}",
+            caminho_arquivo=f"/home/ubuntu/robo_trader/resultados/backtest_{ativo}_{nome_estrategia}.png"
+        )
+    
+    if not gerar_relatorios:
+        return None
+    
+    caminho_relatorio = f"/home/ubuntu/robo_trader/resultados/backtest_{ativo}_{nome_estrategia}.md"
+    backtest.gerar_relatorio(caminho_relatorio)
+    return caminho_relatorio
+
+# Função para salvar os resultados consolidados em CSV e Markdown
+def salvar_resultados_consolidados(df_resultados):
+    """
+    Salva os resultados consolidados em CSV e o relatório consolidado em Markdown.
+    
+    Args:
+        df_resultados (pandas.DataFrame): Uma linha por par ativo x estratégia.
+    """
     # Salvar resultados em CSV
     df_resultados.to_csv('/home/ubuntu/robo_trader/resultados/resultados_consolidados.csv', index=False)
     
@@ -237,8 +376,163 @@ def executar_backtesting():
         for _, row in df_resultados.iterrows():
             f.write(f"| {row['ativo']} | {row['estrategia']} | {row['retorno_total']:.2f} | {row['win_rate']:.2f} | {row['profit_factor']:.2f} | {row['max_drawdown']:.2f} | {row['sharpe_ratio']:.2f} | {row['total_operacoes']:.0f} |\n")
     
+# Função principal para executar backtesting
+def executar_backtesting(processos=None, gerar_graficos=True, gerar_relatorios=True, adiar_saidas=False,
+                         intervalo='1d', periodo=None, encerrar_sessao=None, offline=False):
+    """
+    Executa backtesting de várias estratégias e gera relatórios.
+    
+    A execução é um pipeline: os dados dos ativos são carregados em
+    paralelo (threads), cada ativo é publicado em memória compartilhada
+    assim que chega e seus backtests são distribuídos entre processos de
+    trabalho; gráficos e relatórios individuais formam um estágio separado,
+    que pode ser adiado para depois de todos os backtests ou omitido. O CSV
+    e o relatório consolidados são os mesmos da execução sequencial.
+    
+    Com barras intradiárias (ex: intervalo='5m'), o período padrão é o maior
+    aceito pelo Yahoo Finance para o intervalo e as posições são encerradas
+    no fechamento de cada pregão (day trade). Os dados vêm do armazenamento
+    local (ver carregar_dados), atualizado pela API apenas quando necessário:
+    os ativos desatualizados são baixados juntos (ver atualizar_armazem) e
+    os que falharem ainda passam pela API individual.
+    
+    Args:
+        processos (int): Número de processos de trabalho (padrão: número de núcleos).
+        gerar_graficos (bool): Se True, salva um gráfico por ativo e estratégia.
+        gerar_relatorios (bool): Se True, salva um relatório por ativo e estratégia.
+        adiar_saidas (bool): Se True, gera gráficos e relatórios só após todos os backtests.
+        intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+        periodo (str): Período de dados a carregar (padrão: '1y' para barras diárias).
+        encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão
+            (padrão: apenas com barras intradiárias).
+        offline (bool): Se True, usa apenas os dados já armazenados, sem acessar a API.
+    """
+    # Criar diretório para resultados
+    os.makedirs('/home/ubuntu/robo_trader/resultados', exist_ok=True)
+    
+    # Lista de ativos para teste
+    ativos = ['PETR4.SA', 'VALE3.SA', 'ITUB4.SA', 'BBDC4.SA']
+    
+    # Lista de estratégias para teste
+    estrategias = [
+        {'nome': 'cruzamento_medias', 'params': {'periodo_curto': 9, 'periodo_longo': 21}},
+        {'nome': 'rsi', 'params': {'periodo': 14, 'nivel_sobrecomprado': 70, 'nivel_sobrevendido': 30}},
+        {'nome': 'macd', 'params': {'periodo_rapido': 12, 'periodo_lento': 26, 'periodo_sinal': 9}},
+        {'nome': 'bollinger', 'params': {'periodo': 20, 'desvios': 2}},
+        {'nome': 'price_action', 'params': {'fator_sombra': 2.0}},
+        {'nome': 'combinada', 'params': {'pesos': {
+            'cruzamento_medias': 1.0,
+            'rsi': 1.0,
+            'macd': 1.0,
+            'bollinger': 0.8,
+            'pin_bar': 0.8,
+            'suporte_resistencia': 0.5
+        }}}
+    ]
+    
+    # Parâmetros de gerenciamento de risco
+    risco_por_operacao = 1.0  # 1% do capital por operação
+    stop_atr = 2.0  # 2x ATR para stop loss
+    take_profit_rr = 2.0  # Relação risco/retorno de 1:2
+    
+    if periodo is None:
+        periodo = PERIODOS_INTRADIARIOS.get(intervalo, '1y')
+    if encerrar_sessao is None:
+        encerrar_sessao = eh_intradiario(intervalo)
+    
+    parametros_risco = {
+        'risco_por_operacao': risco_por_operacao,
+        'stop_atr': stop_atr,
+        'take_profit_rr': take_profit_rr,
+        'encerrar_sessao': encerrar_sessao
+    }
+    gerar_saidas = gerar_graficos or gerar_relatorios
+    
+    # Resultados por par (posição do ativo, posição da estratégia)
+    resultados_pares = {}
+    estatisticas_processos = {}
+    compartilhados = {}
+    
+    try:
+        with ThreadPoolExecutor(max_workers=len(ativos)) as carregadores, \
+             ProcessPoolExecutor(max_workers=processos) as executor:
+            # Estágio 1: carregar os dados de todos os ativos em paralelo
+            print(f"\nCarregando dados para {len(ativos)} ativos...")
+            armazem = ArmazemDados()
+            atualizados = set() if offline else atualizar_armazem(ativos, periodo, intervalo, armazem)
+            futuros_dados = {
+                carregadores.submit(carregar_dados, ativo, periodo, intervalo, armazem, offline or ativo in atualizados): i
+                for i, ativo in enumerate(ativos)
+            }
+            
+            # Estágio 2: distribuir os backtests de cada ativo assim que seus dados chegam
+            futuros_backtest = {}
+            for futuro in as_completed(futuros_dados):
+                i = futuros_dados[futuro]
+                ativo = ativos[i]
+                dados = futuro.result()
+                print(f"Dados carregados para {ativo}: {len(dados)} registros de {dados.index[0]} a {dados.index[-1]}")
+                
+                compartilhados[ativo] = DadosCompartilhados(dados)
+                for j, estrategia in enumerate(estrategias):
+                    futuro_backtest = executor.submit(
+                        _executar_backtest_ativo, compartilhados[ativo].descritor, estrategia, parametros_risco
+                    )
+                    futuros_backtest[futuro_backtest] = (i, j)
+            
+            # Estágio 3: gráficos e relatórios individuais, logo após cada backtest ou ao final
+            futuros_saidas = []
+            pendentes = []
+            for futuro in as_completed(futuros_backtest):
+                i, j = futuros_backtest[futuro]
+                ativo, nome_estrategia = ativos[i], estrategias[j]['nome']
+                resultados, pid, estatisticas = futuro.result()
+                resultados_pares[(i, j)] = resultados
+                estatisticas_processos[pid] = estatisticas
+                print(f"Backtesting de {nome_estrategia} para {ativo} concluído "
+                      f"({len(resultados_pares)}/{len(futuros_backtest)}).")
+                
+                if gerar_saidas:
+                    argumentos = (compartilhados[ativo].descritor, ativo, nome_estrategia, resultados,
+                                  gerar_graficos, gerar_relatorios)
+                    pendentes.append(argumentos)
+                    if not adiar_saidas:
+                        futuros_saidas.append(executor.submit(_gerar_saidas_ativo, *pendentes.pop()))
+            
+            futuros_saidas.extend(executor.submit(_gerar_saidas_ativo, *argumentos) for argumentos in pendentes)
+            for futuro in as_completed(futuros_saidas):
+                caminho_relatorio = futuro.result()
+                if caminho_relatorio:
+                    print(f"Relatório salvo em {caminho_relatorio}")
+    finally:
+        for dados_compartilhados in compartilhados.values():
+            dados_compartilhados.fechar()
+    
+    # Consolidar na mesma ordem da execução sequencial (ativo, estratégia)
+    resultados_consolidados = []
+    for (i, j), resultados in sorted(resultados_pares.items()):
+        resultados_consolidados.append({
+            'ativo': ativos[i],
+            'estrategia': estrategias[j]['nome'],
+            'retorno_total': resultados['retorno_total'],
+            'win_rate': resultados['win_rate'],
+            'profit_factor': resultados['profit_factor'],
+            'max_drawdown': resultados['max_drawdown'],
+            'sharpe_ratio': resultados['sharpe_ratio'],
+            'total_operacoes': resultados['total_operacoes']
+        })
+    
+    # Gerar relatório consolidado
+    salvar_resultados_consolidados(pd.DataFrame(resultados_consolidados))
+    
     print("\nBacktesting concluído para todos os ativos e estratégias.")
     print(f"Relatório consolidado salvo em /home/ubuntu/robo_trader/resultados/relatorio_consolidado.md")
+    
+    acertos = sum(estatisticas['acertos'] for estatisticas in estatisticas_processos.values())
+    falhas = sum(estatisticas['falhas'] for estatisticas in estatisticas_processos.values())
+    taxa_acerto = acertos / (acertos + falhas) if acertos + falhas > 0 else 0.0
+    print(f"Cache de indicadores ({len(estatisticas_processos)} processos): {acertos} acertos, {falhas} falhas "
+          f"({taxa_acerto:.0%} de reaproveitamento)")
 
 if __name__ == "__main__":
     executar_backtesting()
@@ -0,0 +1,927 @@
+"""
+Script para medir o desempenho das rotinas de análise técnica
+
+Este script verifica que os kernels vetorizados e o núcleo de simulação
+produzem os mesmos sinais e operações que as implementações de referência,
+mede o tempo de geração de sinais em históricos grandes e da reamostragem
+Monte Carlo, e compara o modo compacto float32 com o float64.
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append('/home/ubuntu/robo_trader/src')
+from analise_tecnica.estrategias import EstrategiasTrading
+from analise_tecnica.estrategias_referencia import EstrategiasReferencia
+from analise_tecnica.indicadores import IndicadoresTecnicos
+from analise_tecnica.indicadores_incrementais import (
+    ATRIncremental, BandasBollingerIncremental, EstocasticoIncremental, MACDIncremental, MediaMovelExponencialIncremental,
+    MediaMovelSimplesIncremental, RSIIncremental
+)
+from analise_tecnica.intradiario import fins_sessao, gerar_indice_sessoes, reamostrar
+from analise_tecnica.painel import montar_painel
+from analise_tecnica.precisao import erro_relativo
+from analise_tecnica.price_action import PriceAction
+from analise_tecnica.simulacao import numba
+from testes.backtesting import Backtesting
+from testes.backtesting_blocos import BacktestingBlocos
+from testes.armazem_dados import ArmazemDados
+from testes.backtesting_referencia import BacktestingReferencia
+from testes.carregador_mercado import CarregadorDadosMercado, converter_grafico
+from testes.carteira import BacktestingCarteira
+from testes.gerador_sintetico import GeradorSintetico
+from testes.monte_carlo import AnaliseMonteCarlo
+
+# Estratégias comparadas: (nome, função vetorizada, função de referência)
+ESTRATEGIAS_CRUZAMENTO = [
+    ('cruzamento_medias', EstrategiasTrading.cruzamento_medias_moveis, EstrategiasReferencia.cruzamento_medias_moveis),
+    ('rsi', EstrategiasTrading.rsi_sobrecomprado_sobrevendido, EstrategiasReferencia.rsi_sobrecomprado_sobrevendido),
+    ('macd', EstrategiasTrading.macd_crossover, EstrategiasReferencia.macd_crossover),
+    ('bollinger', EstrategiasTrading.bollinger_bands_reversal, EstrategiasReferencia.bollinger_bands_reversal)
+]
+
+# Estratégias de Backtesting._gerar_sinais comparadas com o laço de simulação original
+ESTRATEGIAS_BACKTEST = [
+    'cruzamento_medias', 'rsi', 'macd', 'bollinger', 'price_action', 'suporte_resistencia', 'combinada'
+]
+
+# Indicadores comparados entre float32 e float64: (nome, função, erro relativo máximo aceito)
+INDICADORES_PRECISAO = [
+    ('media_movel_simples', lambda h, l, c, p: IndicadoresTecnicos.media_movel_simples(c, 20, precisao=p), 1e-5),
+    ('media_movel_exponencial', lambda h, l, c, p: IndicadoresTecnicos.media_movel_exponencial(c, 20, precisao=p), 1e-5),
+    ('macd', lambda h, l, c, p: IndicadoresTecnicos.macd(c, precisao=p), 1e-4),
+    ('bandas_bollinger', lambda h, l, c, p: IndicadoresTecnicos.bandas_bollinger(c, precisao=p), 1e-5),
+    ('atr', lambda h, l, c, p: IndicadoresTecnicos.atr(h, l, c, precisao=p), 1e-4),
+    ('rsi', lambda h, l, c, p: IndicadoresTecnicos.rsi(c, precisao=p), 2e-2),
+    ('estocastico', lambda h, l, c, p: IndicadoresTecnicos.estocastico(h, l, c, precisao=p), 2e-2)
+]
+
+# Função para gerar preços de fechamento sintéticos em barras de 1 minuto
+def gerar_precos(barras, semente=42):
+    """
+    Gera uma série de preços de fechamento para benchmark.
+    
+    Args:
+        barras (int): Número de barras.
+        semente (int): Semente do gerador aleatório.
+    
+    Returns:
+        pandas.Series: Série de preços de fechamento.
+    """
+    rng = np.random.default_rng(semente)
+    retornos = rng.normal(0, 0.001, barras)
+    precos = 100 * np.exp(np.cumsum(retornos))
+    indice = pd.date_range(start=datetime(2020, 1, 1), periods=barras, freq='min')
+    return pd.Series(precos, index=indice)
+
+# Função para gerar dados OHLCV sintéticos em barras de 1 minuto
+def gerar_ohlcv(barras, semente=42):
+    """
+    Gera um DataFrame OHLCV para benchmark a partir de gerar_precos.
+    
+    Args:
+        barras (int): Número de barras.
+        semente (int): Semente do gerador aleatório.
+    
+    Returns:
+        pandas.DataFrame: DataFrame com dados OHLCV.
+    """
+    rng = np.random.default_rng(semente + 1)
+    dados_close = gerar_precos(barras, semente)
+    dados_open = dados_close.shift(1).fillna(dados_close.iloc[0]) * (1 + rng.normal(0, 0.0005, barras))
+    
+    return pd.DataFrame({
+        'open': dados_open,
+        'high': np.maximum(dados_open, dados_close) * (1 + rng.uniform(0, 0.001, barras)),
+        'low': np.minimum(dados_open, dados_close) * (1 - rng.uniform(0, 0.001, barras)),
+        'close': dados_close,
+        'volume': rng.uniform(1000, 10000, barras)
+    })
+
+# Função para verificar a equivalência com as implementações de referência
+def verificar_equivalencia(barras=20000):
+    """
+    Verifica que os sinais vetorizados são idênticos aos dos laços originais.
+    
+    Args:
+        barras (int): Número de barras usadas na verificação.
+    
+    Raises:
+        AssertionError: Se alguma estratégia divergir da referência.
+    """
+    dados_close = gerar_precos(barras)
+    
+    for nome, vetorizada, referencia in ESTRATEGIAS_CRUZAMENTO:
+        sinais = vetorizada(dados_close)
+        sinais_referencia = referencia(dados_close)
+        
+        divergencias = int((sinais != sinais_referencia).sum())
+        assert divergencias == 0, f"{nome}: {divergencias} sinais divergentes"
+        print(f"{nome}: sinais idênticos à referência ({int((sinais != 0).sum())} sinais em {barras} barras)")
+
+# Função para verificar o núcleo de simulação contra o laço original
+def verificar_simulacao(barras=50000):
+    """
+    Verifica que Backtesting.executar_backtest (núcleo sobre arrays, nos
+    modos 'barras' e 'eventos') produz as mesmas operações, o mesmo
+    histórico de capital e as mesmas métricas (a menos de arredondamento,
+    pois são acumuladas durante a simulação) que o laço original de
+    BacktestingReferencia.
+    
+    Args:
+        barras (int): Número de barras usadas na verificação.
+    
+    Raises:
+        AssertionError: Se alguma estratégia divergir da referência.
+    """
+    dados = gerar_ohlcv(barras)
+    print(f"Núcleo de simulação: {'numba' if numba is not None else 'Python puro'}")
+    
+    for estrategia in ESTRATEGIAS_BACKTEST:
+        inicio = time.perf_counter()
+        referencia = BacktestingReferencia(dados, comissao=0.1).executar_backtest(estrategia)
+        tempo_referencia = time.perf_counter() - inicio
+        
+        backtest = Backtesting(dados, comissao=0.1)
+        sinais = backtest._gerar_sinais(estrategia, dados['open'], dados['high'], dados['low'], dados['close'])
+        inicio = time.perf_counter()
+        resultados = backtest.simular(sinais)
+        tempo = time.perf_counter() - inicio
+        
+        for modo, simulados in (('barras', resultados), ('eventos', backtest.simular(sinais, modo='eventos'))):
+            assert np.array_equal(simulados['operacoes'], referencia['operacoes']), \
+                f"{estrategia} ({modo}): operações divergentes"
+            assert np.array_equal(simulados['capital_historico'], referencia['capital_historico']), \
+                f"{estrategia} ({modo}): capital divergente"
+            assert np.allclose(simulados['drawdown'], referencia['drawdown'], rtol=1e-12, atol=1e-12), \
+                f"{estrategia} ({modo}): drawdown divergente"
+            for metrica, valor in referencia.items():
+                if metrica in ('operacoes', 'capital_historico', 'drawdown'):
+                    continue
+                # Métricas acumuladas na simulação diferem das calculadas em lote só por arredondamento
+                assert np.isclose(simulados[metrica], valor, rtol=1e-9, atol=1e-12, equal_nan=True), \
+                    f"{estrategia} ({modo}): {metrica} divergente"
+        
+        print(f"{estrategia}: {referencia['total_operacoes']} operações idênticas à referência "
+              f"(simulação {tempo:.3f}s, laço original com sinais {tempo_referencia:.2f}s)")
+
+# Função para medir os modos de simulação com sinais esparsos
+def medir_simulacao(barras=5_000_000, intervalo_sinais=50_000):
+    """
+    Mede os modos 'barras' e 'eventos' de Backtesting.simular com sinais esparsos.
+    
+    Args:
+        barras (int): Número de barras.
+        intervalo_sinais (int): Distância média, em barras, entre dois sinais.
+    
+    Returns:
+        dict: Tempo (em segundos) de cada modo.
+    """
+    dados = gerar_ohlcv(barras)
+    rng = np.random.default_rng(3)
+    sinais = np.zeros(barras, dtype=np.int64)
+    posicoes = rng.choice(barras, barras // intervalo_sinais, replace=False)
+    sinais[posicoes] = rng.choice([-1, 1], len(posicoes))
+    
+    backtest = Backtesting(dados, comissao=0.1)
+    backtest._preparar_features()
+    
+    tempos = {}
+    for modo in ('barras', 'eventos'):
+        inicio = time.perf_counter()
+        resultados = backtest.simular(sinais, modo=modo)
+        tempos[modo] = time.perf_counter() - inicio
+        print(f"simulação '{modo}' ({barras} barras, {resultados['total_operacoes']} operações): {tempos[modo]:.3f}s")
+    
+    return tempos
+
+# Função para medir o tempo de geração de sinais
+def medir_sinais(tamanhos=(1_000_000, 10_000_000), barras_referencia=100_000):
+    """
+    Mede o tempo de geração de sinais das estratégias de cruzamento.
+    
+    O laço de referência é medido em `barras_referencia` barras e extrapolado
+    linearmente para os demais tamanhos.
+    
+    Args:
+        tamanhos (tuple): Tamanhos de histórico (em barras) a medir.
+        barras_referencia (int): Barras usadas para medir o laço de referência.
+    
+    Returns:
+        pandas.DataFrame: Tempos medidos por estratégia e tamanho.
+    """
+    resultados = []
+    
+    dados_referencia = gerar_precos(barras_referencia)
+    tempo_por_barra = {}
+    for nome, _, referencia in ESTRATEGIAS_CRUZAMENTO:
+        inicio = time.perf_counter()
+        referencia(dados_referencia)
+        tempo_por_barra[nome] = (time.perf_counter() - inicio) / barras_referencia
+    
+    for barras in tamanhos:
+        dados_close = gerar_precos(barras)
+        
+        for nome, vetorizada, _ in ESTRATEGIAS_CRUZAMENTO:
+            inicio = time.perf_counter()
+            vetorizada(dados_close)
+            tempo = time.perf_counter() - inicio
+            
+            tempo_referencia = tempo_por_barra[nome] * barras
+            resultados.append({
+                'estrategia': nome,
+                'barras': barras,
+                'tempo_vetorizado': tempo,
+                'tempo_referencia_estimado': tempo_referencia,
+                'aceleracao': tempo_referencia / tempo
+            })
+            print(f"{nome} ({barras} barras): {tempo:.3f}s vetorizado, ~{tempo_referencia:.1f}s em laço")
+    
+    return pd.DataFrame(resultados)
+
+# Função para verificar a precisão do modo compacto float32
+def verificar_precisao(barras=1_000_000):
+    """
+    Compara os indicadores calculados em float32 com a referência em float64.
+    
+    O erro é medido por precisao.erro_relativo (maior diferença dividida por
+    max(|referência|, 1)) e comparado com as tolerâncias de
+    INDICADORES_PRECISAO. Também informa a memória ocupada pelos dados OHLCV
+    em cada precisão.
+    
+    Args:
+        barras (int): Número de barras usadas na verificação.
+    
+    Returns:
+        pandas.DataFrame: Erro relativo máximo por indicador.
+    
+    Raises:
+        AssertionError: Se algum indicador exceder sua tolerância.
+    """
+    dados_close = gerar_precos(barras)
+    rng = np.random.default_rng(7)
+    dados_high = dados_close * (1 + rng.uniform(0, 0.002, barras))
+    dados_low = dados_close * (1 - rng.uniform(0, 0.002, barras))
+    
+    dados = pd.DataFrame({'high': dados_high, 'low': dados_low, 'close': dados_close})
+    memoria_64 = dados.memory_usage(index=False).sum() / 1024 ** 2
+    memoria_32 = dados.astype(np.float32).memory_usage(index=False).sum() / 1024 ** 2
+    print(f"Dados OHLC ({barras} barras): {memoria_64:.1f} MB em float64, {memoria_32:.1f} MB em float32")
+    
+    resultados = []
+    for nome, funcao, tolerancia in INDICADORES_PRECISAO:
+        referencia = funcao(dados_high, dados_low, dados_close, 'float64')
+        compacto = funcao(dados_high, dados_low, dados_close, 'float32')
+        
+        if not isinstance(referencia, tuple):
+            referencia, compacto = (referencia,), (compacto,)
+        
+        erro = max(erro_relativo(r, c) for r, c in zip(referencia, compacto))
+        assert all(c.dtype == np.float32 for c in compacto), f"{nome}: resultado fora de float32"
+        assert erro <= tolerancia, f"{nome}: erro relativo {erro:.2e} acima de {tolerancia:.0e}"
+        
+        resultados.append({'indicador': nome, 'erro_relativo': erro, 'tolerancia': tolerancia})
+        print(f"{nome}: erro relativo máximo {erro:.2e} (tolerância {tolerancia:.0e})")
+    
+    return pd.DataFrame(resultados)
+
+# Função para verificar os indicadores incrementais contra os indicadores em lote
+def verificar_incrementais(barras=20_000, tolerancia=1e-9):
+    """
+    Verifica que os indicadores incrementais (uma barra por vez) coincidem,
+    barra a barra, com os indicadores calculados em lote sobre a série
+    inteira: mesmas posições de NaN e erro relativo (precisao.erro_relativo)
+    dentro da tolerância.
+    
+    Args:
+        barras (int): Número de barras usadas na verificação.
+        tolerancia (float): Erro relativo máximo aceito.
+    
+    Raises:
+        AssertionError: Se algum indicador divergir do cálculo em lote.
+    """
+    dados = gerar_ohlcv(barras)
+    dados_high, dados_low, dados_close = dados['high'], dados['low'], dados['close']
+    
+    indicadores = [
+        ('media_movel_simples', MediaMovelSimplesIncremental(20), ('close',),
+         IndicadoresTecnicos.media_movel_simples(dados_close, 20)),
+        ('media_movel_exponencial', MediaMovelExponencialIncremental(20), ('close',),
+         IndicadoresTecnicos.media_movel_exponencial(dados_close, 20)),
+        ('macd', MACDIncremental(12, 26, 9), ('close',), IndicadoresTecnicos.macd(dados_close, 12, 26, 9)),
+        ('rsi', RSIIncremental(14), ('close',), IndicadoresTecnicos.rsi(dados_close, 14)),
+        ('bandas_bollinger', BandasBollingerIncremental(20, 2), ('close',),
+         IndicadoresTecnicos.bandas_bollinger(dados_close, 20, 2)),
+        ('estocastico', EstocasticoIncremental(14, 3), ('high', 'low', 'close'),
+         IndicadoresTecnicos.estocastico(dados_high, dados_low, dados_close, 14, 3)),
+        ('atr', ATRIncremental(14), ('high', 'low', 'close'),
+         IndicadoresTecnicos.atr(dados_high, dados_low, dados_close, 14))
+    ]
+    for nome, incremental, colunas, lote in indicadores:
+        entradas = zip(*(dados[coluna].tolist() for coluna in colunas))
+        obtido = np.array([incremental.atualizar(*valores) for valores in entradas], dtype=np.float64)
+        esperado = np.column_stack(lote if isinstance(lote, tuple) else (lote,)).astype(np.float64)
+        obtido = obtido.reshape(esperado.shape)
+        
+        assert np.array_equal(np.isnan(obtido), np.isnan(esperado)), f"{nome}: NaN divergentes do cálculo em lote"
+        erro = erro_relativo(esperado, obtido)
+        assert erro <= tolerancia, f"{nome}: erro relativo {erro:.2e} acima de {tolerancia:.0e}"
+        print(f"{nome}: {barras} barras incrementais iguais ao cálculo em lote (erro relativo máximo {erro:.2e})")
+
+# Função para verificar os cálculos em painel contra os cálculos ativo a ativo
+def verificar_painel(ativos=4, barras=3000, lacunas=0.05):
+    """
+    Verifica que indicadores, padrões e estratégias calculados sobre um painel
+    (barras x ativos) com datas desalinhadas coincidem com os calculados
+    separadamente sobre a série de cada ativo.
+    
+    Cada ativo começa e termina em datas diferentes e não negocia em uma
+    fração das barras, o que exercita a compactação das lacunas internas
+    (painel.suportar_painel). Nas datas em que o ativo negociou, o resultado
+    do painel precisa ter as mesmas posições de NaN e erro relativo
+    (precisao.erro_relativo) desprezível; nas demais, NaN (ou 0/False).
+    
+    Args:
+        ativos (int): Número de ativos do painel.
+        barras (int): Número de datas do calendário comum.
+        lacunas (float): Fração das barras internas em que cada ativo não negocia.
+    
+    Raises:
+        AssertionError: Se algum ativo divergir do cálculo individual.
+    """
+    calendario = pd.bdate_range(start=datetime(2012, 1, 2), periods=barras)
+    dados_ativos = {}
+    for ativo in range(ativos):
+        rng = np.random.default_rng(100 + ativo)
+        datas = calendario[ativo * 37:barras - ativo * 23]
+        datas = datas[rng.random(len(datas)) >= lacunas]
+        dados_ativos[f'ATIVO{ativo}'] = gerar_ohlcv(len(datas), semente=ativo).set_axis(datas)
+    painel = montar_painel(dados_ativos)
+    
+    funcoes = [
+        ('media_movel_simples', IndicadoresTecnicos.media_movel_simples, ('close',)),
+        ('media_movel_exponencial', IndicadoresTecnicos.media_movel_exponencial, ('close',)),
+        ('macd', IndicadoresTecnicos.macd, ('close',)),
+        ('rsi', IndicadoresTecnicos.rsi, ('close',)),
+        ('bandas_bollinger', IndicadoresTecnicos.bandas_bollinger, ('close',)),
+        ('estocastico', IndicadoresTecnicos.estocastico, ('high', 'low', 'close')),
+        ('atr', IndicadoresTecnicos.atr, ('high', 'low', 'close')),
+        ('identificar_tendencia', PriceAction.identificar_tendencia, ('close',)),
+        ('identificar_candle_patterns', PriceAction.identificar_candle_patterns, ('open', 'high', 'low', 'close')),
+        ('identificar_pin_bars', PriceAction.identificar_pin_bars, ('open', 'high', 'low', 'close')),
+        ('identificar_inside_bars', PriceAction.identificar_inside_bars, ('high', 'low')),
+        ('cruzamento_medias_moveis', EstrategiasTrading.cruzamento_medias_moveis, ('close',)),
+        ('rsi_sobrecomprado_sobrevendido', EstrategiasTrading.rsi_sobrecomprado_sobrevendido, ('close',)),
+        ('macd_crossover', EstrategiasTrading.macd_crossover, ('close',)),
+        ('bollinger_bands_reversal', EstrategiasTrading.bollinger_bands_reversal, ('close',)),
+        ('price_action_pin_bar', EstrategiasTrading.price_action_pin_bar, ('open', 'high', 'low', 'close')),
+        ('suporte_resistencia_breakout', EstrategiasTrading.suporte_resistencia_breakout,
+         ('open', 'high', 'low', 'close')),
+        ('estrategia_combinada', EstrategiasTrading.estrategia_combinada, ('open', 'high', 'low', 'close'))
+    ]
+    
+    def partes(resultado):
+        if isinstance(resultado, tuple):
+            return list(resultado)
+        if isinstance(resultado, dict):
+            return [resultado[chave] for chave in sorted(resultado)]
+        return [resultado]
+    
+    for nome, funcao, colunas in funcoes:
+        resultado_painel = partes(funcao(*(painel[coluna] for coluna in colunas)))
+        for ativo, dados in dados_ativos.items():
+            resultado_ativo = partes(funcao(*(dados[coluna] for coluna in colunas)))
+            negociou = painel['close'].index.isin(dados.index)
+            for parte_painel, parte_ativo in zip(resultado_painel, resultado_ativo):
+                coluna = parte_painel[ativo].to_numpy()
+                obtido, esperado = coluna[negociou], parte_ativo.to_numpy()
+                ausentes = coluna[~negociou]
+                if coluna.dtype.kind == 'f':
+                    assert np.array_equal(np.isnan(obtido), np.isnan(esperado)), f"{nome} ({ativo}): NaN divergentes"
+                    assert erro_relativo(esperado, obtido) <= 1e-9, f"{nome} ({ativo}): valores divergentes"
+                    assert np.isnan(ausentes).all(), f"{nome} ({ativo}): valores em barras sem negociação"
+                else:
+                    assert np.array_equal(obtido, esperado), f"{nome} ({ativo}): valores divergentes"
+                    assert not ausentes.any(), f"{nome} ({ativo}): sinais em barras sem negociação"
+    
+    print(f"Painel de {ativos} ativos com datas desalinhadas ({len(painel['close'])} barras): "
+          f"{len(funcoes)} indicadores, padrões e estratégias iguais ao cálculo ativo a ativo")
+
+# Função para verificar os indicadores em lote contra os cálculos período a período
+def verificar_lotes(barras=200_000, periodos=(1, 2, 5, 14, 20, 50, 200)):
+    """
+    Verifica que os indicadores em lote (vários períodos de uma vez) coincidem
+    com os indicadores calculados separadamente para cada período: mesmas
+    posições de NaN e erro relativo (precisao.erro_relativo) dentro da
+    tolerância. As somas acumuladas perdem alguns dígitos no desvio padrão
+    de janelas curtas quase constantes, daí a tolerância maior das bandas.
+    
+    Args:
+        barras (int): Número de barras usadas na verificação.
+        periodos (tuple): Períodos calculados em lote (inclui o período 1, sem desvio amostral).
+    
+    Raises:
+        AssertionError: Se algum período divergir do cálculo individual.
+    """
+    dados = gerar_ohlcv(barras)
+    dados_high, dados_low, dados_close = dados['high'], dados['low'], dados['close']
+    
+    indicadores = [
+        ('media_movel_simples', IndicadoresTecnicos.media_movel_simples_lote(dados_close, list(periodos)),
+         lambda periodo: IndicadoresTecnicos.media_movel_simples(dados_close, periodo), 1e-9),
+        ('rsi', IndicadoresTecnicos.rsi_lote(dados_close, list(periodos)),
+         lambda periodo: IndicadoresTecnicos.rsi(dados_close, periodo), 1e-9),
+        ('bandas_bollinger', np.stack(IndicadoresTecnicos.bandas_bollinger_lote(dados_close, list(periodos))),
+         lambda periodo: np.stack(IndicadoresTecnicos.bandas_bollinger(dados_close, periodo)), 1e-6),
+        ('atr', IndicadoresTecnicos.atr_lote(dados_high, dados_low, dados_close, list(periodos)),
+         lambda periodo: IndicadoresTecnicos.atr(dados_high, dados_low, dados_close, periodo), 1e-9)
+    ]
+    for nome, lote, individual, tolerancia in indicadores:
+        erro = 0.0
+        for coluna, periodo in enumerate(periodos):
+            esperado = np.asarray(individual(periodo), dtype=np.float64)
+            obtido = lote[..., coluna]
+            assert np.array_equal(np.isnan(obtido), np.isnan(esperado)), f"{nome}: período {periodo} com NaN divergentes"
+            erro = max(erro, erro_relativo(esperado, obtido))
+        assert erro <= tolerancia, f"{nome}: erro relativo {erro:.2e} acima de {tolerancia:.0e}"
+        print(f"{nome}: {len(periodos)} períodos em lote iguais ao cálculo individual ({barras} barras, "
+              f"erro relativo máximo {erro:.2e})")
+
+def medir_monte_carlo(operacoes=1000, simulacoes=100_000):
+    """
+    Mede a reamostragem Monte Carlo de um histórico de operações.
+    
+    Args:
+        operacoes (int): Número de operações do histórico.
+        simulacoes (int): Número de sequências reamostradas.
+    
+    Returns:
+        dict: Tempo (em segundos) de cada método de reamostragem.
+    """
+    rng = np.random.default_rng(5)
+    historico = [{'resultado': resultado} for resultado in rng.normal(0.2, 2.0, operacoes)]
+    
+    tempos = {}
+    for metodo in ('bootstrap', 'embaralhar'):
+        inicio = time.perf_counter()
+        analise = AnaliseMonteCarlo.simular(historico, simulacoes=simulacoes, metodo=metodo, semente=1)
+        tempos[metodo] = time.perf_counter() - inicio
+        intervalo = analise['resumo'].loc['max_drawdown']
+        print(f"Monte Carlo '{metodo}' ({simulacoes} sequências de {operacoes} operações): {tempos[metodo]:.2f}s - "
+              f"drawdown máximo entre {intervalo['inferior']:.2f}% e {intervalo['superior']:.2f}%")
+    
+    return tempos
+
+# Função para medir a reamostragem e o backtest com barras intradiárias
+def medir_intradiario(dias=1000, estrategia='cruzamento_medias'):
+    """
+    Mede a reamostragem de barras de 1 minuto em barras de 5 minutos,
+    verifica a reamostragem de barras diárias em semanais e mensais e o
+    backtest com encerramento das posições a cada pregão.
+    
+    Args:
+        dias (int): Número de pregões de barras de 1 minuto.
+        estrategia (str): Estratégia usada no backtest.
+    
+    Returns:
+        dict: Tempo (em segundos) da reamostragem e da simulação de cada modo.
+    
+    Raises:
+        AssertionError: Se as barras semanais ou mensais divergirem do agrupamento
+            do pandas, se os modos divergirem (operações, capital ou métricas)
+            ou se alguma posição atravessar um pregão.
+    """
+    indice = gerar_indice_sessoes(dias, '1m', data_final=datetime(2024, 12, 31))
+    dados = gerar_ohlcv(len(indice)).set_axis(indice)
+    
+    tempos = {}
+    inicio = time.perf_counter()
+    dados_5m = reamostrar(dados, '5m')
+    tempos['reamostrar'] = time.perf_counter() - inicio
+    print(f"Reamostragem de {len(dados)} barras de 1 minuto em {len(dados_5m)} de 5 minutos: "
+          f"{tempos['reamostrar']:.3f}s")
+    
+    # Barras semanais começam na segunda-feira e barras mensais seguem os meses do calendário
+    dados_1d = reamostrar(dados, '1d')
+    for intervalo, periodo in (('1wk', 'W-SUN'), ('1mo', 'M')):
+        agregado = reamostrar(dados_1d, intervalo)
+        grupos = dados_1d.groupby(dados_1d.index.to_period(periodo))
+        assert np.array_equal(agregado.index, grupos.size().index.to_timestamp()), f"{intervalo}: inícios divergentes"
+        for coluna, agregacao in (('open', 'first'), ('high', 'max'), ('low', 'min'), ('close', 'last'),
+                                  ('volume', 'sum')):
+            assert np.allclose(agregado[coluna], grupos[coluna].agg(agregacao)), f"{intervalo}: {coluna} divergente"
+    print(f"Reamostragem de {len(dados_1d)} barras diárias em semanas (a partir da segunda-feira) e meses do "
+          f"calendário idêntica ao agrupamento do pandas")
+    
+    backtest = Backtesting(dados_5m, comissao=0.1)
+    sinais = backtest.gerar_sinais(estrategia)
+    resultados = {}
+    for modo in ('barras', 'eventos'):
+        inicio = time.perf_counter()
+        resultados[modo] = backtest.simular(sinais, modo=modo, encerrar_sessao=True)
+        tempos[modo] = time.perf_counter() - inicio
+    
+    assert np.array_equal(resultados['barras']['operacoes'], resultados['eventos']['operacoes']), \
+        "operações divergentes entre os modos"
+    assert np.array_equal(resultados['barras']['capital_historico'], resultados['eventos']['capital_historico']), \
+        "capital divergente entre os modos"
+    assert np.allclose(resultados['barras']['drawdown'], resultados['eventos']['drawdown'], rtol=1e-9, atol=1e-12), \
+        "drawdown divergente entre os modos"
+    for metrica in ('volatilidade', 'sharpe_ratio', 'max_drawdown'):
+        assert np.isclose(resultados['barras'][metrica], resultados['eventos'][metrica], rtol=1e-9), \
+            f"{metrica} divergente entre os modos"
+    assert not resultados['barras']['posicoes'][fins_sessao(dados_5m.index)[1:]].any(), \
+        "posição aberta no fechamento do pregão"
+    print(f"Backtest intradiário ({estrategia}, {len(dados_5m)} barras de 5 minutos): "
+          f"{resultados['barras']['total_operacoes']} operações idênticas nos dois modos "
+          f"(barras {tempos['barras']:.3f}s, eventos {tempos['eventos']:.3f}s), "
+          f"Sharpe anualizado com {backtest.periodos_por_ano:.0f} barras por ano: "
+          f"{resultados['barras']['sharpe_ratio']:.2f}")
+    
+    return tempos
+
+# Função para verificar o trailing stop nos dois modos de simulação
+def verificar_trailing_stop(barras=1_000_000, trailing_stop=0.5):
+    """
+    Verifica que os modos 'barras' e 'eventos' produzem as mesmas operações
+    com trailing stop e mede a simulação sobre um histórico intradiário longo.
+    
+    Args:
+        barras (int): Número de barras de 1 minuto.
+        trailing_stop (float): Distância percentual do trailing stop.
+    
+    Returns:
+        dict: Tempo (em segundos) de cada modo de simulação.
+    
+    Raises:
+        AssertionError: Se os modos divergirem.
+    """
+    dados = gerar_ohlcv(barras)
+    backtest = Backtesting(dados, comissao=0.1)
+    
+    tempos = {}
+    for estrategia in ('cruzamento_medias', 'rsi'):
+        sinais = backtest.gerar_sinais(estrategia)
+        resultados = {}
+        for modo in ('barras', 'eventos'):
+            inicio = time.perf_counter()
+            resultados[modo] = backtest.simular(sinais, modo=modo, trailing_stop=trailing_stop)
+            tempos[(estrategia, modo)] = time.perf_counter() - inicio
+        
+        assert np.array_equal(resultados['barras']['operacoes'], resultados['eventos']['operacoes']), \
+            f"{estrategia}: operações divergentes entre os modos"
+        assert np.array_equal(resultados['barras']['capital_historico'], resultados['eventos']['capital_historico']), \
+            f"{estrategia}: capital divergente entre os modos"
+        
+        motivos = resultados['barras']['operacoes']['motivo_saida']
+        print(f"{estrategia} com trailing stop de {trailing_stop}% ({barras} barras): "
+              f"{len(motivos)} operações idênticas, {np.count_nonzero(motivos == 4)} no trailing stop "
+              f"(barras {tempos[(estrategia, 'barras')]:.3f}s, eventos {tempos[(estrategia, 'eventos')]:.3f}s)")
+    
+    return tempos
+
+# Função para medir o armazenamento local de dados históricos
+def medir_armazem(dias=4000, barras_trecho=1000):
+    """
+    Mede a gravação e a leitura (completa e de um trecho de datas) de barras
+    de 1 minuto no armazenamento local, em um diretório temporário, e
+    verifica que um novo download regrava a última barra em formação.
+    
+    Args:
+        dias (int): Número de pregões de barras de 1 minuto.
+        barras_trecho (int): Tamanho do trecho lido por datas.
+    
+    Returns:
+        dict: Tempo (em segundos) de cada operação.
+    
+    Raises:
+        AssertionError: Se os dados lidos diferirem dos gravados.
+    """
+    indice = gerar_indice_sessoes(dias, '1m', data_final=datetime(2024, 12, 31))
+    dados = gerar_ohlcv(len(indice)).set_axis(indice)
+    metade = len(dados) // 2
+    
+    tempos = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        armazem = ArmazemDados(diretorio)
+        inicio = time.perf_counter()
+        # A última barra gravada ainda está em formação e deve ser substituída pela completa
+        parcial = dados.iloc[:metade].copy()
+        parcial.iloc[-1] *= 0.99
+        armazem.salvar('ATIVO', '1m', parcial)
+        armazem.acrescentar('ATIVO', '1m', dados.iloc[metade // 2:])
+        tempos['gravar'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        completo = armazem.carregar('ATIVO', '1m')
+        tempos['carregar'] = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        trecho = armazem.carregar('ATIVO', '1m', inicio=indice[metade], fim=indice[metade + barras_trecho - 1])
+        tempos['trecho'] = time.perf_counter() - inicio
+        
+        assert completo.equals(dados), "dados armazenados divergentes"
+        assert trecho.equals(dados.iloc[metade:metade + barras_trecho]), "trecho divergente"
+    
+    print(f"Armazenamento de {len(dados)} barras de 1 minuto: gravação {tempos['gravar']:.3f}s, "
+          f"leitura completa {tempos['carregar'] * 1000:.1f}ms, trecho de {barras_trecho} barras "
+          f"{tempos['trecho'] * 1000:.2f}ms")
+    
+    return tempos
+
+# Função para medir o backtesting de uma carteira com capital compartilhado
+def medir_carteira(ativos=200, barras=2520, estrategia='cruzamento_medias', exposicao_maxima=100.0):
+    """
+    Mede o backtesting de uma carteira de ativos sobre um único capital e
+    verifica que o capital final fecha com as operações e posições abertas.
+    
+    Args:
+        ativos (int): Número de ativos da carteira.
+        barras (int): Número de barras diárias de cada ativo.
+        estrategia (str): Estratégia aplicada a todos os ativos.
+        exposicao_maxima (float): Exposição máxima das posições abertas (percentual do patrimônio).
+    
+    Returns:
+        dict: Tempo (em segundos) da geração de sinais e da simulação.
+    
+    Raises:
+        AssertionError: Se o capital final não fechar com as operações.
+    """
+    indice = pd.bdate_range(start=datetime(2015, 1, 1), periods=barras)
+    dados = {f'ATIVO{ativo:03d}': gerar_ohlcv(barras, semente=ativo).set_axis(indice) for ativo in range(ativos)}
+    carteira = BacktestingCarteira(dados, comissao=0.1)
+    
+    tempos = {}
+    inicio = time.perf_counter()
+    sinais = carteira.gerar_sinais(estrategia)
+    tempos['sinais'] = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    resultados = carteira.simular(sinais, exposicao_maxima=exposicao_maxima)
+    tempos['simulacao'] = time.perf_counter() - inicio
+    
+    # Capital final = inicial + operações encerradas (líquidas de comissão) + posições abertas
+    operacoes = resultados['operacoes']
+    realizado = np.sum(operacoes['tipo'] * operacoes['quantidade'] * (operacoes['preco_saida'] - operacoes['preco_entrada'])
+                       - carteira.comissao / 100 * operacoes['quantidade'] * operacoes['preco_entrada'])
+    abertas = resultados['posicoes_abertas']
+    ultimo_fechamento = np.array([dados[ativo]['close'].iloc[-1] for ativo in abertas.index])
+    aberto = np.sum(abertas['tipo'] * abertas['quantidade'] * (ultimo_fechamento - abertas['preco_entrada']))
+    assert np.isclose(resultados['capital_final'], carteira.capital_inicial + realizado + aberto, rtol=1e-9), \
+        "capital final incoerente com as operações"
+    print(f"Carteira de {ativos} ativos x {barras} barras ({estrategia}): sinais {tempos['sinais']:.2f}s, "
+          f"simulação {tempos['simulacao']:.2f}s - {resultados['total_operacoes']} operações, "
+          f"retorno {resultados['retorno_total']:.2f}%, exposição máxima {resultados['exposicao'].max():.1f}%")
+    
+    return tempos
+
+# Função para medir o carregamento concorrente de vários ativos em um servidor local de testes
+def medir_carregador(ativos=500, barras=250, atraso_maximo=0.5, falhas=25):
+    """
+    Mede o carregamento de vários ativos por CarregadorDadosMercado em um
+    servidor HTTP local que imita o gráfico do Yahoo Finance, com atraso
+    diferente por ativo, respostas chunked e falhas temporárias (503) na
+    primeira requisição de alguns ativos (inclusive o mais lento). A carga
+    de todos deve levar pouco mais que a do ativo mais lento isolado, e uma
+    segunda carga deve vir do cache.
+    
+    Args:
+        ativos (int): Número de ativos carregados.
+        barras (int): Número de barras diárias de cada ativo.
+        atraso_maximo (float): Atraso da resposta mais lenta (segundos).
+        falhas (int): Número de ativos cuja primeira requisição falha em cada carga.
+    
+    Returns:
+        dict: Tempo (em segundos) da requisição mais lenta isolada, da carga
+            concorrente e da carga a partir do cache.
+    
+    Raises:
+        AssertionError: Se algum ativo faltar ou divergir da resposta do servidor.
+    """
+    datas = pd.bdate_range(start=datetime(2024, 1, 1), periods=barras, tz='America/Sao_Paulo') + pd.Timedelta(hours=10)
+    timestamps = (datas.as_unit('ns').asi8 // 10**9).tolist()
+    symbols = [f'ATIVO{ativo:03d}.SA' for ativo in range(ativos)]
+    respostas = {}
+    for ativo, symbol in enumerate(symbols):
+        ohlcv = gerar_ohlcv(barras, semente=ativo)
+        respostas[symbol] = json.dumps({'chart': {'result': [{
+            'meta': {'exchangeTimezoneName': 'America/Sao_Paulo'},
+            'timestamp': timestamps,
+            'indicators': {'quote': [{coluna: ohlcv[coluna].tolist() for coluna in ohlcv.columns}]}
+        }]}}).encode()
+    atrasos = dict(zip(symbols, np.linspace(atraso_maximo / 10, atraso_maximo, ativos)))
+    # A mais lenta está entre as que falham, de modo que a referência inclui a nova tentativa
+    com_falha = set(symbols[::-max(1, ativos // max(1, falhas))][:falhas])
+    falhar = set()
+    
+    async def atender(leitor, escritor):
+        # Servidor HTTP/1.1 mínimo com keep-alive
+        while linha := await leitor.readline():
+            while await leitor.readline() not in (b'\r\n', b''):
+                pass
+            symbol = linha.split()[1].decode().split('?')[0].rsplit('/', 1)[-1]
+            await asyncio.sleep(atrasos[symbol])
+            if symbol in falhar:
+                falhar.discard(symbol)
+                escritor.write(b'HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n')
+            elif int(symbol[5:8]) % 2:
+                corpo = respostas[symbol]
+                metade = len(corpo) // 2
+                escritor.write(b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n')
+                for parte in (corpo[:metade], corpo[metade:]):
+                    escritor.write(f'{len(parte):x}\r\n'.encode() + parte + b'\r\n')
+                escritor.write(b'0\r\n\r\n')
+            else:
+                escritor.write(f'HTTP/1.1 200 OK\r\nContent-Length: {len(respostas[symbol])}\r\n\r\n'.encode()
+                               + respostas[symbol])
+            await escritor.drain()
+        escritor.close()
+    
+    async def medir(diretorio):
+        servidor = await asyncio.start_server(atender, '127.0.0.1', 0, backlog=ativos)
+        porta = servidor.sockets[0].getsockname()[1]
+        carregador = CarregadorDadosMercado(f'http://127.0.0.1:{porta}/v8/finance/chart/', limite_conexoes=ativos,
+                                            espera_inicial=0.05, diretorio_cache=diretorio)
+        tempos = {}
+        async with servidor:
+            falhar.update(com_falha)
+            inicio = time.perf_counter()
+            await carregador.carregar_varios(symbols[-1:])
+            tempos['mais_lenta'] = time.perf_counter() - inicio
+            carregador.cache.validade = 0
+            
+            falhar.update(com_falha)
+            inicio = time.perf_counter()
+            dados = await carregador.carregar_varios(symbols)
+            tempos['concorrente'] = time.perf_counter() - inicio
+            carregador.cache.validade = 900.0
+            
+            inicio = time.perf_counter()
+            dados_cache = await carregador.carregar_varios(symbols)
+            tempos['cache'] = time.perf_counter() - inicio
+        return tempos, dados, dados_cache
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        tempos, dados, dados_cache = asyncio.run(medir(diretorio))
+    
+    for symbol in symbols:
+        esperado = converter_grafico(json.loads(respostas[symbol]))
+        assert dados[symbol] is not None and dados[symbol].equals(esperado), f"dados divergentes para {symbol}"
+        assert dados_cache[symbol].equals(esperado), f"cache divergente para {symbol}"
+    
+    print(f"Carregamento de {ativos} ativos ({falhas} com falha temporária): requisição mais lenta "
+          f"{tempos['mais_lenta']:.2f}s, todos os ativos {tempos['concorrente']:.2f}s, "
+          f"do cache {tempos['cache']:.2f}s")
+    
+    return tempos
+
+# Função para medir a geração de dados sintéticos gravados diretamente no armazenamento local
+def medir_gerador(ativos=20, dias=500, correlacao=0.3, barras_por_bloco=100_000):
+    """
+    Mede a geração de barras de 1 minuto de vários ativos correlacionados,
+    com troca de regimes e agrupamento de volatilidade, gravadas bloco a
+    bloco em um armazenamento temporário. Verifica que o resultado não
+    depende do tamanho dos blocos e que a correlação gerada é a pedida.
+    
+    Args:
+        ativos (int): Número de ativos.
+        dias (int): Número de pregões de barras de 1 minuto.
+        correlacao (float): Correlação entre os retornos dos ativos.
+        barras_por_bloco (int): Número aproximado de barras de cada ativo por bloco.
+    
+    Returns:
+        dict: Tempo (em segundos) da geração com gravação.
+    
+    Raises:
+        AssertionError: Se o resultado depender do tamanho dos blocos ou se a correlação divergir.
+    """
+    regimes = [
+        {'tendencia': 0.10, 'volatilidade': 1.0, 'duracao': 20_000},
+        {'tendencia': -0.30, 'volatilidade': 2.5, 'duracao': 4_000}
+    ]
+    gerador = GeradorSintetico(ativos, '1m', correlacao=correlacao, garch=(0.05, 0.9), regimes=regimes)
+    
+    # O mesmo histórico em blocos de um pregão e em um único bloco
+    pequeno = GeradorSintetico(3, '1m', correlacao=correlacao, garch=(0.05, 0.9), regimes=regimes)
+    em_blocos = pequeno.gerar(20, data_final=datetime(2024, 12, 31), barras_por_bloco=1)
+    inteiro = pequeno.gerar(20, data_final=datetime(2024, 12, 31), barras_por_bloco=10**9)
+    for symbol in pequeno.symbols:
+        assert em_blocos[symbol].equals(inteiro[symbol]), f"resultado dependente dos blocos para {symbol}"
+    
+    tempos = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        armazem = ArmazemDados(diretorio)
+        inicio = time.perf_counter()
+        barras = gerador.gravar(armazem, dias, data_final=datetime(2024, 12, 31), barras_por_bloco=barras_por_bloco)
+        tempos['gerar'] = time.perf_counter() - inicio
+        
+        retornos = np.column_stack([
+            np.diff(np.log(armazem.carregar(symbol, '1m', copiar=False)['close'].to_numpy()))
+            for symbol in gerador.symbols
+        ])
+    correlacoes = np.corrcoef(retornos.T)[np.triu_indices(ativos, 1)]
+    assert abs(correlacoes.mean() - correlacao) < 0.05, "correlação gerada divergente"
+    
+    print(f"Geração de {ativos} ativos x {barras} barras de 1 minuto ({ativos * barras / 1e6:.1f} milhões): "
+          f"{tempos['gerar']:.2f}s com gravação ({ativos * barras / tempos['gerar'] / 1e6:.1f} milhões de barras/s), "
+          f"correlação média {correlacoes.mean():.3f}")
+    
+    return tempos
+
+# Função para verificar e medir o backtesting em blocos de um histórico armazenado
+def medir_blocos(dias=1000, barras_por_bloco=50_000, estrategias=('cruzamento_medias', 'rsi', 'macd', 'bollinger',
+                 'price_action', 'suporte_resistencia', 'combinada')):
+    """
+    Verifica que o backtesting em blocos (lendo o armazenamento local) produz
+    as mesmas operações e métricas do backtesting em memória e compara o
+    pico de memória das duas execuções.
+    
+    Args:
+        dias (int): Número de pregões de barras de 1 minuto.
+        barras_por_bloco (int): Barras simuladas por bloco.
+        estrategias (tuple): Estratégias verificadas.
+    
+    Returns:
+        dict: Tempo (em segundos) e pico de memória (em bytes) de cada execução.
+    
+    Raises:
+        AssertionError: Se os resultados divergirem.
+    """
+    indice = gerar_indice_sessoes(dias, '1m', data_final=datetime(2024, 12, 31))
+    dados = gerar_ohlcv(len(indice)).set_axis(indice)
+    configuracoes = [(estrategia, False, 0.0) for estrategia in estrategias]
+    configuracoes.append(('cruzamento_medias', True, 0.5))
+    
+    medidas = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        armazem = ArmazemDados(diretorio)
+        armazem.salvar('ATIVO', '1m', dados)
+        del dados
+        
+        for estrategia, encerrar_sessao, trailing_stop in configuracoes:
+            opcoes = {'encerrar_sessao': encerrar_sessao, 'trailing_stop': trailing_stop}
+            memoria = Backtesting(armazem.carregar('ATIVO', '1m'), comissao=0.1, intervalo='1m')
+            esperado = memoria.executar_backtest(estrategia, **opcoes)
+            blocos = BacktestingBlocos(armazem, 'ATIVO', '1m', comissao=0.1)
+            obtido = blocos.executar_backtest(estrategia, barras_por_bloco=barras_por_bloco, **opcoes)
+            
+            assert np.array_equal(obtido['operacoes'], esperado['operacoes']), f"{estrategia}: operações divergentes"
+            assert np.array_equal(obtido['posicoes'], esperado['posicoes']), f"{estrategia}: posições divergentes"
+            assert np.allclose(obtido['capital_historico'], esperado['capital_historico'], rtol=1e-12), \
+                f"{estrategia}: capital divergente"
+            assert np.allclose(obtido['drawdown'], esperado['drawdown'], rtol=1e-9, atol=1e-12), \
+                f"{estrategia}: drawdown divergente"
+            for metrica in ('total_operacoes', 'operacoes_ganhadoras', 'operacoes_perdedoras'):
+                assert obtido[metrica] == esperado[metrica], f"{estrategia}: {metrica} divergente"
+            for metrica in ('capital_final', 'retorno_total', 'max_drawdown', 'sharpe_ratio', 'profit_factor'):
+                assert np.isclose(obtido[metrica], esperado[metrica], rtol=1e-9), f"{estrategia}: {metrica} divergente"
+        
+        print(f"Backtesting em blocos de {barras_por_bloco} barras ({len(indice)} barras de 1 minuto): "
+              f"{len(configuracoes)} configurações idênticas ao backtesting em memória")
+        
+        # Tempo e pico de memória, do carregamento ao resultado, de uma execução sem os históricos por barra
+        execucoes = {
+            'memoria': lambda: Backtesting(armazem.carregar('ATIVO', '1m'), comissao=0.1,
+                                           intervalo='1m').executar_backtest('combinada'),
+            'blocos': lambda: BacktestingBlocos(armazem, 'ATIVO', '1m', comissao=0.1).executar_backtest(
+                'combinada', barras_por_bloco=barras_por_bloco, historicos=False)
+        }
+        for nome, execucao in execucoes.items():
+            inicio = time.perf_counter()
+            execucao()
+            tempo = time.perf_counter() - inicio
+            tracemalloc.start()
+            execucao()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            medidas[nome] = {'tempo': tempo, 'pico': pico}
+    
+    print(f"Estratégia combinada: em memória {medidas['memoria']['tempo']:.2f}s e pico de "
+          f"{medidas['memoria']['pico'] / 1024 ** 2:.0f}MB; em blocos {medidas['blocos']['tempo']:.2f}s e pico de "
+          f"{medidas['blocos']['pico'] / 1024 ** 2:.0f}MB")
+    
+    return medidas
+
+if __name__ == "__main__":
+    verificar_equivalencia()
+    verificar_incrementais()
+    verificar_lotes()
+    verificar_painel()
+    verificar_simulacao()
+    verificar_precisao()
+    medir_simulacao()
+    medir_sinais()
+    medir_monte_carlo()
+    medir_intradiario()
+    verificar_trailing_stop()
+    medir_carteira()
+    medir_armazem()
+    medir_carregador()
+    medir_gerador()
+    medir_blocos()
@@ -5,7 +5,6 @@ Este script utiliza o módulo de paper trading para simular operações
 em tempo real com dados de mercado.
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
@@ -15,8 +14,43 @@ import time
 
 sys.path.append('/home/ubuntu/robo_trader/src')
 from testes.backtesting import PaperTrading
-from analise_tecnica.indicadores import IndicadoresTecnicos
-from analise_tecnica.estrategias import EstrategiasTrading
+from analise_tecnica.indicadores_incrementais import (
+    MediaMovelSimplesIncremental,
+    RSIIncremental,
+    ATRIncremental,
+    MACDIncremental,
+    BandasBollingerIncremental
+)
+
+# Função para detectar cruzamentos entre a barra anterior e a atual
+def _sinal_cruzamento(valor, valor_anterior, nivel_compra, nivel_compra_anterior,
+                      nivel_venda=None, nivel_venda_anterior=None):
+    """
+    Detecta o cruzamento de um valor sobre níveis de compra e venda.
+    
+    Args:
+        valor (float): Valor atual.
+        valor_anterior (float): Valor na barra anterior.
+        nivel_compra (float): Nível cujo cruzamento para cima gera compra.
+        nivel_compra_anterior (float): Nível de compra na barra anterior.
+        nivel_venda (float): Nível cujo cruzamento para baixo gera venda (padrão: nível de compra).
+        nivel_venda_anterior (float): Nível de venda na barra anterior.
+        
+    Returns:
+        int: 1 para compra, -1 para venda, 0 para neutro.
+    """
+    if nivel_venda is None:
+        nivel_venda, nivel_venda_anterior = nivel_compra, nivel_compra_anterior
+    
+    # Cruzamento para cima (compra)
+    if valor > nivel_compra and valor_anterior <= nivel_compra_anterior:
+        return 1
+    
+    # Cruzamento para baixo (venda)
+    if valor < nivel_venda and valor_anterior >= nivel_venda_anterior:
+        return -1
+    
+    return 0
 
 # Função para gerar dados simulados em tempo real
 def gerar_dados_tempo_real(ativo, intervalo_segundos=5, total_iteracoes=100):
@@ -36,14 +70,25 @@ def gerar_dados_tempo_real(ativo, intervalo_segundos=5, total_iteracoes=100):
     preco_base = 100.0
     volatilidade = 0.002
     
-    # Histórico para cálculo de indicadores
-    historico = {
-        'timestamp': [],
-        'open': [],
-        'high': [],
-        'low': [],
-        'close': [],
-        'volume': []
+    # Indicadores incrementais (atualizados em O(1) a cada barra)
+    sma_9 = MediaMovelSimplesIncremental(9)
+    sma_21 = MediaMovelSimplesIncremental(21)
+    rsi_14 = RSIIncremental(14)
+    atr_14 = ATRIncremental(14)
+    macd = MACDIncremental(12, 26, 9)
+    bollinger = BandasBollingerIncremental(20, 2)
+    
+    # Valores da barra anterior, usados na detecção de cruzamentos
+    anterior = None
+    
+    # Pesos da estratégia combinada (pin bar e suporte/resistência não são calculados)
+    pesos = {
+        'cruzamento_medias': 1.0,
+        'rsi': 1.0,
+        'macd': 1.0,
+        'bollinger': 0.8,
+        'pin_bar': 0.0,
+        'suporte_resistencia': 0.0
     }
     
     for i in range(total_iteracoes):
@@ -71,19 +116,16 @@ def gerar_dados_tempo_real(ativo, intervalo_segundos=5, total_iteracoes=100):
         preco_close = preco_base
         volume = np.random.uniform(1000, 10000) * (1 + np.abs(variacao) * 10)
         
-        # Atualizar histórico
-        historico['timestamp'].append(timestamp)
-        historico['open'].append(preco_open)
-        historico['high'].append(preco_high)
-        historico['low'].append(preco_low)
-        historico['close'].append(preco_close)
-        historico['volume'].append(volume)
-        
-        # Limitar histórico para cálculo de indicadores
-        max_historico = 100
-        if len(historico['timestamp']) > max_historico:
-            for key in historico:
-                historico[key] = historico[key][-max_historico:]
+        # Atualizar indicadores com a nova barra
+        atual = {
+            'close': preco_close,
+            'sma_9': sma_9.atualizar(preco_close),
+            'sma_21': sma_21.atualizar(preco_close),
+            'rsi_14': rsi_14.atualizar(preco_close),
+            'atr_14': atr_14.atualizar(preco_high, preco_low, preco_close),
+            'macd': macd.atualizar(preco_close),
+            'bollinger': bollinger.atualizar(preco_close)
+        }
         
         # Criar dados para retorno
         dados = {
@@ -96,43 +138,49 @@ def gerar_dados_tempo_real(ativo, intervalo_segundos=5, total_iteracoes=100):
             }
         }
         
-        # Calcular indicadores se houver dados suficientes
-        if len(historico['close']) >= 26:  # Mínimo para MACD
-            # Converter para Series para cálculo de indicadores
-            close_series = pd.Series(historico['close'])
-            high_series = pd.Series(historico['high'])
-            low_series = pd.Series(historico['low'])
-            open_series = pd.Series(historico['open'])
-            
-            # Calcular indicadores
+        # Disponibilizar indicadores se houver dados suficientes
+        if i + 1 >= 26:  # Mínimo para MACD
             dados[ativo]['indicadores'] = {
-                'sma_9': IndicadoresTecnicos.sma(close_series, 9).iloc[-1],
-                'sma_21': IndicadoresTecnicos.sma(close_series, 21).iloc[-1],
-                'rsi_14': IndicadoresTecnicos.rsi(close_series, 14).iloc[-1],
-                'atr_14': IndicadoresTecnicos.atr(high_series, low_series, close_series, 14).iloc[-1]
+                'sma_9': atual['sma_9'],
+                'sma_21': atual['sma_21'],
+                'rsi_14': atual['rsi_14'],
+                'atr_14': atual['atr_14']
             }
             
-            # Calcular sinais
+            # Calcular sinais (mesmas regras de EstrategiasTrading, barra a barra)
+            banda_superior, _, banda_inferior = anterior['bollinger']
+            if anterior['close'] <= banda_inferior:
+                sinal_bollinger = 1
+            elif anterior['close'] >= banda_superior:
+                sinal_bollinger = -1
+            else:
+                sinal_bollinger = 0
+            
             dados[ativo]['sinais'] = {
-                'cruzamento_medias': EstrategiasTrading.cruzamento_medias_moveis(close_series, 9, 21).iloc[-1],
-                'rsi': EstrategiasTrading.rsi_sobrecomprado_sobrevendido(close_series, 14, 70, 30).iloc[-1],
-                'macd': EstrategiasTrading.macd_crossover(close_series, 12, 26, 9).iloc[-1],
-                'bollinger': EstrategiasTrading.bollinger_bands_reversal(close_series, 20, 2).iloc[-1]
+                'cruzamento_medias': _sinal_cruzamento(
+                    atual['sma_9'], anterior['sma_9'], atual['sma_21'], anterior['sma_21']
+                ),
+                'rsi': _sinal_cruzamento(
+                    atual['rsi_14'], anterior['rsi_14'], 30, 30, 70, 70
+                ),
+                'macd': _sinal_cruzamento(
+                    atual['macd'][0], anterior['macd'][0], atual['macd'][1], anterior['macd'][1]
+                ),
+                'bollinger': sinal_bollinger
             }
             
             # Calcular sinal combinado
-            pesos = {
-                'cruzamento_medias': 1.0,
-                'rsi': 1.0,
-                'macd': 1.0,
-                'bollinger': 0.8,
-                'pin_bar': 0.0,  # Não calculado neste exemplo
-                'suporte_resistencia': 0.0  # Não calculado neste exemplo
-            }
+            soma_ponderada = sum(pesos[nome] * sinal for nome, sinal in dados[ativo]['sinais'].items())
+            sinal_combinado = soma_ponderada / sum(pesos.values())
             
-            dados[ativo]['sinais']['combinado'] = EstrategiasTrading.estrategia_combinada(
-                open_series, high_series, low_series, close_series, pesos
-            ).iloc[-1]
+            if sinal_combinado > 0.3:
+                dados[ativo]['sinais']['combinado'] = 1
+            elif sinal_combinado < -0.3:
+                dados[ativo]['sinais']['combinado'] = -1
+            else:
+                dados[ativo]['sinais']['combinado'] = 0
+        
+        anterior = atual
         
         yield timestamp, dados
         
@@ -154,13 +202,14 @@ def executar_paper_trading(duracao_minutos=30, intervalo_segundos=5):
     # Lista de ativos para teste
     ativos = ['PETR4', 'VALE3', 'ITUB4', 'BBDC4']
     
-    # Inicializar ambiente de paper trading
-    paper_trading = PaperTrading(capital_inicial=10000.0, comissao=0.1)
-    
     # Parâmetros de gerenciamento de risco
     risco_por_operacao = 1.0  # 1% do capital por operação
     stop_atr = 2.0  # 2x ATR para stop loss
     take_profit_rr = 2.0  # Relação risco/retorno de 1:2
+    trailing_stop = 1.0  # Stop puxado a 1% do fechamento mais favorável desde a entrada
+    
+    # Inicializar ambiente de paper trading
+    paper_trading = PaperTrading(capital_inicial=10000.0, comissao=0.1, trailing_stop=trailing_stop)
     
     # Calcular número total de iterações
     total_iteracoes = (duracao_minutos * 60) // intervalo_segundos
@@ -0,0 +1,263 @@
+"""
+Módulo de Geração de Dados Sintéticos de Mercado para o Robô Trader
+
+Este módulo gera barras OHLCV sintéticas de muitos ativos correlacionados,
+para benchmarks e testes de estresse: os preços seguem um movimento
+browniano geométrico, opcionalmente com troca de regimes de mercado
+(cadeia de Markov com tendência e volatilidade próprias em cada regime)
+e agrupamento de volatilidade (GARCH(1,1)).
+
+Cada ativo tem os seus próprios geradores aleatórios, derivados da semente
+por numpy.random.SeedSequence, e o histórico é produzido em blocos de
+pregões inteiros, levando de um bloco para o outro o último preço, a
+variância GARCH e o regime corrente. O resultado é o mesmo qualquer que
+seja o tamanho dos blocos, e os blocos podem ser gravados diretamente no
+armazenamento local (ver ArmazemDados) sem manter o histórico em memória.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from analise_tecnica.intradiario import SESSAO_PADRAO, converter_intervalo, eh_intradiario, horarios_sessao, periodos_por_ano
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+def _agrupar_volatilidade(choques, desvios, variancia, choque_anterior, alfa, beta):
+    """
+    Aplica a recursão GARCH(1,1) de variância incondicional unitária.
+    
+    h[t] = (1 - alfa - beta) + alfa * e[t-1]^2 + beta * h[t-1] e e[t] = sqrt(h[t]) * z[t],
+    sobre os choques z (barras x ativos), no lugar. `variancia` e
+    `choque_anterior` guardam o estado de cada ativo entre blocos.
+    """
+    omega = 1.0 - alfa - beta
+    for i in range(choques.shape[0]):
+        for j in range(choques.shape[1]):
+            variancia[j] = omega + alfa * choque_anterior[j] * choque_anterior[j] + beta * variancia[j]
+            desvios[i, j] = math.sqrt(variancia[j])
+            choques[i, j] *= desvios[i, j]
+            choque_anterior[j] = choques[i, j]
+
+if numba is not None:
+    _agrupar_volatilidade = numba.njit(cache=True, nogil=True)(_agrupar_volatilidade)
+
+class GeradorSintetico:
+    """
+    Gera barras OHLCV sintéticas de vários ativos correlacionados.
+    
+    Uso:
+        gerador = GeradorSintetico(50, intervalo='1m', correlacao=0.4, garch=(0.05, 0.9))
+        for bloco in gerador.blocos(dias=2520):
+            ...  # bloco: {symbol: DataFrame OHLCV}
+    """
+    
+    def __init__(self, ativos=1, intervalo='1d', sessao=SESSAO_PADRAO, tendencia=0.08, volatilidade=0.25,
+                 correlacao=0.0, garch=None, regimes=None, preco_inicial=100.0, volume_medio=5000.0, semente=42):
+        """
+        Inicializa o gerador.
+        
+        Args:
+            ativos (int ou list): Número de ativos (símbolos 'SINT000', 'SINT001'...) ou lista de símbolos.
+            intervalo (str): Intervalo das barras ('1d', '5m', '1m'...).
+            sessao (tuple): Horário do pregão (início, fim), para barras intradiárias.
+            tendencia (float): Tendência anual (ex: 0.08 para 8% ao ano).
+            volatilidade (float): Volatilidade anual (ex: 0.25 para 25% ao ano).
+            correlacao (float ou array-like): Correlação entre os retornos de todos
+                os pares de ativos ou matriz de correlação (ativos x ativos).
+            garch (tuple): Parâmetros (alfa, beta) do agrupamento de volatilidade
+                (None: volatilidade constante).
+            regimes (list): Regimes de mercado, dicionários com 'tendencia'
+                (anual), 'volatilidade' (multiplicador da volatilidade) e
+                'duracao' (duração média, em barras). None: regime único.
+            preco_inicial (float): Preço de abertura da primeira barra.
+            volume_medio (float): Volume médio por barra.
+            semente (int): Semente dos geradores aleatórios.
+        """
+        self.symbols = [f'SINT{ativo:03d}' for ativo in range(ativos)] if isinstance(ativos, int) else list(ativos)
+        self.intervalo = intervalo
+        self.sessao = sessao
+        self.tendencia = tendencia
+        self.volatilidade = volatilidade
+        self.preco_inicial = preco_inicial
+        self.volume_medio = volume_medio
+        self.semente = semente
+        self.dt = 1 / periodos_por_ano(intervalo, sessao)
+        
+        n = len(self.symbols)
+        matriz = np.full((n, n), float(correlacao)) if np.ndim(correlacao) == 0 else np.asarray(correlacao, dtype=np.float64)
+        np.fill_diagonal(matriz, 1.0)
+        try:
+            self.cholesky = np.linalg.cholesky(matriz) if n > 1 and np.any(matriz != np.eye(n)) else None
+        except np.linalg.LinAlgError:
+            raise ValueError("A matriz de correlação precisa ser positiva definida.")
+        
+        if garch is not None and (min(garch) < 0 or sum(garch) >= 1):
+            raise ValueError("Os parâmetros GARCH precisam ser não negativos, com alfa + beta < 1.")
+        self.garch = garch
+        
+        self.regimes = regimes or [{'tendencia': tendencia, 'volatilidade': 1.0, 'duracao': math.inf}]
+        if any(regime['duracao'] < 1 for regime in self.regimes):
+            raise ValueError("A duração média de cada regime precisa ser de pelo menos 1 barra.")
+    
+    def _geradores(self):
+        """
+        Cria os geradores aleatórios: um para os regimes e três por ativo
+        (retornos, extremos das barras e volume).
+        
+        O i-ésimo ativo usa sempre as mesmas sequências, independentemente
+        do número de ativos e do tamanho dos blocos.
+        """
+        sequencias = np.random.SeedSequence(self.semente).spawn(len(self.symbols) + 1)
+        gerador_regimes = np.random.default_rng(sequencias[0])
+        geradores_ativos = [[np.random.default_rng(filha) for filha in sequencia.spawn(3)] for sequencia in sequencias[1:]]
+        return gerador_regimes, geradores_ativos
+    
+    def _sequencia_regimes(self, barras, estado, gerador):
+        """
+        Sorteia o regime de cada barra de um bloco, continuando o regime corrente.
+        
+        A duração de cada regime é geométrica com a média configurada; ao
+        fim dela, o mercado passa a um dos outros regimes, sorteado (com um
+        único regime, o mesmo regime é renovado).
+        
+        Returns:
+            numpy.ndarray: Índice do regime de cada barra.
+        """
+        indices = np.empty(barras, dtype=np.int64)
+        posicao = 0
+        while posicao < barras:
+            if estado['restante'] == 0:
+                outros = [regime for regime in range(len(self.regimes)) if regime != estado['regime']] or [estado['regime']]
+                estado['regime'] = outros[gerador.integers(len(outros))]
+                estado['restante'] = gerador.geometric(1 / self.regimes[estado['regime']]['duracao'])
+            duracao = min(estado['restante'], barras - posicao)
+            indices[posicao:posicao + duracao] = estado['regime']
+            posicao += duracao
+            estado['restante'] -= duracao
+        return indices
+    
+    def blocos(self, dias, data_final=None, barras_por_bloco=250_000):
+        """
+        Gera o histórico em blocos de pregões inteiros.
+        
+        Args:
+            dias (int): Número de pregões (dias úteis; com intervalos maiores que um dia, número de barras).
+            data_final (datetime): Data do último pregão (padrão: hoje).
+            barras_por_bloco (int): Número aproximado de barras de cada ativo por bloco.
+        
+        Yields:
+            dict: Dicionário {symbol: DataFrame OHLCV} com as barras do bloco.
+        """
+        fim = pd.Timestamp(data_final or 'today').normalize()
+        duracao = converter_intervalo(self.intervalo)
+        if duracao > pd.Timedelta(days=1):
+            datas = pd.date_range(end=fim, periods=dias, freq=duracao)
+        else:
+            datas = pd.bdate_range(end=fim, periods=dias)
+        datas = datas.as_unit('ns').asi8
+        horarios = horarios_sessao(self.intervalo, self.sessao) if eh_intradiario(self.intervalo) else np.zeros(1, dtype=np.int64)
+        dias_por_bloco = max(1, barras_por_bloco // len(horarios))
+        
+        n = len(self.symbols)
+        gerador_regimes, geradores_ativos = self._geradores()
+        tendencias = np.array([regime['tendencia'] for regime in self.regimes])
+        multiplicadores = np.array([regime['volatilidade'] for regime in self.regimes])
+        
+        # Estado levado de um bloco para o outro
+        log_precos = np.full(n, math.log(self.preco_inicial))
+        variancia = np.ones(n)
+        choque_anterior = np.zeros(n)
+        duracao = self.regimes[0]['duracao']
+        estado_regimes = {'regime': 0, 'restante': math.inf if math.isinf(duracao) else gerador_regimes.geometric(1 / duracao)}
+        
+        for inicio in range(0, dias, dias_por_bloco):
+            valores = datas[inicio:inicio + dias_por_bloco, np.newaxis] + horarios[np.newaxis, :]
+            indice = pd.DatetimeIndex(valores.ravel().view('datetime64[ns]'))
+            barras = len(indice)
+            
+            # Choques normais independentes por ativo, correlacionados pela decomposição de Cholesky
+            choques = np.column_stack([geradores[0].standard_normal(barras) for geradores in geradores_ativos])
+            if self.cholesky is not None:
+                choques = choques @ self.cholesky.T
+            desvios = np.ones_like(choques)
+            if self.garch is not None:
+                _agrupar_volatilidade(choques, desvios, variancia, choque_anterior, *self.garch)
+            
+            # Movimento browniano geométrico com a tendência e a volatilidade do regime de cada barra
+            regimes = self._sequencia_regimes(barras, estado_regimes, gerador_regimes)
+            sigma = self.volatilidade * multiplicadores[regimes][:, np.newaxis]
+            retornos = (tendencias[regimes][:, np.newaxis] - 0.5 * sigma ** 2) * self.dt + sigma * np.sqrt(self.dt) * choques
+            
+            # O último preço do bloco anterior abre a soma, que segue assim a mesma ordem de uma única passada
+            log_fechamentos = np.cumsum(np.vstack((log_precos, retornos)), axis=0)
+            precos = np.exp(log_fechamentos)
+            aberturas, fechamentos = precos[:-1], precos[1:]
+            log_precos = log_fechamentos[-1]
+            
+            # Extremos além da abertura e do fechamento, proporcionais à volatilidade da barra
+            escala = sigma * desvios * np.sqrt(self.dt)
+            extremos = np.stack([geradores[1].standard_exponential((barras, 2)) for geradores in geradores_ativos], axis=1)
+            maximas = np.maximum(aberturas, fechamentos) * np.exp(0.5 * escala * extremos[:, :, 0])
+            minimas = np.minimum(aberturas, fechamentos) * np.exp(-0.5 * escala * extremos[:, :, 1])
+            
+            # Volume maior em barras de maior movimento
+            ruido = np.column_stack([geradores[2].standard_normal(barras) for geradores in geradores_ativos])
+            volumes = self.volume_medio * np.exp(0.25 * ruido) * (1 + np.abs(retornos) / (escala + 1e-12))
+            
+            yield {
+                symbol: pd.DataFrame({
+                    'open': aberturas[:, j],
+                    'high': maximas[:, j],
+                    'low': minimas[:, j],
+                    'close': fechamentos[:, j],
+                    'volume': volumes[:, j]
+                }, index=indice)
+                for j, symbol in enumerate(self.symbols)
+            }
+    
+    def gerar(self, dias, data_final=None, barras_por_bloco=250_000):
+        """
+        Gera o histórico completo em memória.
+        
+        Args:
+            dias (int): Número de pregões (dias úteis; com intervalos maiores que um dia, número de barras).
+            data_final (datetime): Data do último pregão (padrão: hoje).
+            barras_por_bloco (int): Número aproximado de barras de cada ativo por bloco.
+        
+        Returns:
+            dict: Dicionário {symbol: DataFrame OHLCV}.
+        """
+        blocos = list(self.blocos(dias, data_final, barras_por_bloco))
+        return {symbol: pd.concat([bloco[symbol] for bloco in blocos]) for symbol in self.symbols}
+    
+    def gravar(self, armazem, dias, data_final=None, barras_por_bloco=250_000):
+        """
+        Gera o histórico bloco a bloco, gravando-o no armazenamento local.
+        
+        Os dados existentes dos mesmos ativos e intervalo são substituídos.
+        A memória usada depende do tamanho dos blocos, e não do histórico.
+        
+        Args:
+            armazem (ArmazemDados): Armazenamento local.
+            dias (int): Número de pregões (dias úteis; com intervalos maiores que um dia, número de barras).
+            data_final (datetime): Data do último pregão (padrão: hoje).
+            barras_por_bloco (int): Número aproximado de barras de cada ativo por bloco.
+        
+        Returns:
+            int: Número de barras gravadas por ativo.
+        """
+        total = 0
+        for numero, bloco in enumerate(self.blocos(dias, data_final, barras_por_bloco)):
+            for symbol, dados in bloco.items():
+                if numero == 0:
+                    armazem.salvar(symbol, self.intervalo, dados)
+                else:
+                    armazem.acrescentar(symbol, self.intervalo, dados)
+            total += len(dados)
+        return total
@@ -19,14 +19,17 @@ class GerenciamentoRisco:
         """
         Calcula o tamanho da posição baseado no risco percentual do capital.
         
+        Aceita arrays NumPy nos preços (uma posição por ativo), caso em que
+        os tamanhos são calculados de uma vez.
+        
         Args:
             capital (float): Capital total disponível.
             risco_percentual (float): Percentual do capital a arriscar na operação (ex: 1.0 para 1%).
-            preco_entrada (float): Preço de entrada da operação.
-            preco_stop (float): Preço do stop loss.
+            preco_entrada (float ou numpy.ndarray): Preço de entrada da operação.
+            preco_stop (float ou numpy.ndarray): Preço do stop loss.
             
         Returns:
-            float: Quantidade de unidades/contratos a serem negociados.
+            float ou numpy.ndarray: Quantidade de unidades/contratos a serem negociados.
         """
         # Calcular valor monetário a arriscar
         valor_risco = capital * (risco_percentual / 100)
@@ -34,7 +37,10 @@ class GerenciamentoRisco:
         # Calcular risco por unidade
         risco_por_unidade = abs(preco_entrada - preco_stop)
         
-        # Calcular tamanho da posição
+        # Calcular tamanho da posição (vetorizado para arrays de preços)
+        if np.ndim(risco_por_unidade) > 0:
+            tamanhos = np.zeros(np.broadcast(valor_risco, risco_por_unidade).shape)
+            return np.divide(valor_risco, risco_por_unidade, out=tamanhos, where=risco_por_unidade > 0)
         if risco_por_unidade > 0:
             tamanho_posicao = valor_risco / risco_por_unidade
         else:
@@ -99,19 +105,28 @@ class GerenciamentoRisco:
         return take_profit
     
     @staticmethod
-    def calcular_trailing_stop(dados_close, preco_entrada, direcao, percentual=1.0):
+    def calcular_trailing_stop(dados_close, preco_entrada, direcao, percentual=1.0, data_entrada=None):
         """
         Calcula o trailing stop baseado em um percentual do movimento favorável.
         
+        Para acompanhar uma posição barra a barra, use TrailingStopIncremental,
+        que atualiza o nível em O(1) sem recalcular a série.
+        
         Args:
             dados_close (pandas.Series): Série de preços de fechamento.
             preco_entrada (float): Preço de entrada da operação.
             direcao (int): Direção da operação (1 para compra, -1 para venda).
             percentual (float): Percentual do movimento favorável para definir o trailing stop.
+            data_entrada: Data da entrada; o extremo é acumulado a partir dela e
+                as barras anteriores ficam sem nível (padrão: toda a série).
             
         Returns:
             pandas.Series: Série com os níveis de trailing stop.
         """
+        indice = dados_close.index
+        if data_entrada is not None:
+            dados_close = dados_close.loc[data_entrada:]
+        
         # Inicializar série de trailing stop
         trailing_stop = pd.Series(0.0, index=dados_close.index)
         
@@ -135,7 +150,7 @@ class GerenciamentoRisco:
             # Garantir que o trailing stop não fique acima do preço de entrada
             trailing_stop = trailing_stop.clip(upper=preco_entrada)
             
-        return trailing_stop
+        return trailing_stop.reindex(indice) if data_entrada is not None else trailing_stop
     
     @staticmethod
     def calcular_exposicao_maxima(capital, exposicao_percentual=20.0):
@@ -203,3 +218,65 @@ class GerenciamentoRisco:
         drawdown_atual = drawdown_percentual.iloc[-1]
         
         return drawdown_maximo, drawdown_atual
+
+class TrailingStopIncremental:
+    """
+    Trailing stop incremental de uma posição aberta.
+    
+    Guarda apenas o preço mais favorável desde a entrada e o nível atual do
+    stop, atualizados em O(1) a cada barra. O nível é puxado para
+    `percentual` abaixo (compra) ou acima (venda) do extremo e nunca recua;
+    o stop inicial (ex: pelo ATR) serve de piso.
+    """
+    
+    def __init__(self, direcao, preco_entrada, percentual=1.0, stop_inicial=None):
+        """
+        Inicializa o trailing stop de uma posição recém-aberta.
+        
+        Args:
+            direcao (int): Direção da operação (1 para compra, -1 para venda).
+            preco_entrada (float): Preço de entrada da operação.
+            percentual (float): Distância percentual do stop em relação ao extremo.
+            stop_inicial (float): Stop loss da entrada (padrão: `percentual` a partir do preço de entrada).
+        """
+        self.direcao = direcao
+        self.percentual = percentual
+        self.extremo = preco_entrada
+        self._fator = 1 - direcao * percentual / 100
+        self.stop_inicial = stop_inicial if stop_inicial is not None else preco_entrada * self._fator
+        self.valor = self.stop_inicial
+    
+    @property
+    def movido(self):
+        """bool: True se o stop já foi puxado além do stop inicial."""
+        return self.valor != self.stop_inicial
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço (ex: o fechamento da barra).
+        
+        Args:
+            preco (float): Novo preço.
+        
+        Returns:
+            float: Nível atualizado do stop, que vale a partir da barra seguinte.
+        """
+        if self.direcao * (preco - self.extremo) > 0:
+            self.extremo = preco
+        nivel = self.extremo * self._fator
+        if self.direcao * (nivel - self.valor) > 0:
+            self.valor = nivel
+        return self.valor
+    
+    def acionado(self, high, low):
+        """
+        Verifica se a barra atingiu o stop.
+        
+        Args:
+            high (float): Preço máximo da barra.
+            low (float): Preço mínimo da barra.
+        
+        Returns:
+            bool: True se o stop foi atingido.
+        """
+        return low <= self.valor if self.direcao == 1 else high >= self.valor
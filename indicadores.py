@@ -6,14 +6,104 @@ de mercado e geração de sinais de trading.
 """
 
 import numpy as np
-import pandas as pd
+from .cache_indicadores import cache, memoizar
+from .painel import suportar_painel
+from .precisao import com_precisao
+
+def _prefixos_em_blocos(valores, tamanho_bloco):
+    """
+    Calcula somas prefixadas reiniciadas a cada bloco de `tamanho_bloco` valores.
+    
+    Returns:
+        tuple: (Prefixos locais para as posições 0..n, Totais de cada bloco)
+    """
+    n = len(valores)
+    total_blocos = n // tamanho_bloco + 1
+    
+    blocos = np.zeros(total_blocos * tamanho_bloco)
+    blocos[:n] = valores
+    blocos = blocos.reshape(total_blocos, tamanho_bloco)
+    
+    acumulado = np.cumsum(blocos, axis=1)
+    prefixos = np.zeros_like(blocos)
+    prefixos[:, 1:] = acumulado[:, :-1]
+    
+    return prefixos.ravel()[:n+1], acumulado[:, -1]
+
+def _somas_janelas(valores, periodos, centralizar=True, quadrados=False):
+    """
+    Calcula somas (e somas dos quadrados) de janelas móveis para vários períodos.
+    
+    As somas prefixadas da série são calculadas uma única vez e compartilhadas
+    por todos os períodos; a soma de cada janela é a diferença de dois
+    prefixos. Os prefixos são reiniciados em blocos maiores que o maior
+    período, o que mantém o erro de arredondamento limitado ao tamanho do
+    bloco mesmo em históricos com milhões de barras. Janelas com NaN ficam NaN.
+    
+    Args:
+        valores (array-like): Série de valores.
+        periodos (list): Lista de períodos.
+        centralizar (bool): Se True, subtrai a média da série antes de somar
+            (as somas ficam relativas à referência retornada).
+        quadrados (bool): Se True, calcula também as somas dos quadrados.
+    
+    Returns:
+        tuple: (Somas, Somas dos Quadrados ou None, Referência), arrays 2-D com uma coluna por período.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    n = len(valores)
+    nans = np.isnan(valores)
+    possui_nans = bool(nans.any())
+    
+    referencia = float(np.mean(valores[~nans])) if centralizar and not nans.all() else 0.0
+    centrados = np.where(nans, 0.0, valores - referencia) if possui_nans else valores - referencia
+    
+    tamanho_bloco = max(4096, int(max(periodos, default=1)))
+    bloco = np.arange(n + 1) // tamanho_bloco
+    acumulado_nans = np.concatenate(([0], np.cumsum(nans)))
+    
+    prefixos = [_prefixos_em_blocos(centrados, tamanho_bloco)]
+    if quadrados:
+        prefixos.append(_prefixos_em_blocos(centrados * centrados, tamanho_bloco))
+    
+    # Colunas contíguas (ordem Fortran): cada período escreve um bloco contínuo
+    resultados = [np.full((n, len(periodos)), np.nan, order='F') for _ in prefixos]
+    
+    for k, periodo in enumerate(periodos):
+        if periodo > n:
+            continue
+        
+        # Janelas que atravessam a fronteira de um bloco somam o total desse bloco
+        cruza_bloco = np.flatnonzero(bloco[periodo:] != bloco[:-periodo])
+        incompletas = np.flatnonzero(acumulado_nans[periodo:] != acumulado_nans[:-periodo]) if possui_nans else None
+        
+        for (prefixo, totais), resultado in zip(prefixos, resultados):
+            coluna = resultado[periodo-1:, k]
+            np.subtract(prefixo[periodo:], prefixo[:-periodo], out=coluna)
+            coluna[cruza_bloco] += totais[bloco[cruza_bloco]]
+            if possui_nans:
+                coluna[incompletas] = np.nan
+    
+    somas_quadrados = resultados[1] if quadrados else None
+    return resultados[0], somas_quadrados, referencia
 
 class IndicadoresTecnicos:
     """
     Classe que implementa os principais indicadores técnicos para análise de mercado.
+    
+    Os resultados são memoizados em `IndicadoresTecnicos.cache`, compartilhado
+    entre estratégias e execuções do mesmo processo. Os indicadores aceitam
+    também painéis (DataFrame barras x ativos), ver painel.suportar_painel,
+    e o argumento nomeado `precisao` ('float64' ou 'float32'), ver precisao.
     """
     
+    # Cache compartilhado de resultados (ver cache_indicadores.CacheIndicadores)
+    cache = cache
+    
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def media_movel_simples(dados, periodo=20):
         """
         Calcula a Média Móvel Simples (SMA) para uma série de preços.
@@ -28,6 +118,9 @@ class IndicadoresTecnicos:
         return dados.rolling(window=periodo).mean()
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def media_movel_exponencial(dados, periodo=20):
         """
         Calcula a Média Móvel Exponencial (EMA) para uma série de preços.
@@ -42,6 +135,9 @@ class IndicadoresTecnicos:
         return dados.ewm(span=periodo, adjust=False).mean()
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def macd(dados, periodo_rapido=12, periodo_lento=26, periodo_sinal=9):
         """
         Calcula o MACD (Moving Average Convergence Divergence).
@@ -65,6 +161,9 @@ class IndicadoresTecnicos:
         return macd_linha, sinal, histograma
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def rsi(dados, periodo=14):
         """
         Calcula o RSI (Relative Strength Index).
@@ -97,6 +196,9 @@ class IndicadoresTecnicos:
         return rsi
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def bandas_bollinger(dados, periodo=20, desvios=2):
         """
         Calcula as Bandas de Bollinger.
@@ -118,6 +220,9 @@ class IndicadoresTecnicos:
         return banda_superior, media_movel, banda_inferior
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def estocastico(dados_high, dados_low, dados_close, periodo_k=14, periodo_d=3):
         """
         Calcula o Oscilador Estocástico.
@@ -144,6 +249,9 @@ class IndicadoresTecnicos:
         return k, d
     
     @staticmethod
+    @com_precisao
+    @memoizar
+    @suportar_painel
     def atr(dados_high, dados_low, dados_close, periodo=14):
         """
         Calcula o ATR (Average True Range).
@@ -164,9 +272,140 @@ class IndicadoresTecnicos:
         tr2 = abs(dados_high - dados_close_anterior)
         tr3 = abs(dados_low - dados_close_anterior)
         
-        tr = pd.DataFrame({'TR1': tr1, 'TR2': tr2, 'TR3': tr3}).max(axis=1)
+        tr = np.fmax(np.fmax(tr1, tr2), tr3)  # fmax ignora o NaN da primeira barra
         
         # Calcular ATR (média móvel do True Range)
         atr = tr.rolling(window=periodo).mean()
         
         return atr
+    
+    @staticmethod
+    @com_precisao
+    @memoizar
+    def media_movel_simples_lote(dados, periodos):
+        """
+        Calcula a Média Móvel Simples para vários períodos de uma vez.
+        
+        Todas as médias compartilham uma única soma acumulada da série, de modo
+        que varrer muitos períodos custa pouco mais que uma passada.
+        
+        Args:
+            dados (pandas.Series): Série de preços.
+            periodos (list): Lista de períodos.
+        
+        Returns:
+            numpy.ndarray: Array 2-D (barras x períodos) com uma coluna por período.
+        """
+        periodos = np.asarray(periodos)
+        somas, _, referencia = _somas_janelas(dados, periodos)
+        
+        somas /= periodos
+        somas += referencia
+        return somas
+    
+    @staticmethod
+    @com_precisao
+    @memoizar
+    def rsi_lote(dados, periodos):
+        """
+        Calcula o RSI para vários períodos de uma vez.
+        
+        A diferença entre barras e a separação de ganhos e perdas são feitas
+        uma única vez e reaproveitadas por todos os períodos.
+        
+        Args:
+            dados (pandas.Series): Série de preços.
+            periodos (list): Lista de períodos.
+        
+        Returns:
+            numpy.ndarray: Array 2-D (barras x períodos) com uma coluna por período.
+        """
+        periodos = np.asarray(periodos)
+        delta = np.diff(np.asarray(dados, dtype=np.float64), prepend=np.nan)
+        
+        # Separar ganhos (positivos) e perdas (negativos), preservando o NaN inicial
+        ganhos = np.where(delta < 0, 0.0, delta)
+        perdas = np.where(delta > 0, 0.0, np.abs(delta))
+        
+        soma_ganhos, _, _ = _somas_janelas(ganhos, periodos, centralizar=False)
+        soma_perdas, _, _ = _somas_janelas(perdas, periodos, centralizar=False)
+        
+        # Calcular força relativa e RSI (mesma semântica de divisão do pandas)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.divide(soma_ganhos, soma_perdas, out=soma_ganhos)
+            rs += 1
+            rsi = np.divide(100, rs, out=rs)
+            np.subtract(100, rsi, out=rsi)
+        
+        return rsi
+    
+    @staticmethod
+    @com_precisao
+    @memoizar
+    def bandas_bollinger_lote(dados, periodos, desvios=2):
+        """
+        Calcula as Bandas de Bollinger para vários períodos de uma vez.
+        
+        Médias e desvios padrão de todos os períodos vêm das mesmas somas
+        acumuladas da série e de seus quadrados.
+        
+        Args:
+            dados (pandas.Series): Série de preços.
+            periodos (list): Lista de períodos.
+            desvios (int): Número de desvios padrão para as bandas.
+        
+        Returns:
+            tuple: (Banda Superior, Média Móvel, Banda Inferior), arrays 2-D (barras x períodos).
+        """
+        periodos = np.asarray(periodos)
+        somas, somas_quadrados, referencia = _somas_janelas(dados, periodos, quadrados=True)
+        
+        # Variância amostral (ddof=1, como no pandas), reaproveitando os buffers
+        media_movel = somas / periodos
+        with np.errstate(divide='ignore', invalid='ignore'):
+            somas_quadrados -= somas * media_movel
+            somas_quadrados /= periodos - 1
+        # Com período 1 o desvio amostral não é definido (NaN, como no pandas)
+        somas_quadrados[..., periodos < 2] = np.nan
+        np.maximum(somas_quadrados, 0.0, out=somas_quadrados)
+        desvio_padrao = np.sqrt(somas_quadrados, out=somas_quadrados)
+        desvio_padrao *= desvios
+        media_movel += referencia
+        
+        banda_superior = media_movel + desvio_padrao
+        banda_inferior = np.subtract(media_movel, desvio_padrao, out=somas)
+        
+        return banda_superior, media_movel, banda_inferior
+    
+    @staticmethod
+    @com_precisao
+    @memoizar
+    def atr_lote(dados_high, dados_low, dados_close, periodos):
+        """
+        Calcula o ATR para vários períodos de uma vez.
+        
+        O True Range é calculado uma única vez e compartilhado por todos os períodos.
+        
+        Args:
+            dados_high (pandas.Series): Série de preços máximos.
+            dados_low (pandas.Series): Série de preços mínimos.
+            dados_close (pandas.Series): Série de preços de fechamento.
+            periodos (list): Lista de períodos.
+        
+        Returns:
+            numpy.ndarray: Array 2-D (barras x períodos) com uma coluna por período.
+        """
+        periodos = np.asarray(periodos)
+        dados_high = np.asarray(dados_high, dtype=np.float64)
+        dados_low = np.asarray(dados_low, dtype=np.float64)
+        dados_close_anterior = np.concatenate(([np.nan], np.asarray(dados_close, dtype=np.float64)[:-1]))
+        
+        # True Range (fmax ignora o NaN da primeira barra, como max(axis=1))
+        tr = np.fmax(np.fmax(dados_high - dados_low, np.abs(dados_high - dados_close_anterior)),
+                     np.abs(dados_low - dados_close_anterior))
+        
+        somas, _, referencia = _somas_janelas(tr, periodos)
+        
+        somas /= periodos
+        somas += referencia
+        return somas
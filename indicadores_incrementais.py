@@ -0,0 +1,406 @@
+"""
+Módulo de Indicadores Técnicos Incrementais para o Robô Trader
+
+Este módulo implementa versões incrementais (streaming) dos indicadores de
+IndicadoresTecnicos. Cada indicador mantém seu estado interno e recebe uma
+barra por vez, devolvendo o valor atualizado em tempo constante. Os valores
+produzidos coincidem, barra a barra, com os das funções em lote.
+"""
+
+import math
+from collections import deque
+
+class _JanelaMovel:
+    """
+    Mantém soma e soma dos quadrados de uma janela deslizante em O(1) por valor.
+    
+    Os valores são acumulados em relação a um valor de referência para reduzir
+    o cancelamento numérico, e as somas são recalculadas a partir da janela a
+    cada `periodo` atualizações (custo amortizado constante) para evitar que o
+    erro de arredondamento se acumule em execuções longas.
+    """
+    
+    def __init__(self, periodo, centralizar=True):
+        self.periodo = periodo
+        self.centralizar = centralizar
+        self._valores = deque()
+        self._referencia = 0.0
+        self._soma = 0.0
+        self._soma_quadrados = 0.0
+        self._nans = 0
+        self._nao_nulos = 0
+        self._desde_recalculo = 0
+    
+    def adicionar(self, valor):
+        """
+        Adiciona um valor à janela, descartando o mais antigo se necessário.
+        
+        Args:
+            valor (float): Novo valor.
+        """
+        self._valores.append(valor)
+        self._acumular(valor, 1)
+        
+        if len(self._valores) > self.periodo:
+            self._acumular(self._valores.popleft(), -1)
+        
+        self._desde_recalculo += 1
+        if self._desde_recalculo >= self.periodo:
+            self._recalcular()
+    
+    def _acumular(self, valor, sinal):
+        if math.isnan(valor):
+            self._nans += sinal
+            return
+        
+        if valor != 0:
+            self._nao_nulos += sinal
+        
+        desvio = valor - self._referencia
+        self._soma += sinal * desvio
+        self._soma_quadrados += sinal * desvio * desvio
+    
+    def _recalcular(self):
+        validos = [v for v in self._valores if not math.isnan(v)]
+        
+        if self.centralizar and validos:
+            self._referencia = validos[-1]
+        
+        desvios = [v - self._referencia for v in validos]
+        self._soma = math.fsum(desvios)
+        self._soma_quadrados = math.fsum(d * d for d in desvios)
+        self._desde_recalculo = 0
+    
+    @property
+    def cheia(self):
+        """bool: True se a janela tem `periodo` valores e nenhum NaN."""
+        return len(self._valores) == self.periodo and self._nans == 0
+    
+    def media(self):
+        """
+        Retorna a média da janela (NaN enquanto a janela não estiver cheia).
+        """
+        if not self.cheia:
+            return math.nan
+        if self._nao_nulos == 0:
+            return 0.0
+        return self._referencia + self._soma / self.periodo
+    
+    def desvio_padrao(self):
+        """
+        Retorna o desvio padrão amostral da janela (ddof=1, como no pandas).
+        """
+        if not self.cheia or self.periodo < 2:
+            return math.nan
+        
+        variancia = (self._soma_quadrados - self._soma * self._soma / self.periodo) / (self.periodo - 1)
+        return math.sqrt(max(variancia, 0.0))
+
+class _ExtremoMovel:
+    """
+    Mínimo ou máximo de uma janela deslizante com deque monotônico (O(1) amortizado).
+    """
+    
+    def __init__(self, periodo, maximo=True):
+        self.periodo = periodo
+        self.maximo = maximo
+        self._candidatos = deque()  # pares (posição, valor)
+        self._contador = 0
+        self._ultimo_nan = -1
+    
+    def adicionar(self, valor):
+        """
+        Adiciona um valor à janela e retorna o extremo atual (NaN se incompleta).
+        
+        Args:
+            valor (float): Novo valor.
+        
+        Returns:
+            float: Mínimo ou máximo da janela.
+        """
+        posicao = self._contador
+        self._contador += 1
+        
+        if math.isnan(valor):
+            self._ultimo_nan = posicao
+        else:
+            while self._candidatos and (
+                self._candidatos[-1][1] <= valor if self.maximo else self._candidatos[-1][1] >= valor
+            ):
+                self._candidatos.pop()
+            self._candidatos.append((posicao, valor))
+        
+        while self._candidatos and self._candidatos[0][0] <= posicao - self.periodo:
+            self._candidatos.popleft()
+        
+        if self._contador < self.periodo or posicao - self._ultimo_nan < self.periodo:
+            return math.nan
+        return self._candidatos[0][1]
+
+def _dividir(numerador, denominador):
+    """
+    Divisão com a mesma semântica do pandas para denominador nulo.
+    """
+    if denominador == 0:
+        if numerador == 0 or math.isnan(numerador):
+            return math.nan
+        return math.copysign(math.inf, numerador)
+    return numerador / denominador
+
+class MediaMovelSimplesIncremental:
+    """
+    Média Móvel Simples (SMA) incremental.
+    
+    Equivale a IndicadoresTecnicos.media_movel_simples.
+    """
+    
+    def __init__(self, periodo=20):
+        """
+        Args:
+            periodo (int): Período para cálculo da média móvel.
+        """
+        self.periodo = periodo
+        self._janela = _JanelaMovel(periodo)
+        self.valor = math.nan
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço.
+        
+        Args:
+            preco (float): Novo preço.
+        
+        Returns:
+            float: Valor atualizado da média móvel.
+        """
+        self._janela.adicionar(preco)
+        self.valor = self._janela.media()
+        return self.valor
+
+class MediaMovelExponencialIncremental:
+    """
+    Média Móvel Exponencial (EMA) incremental.
+    
+    Equivale a IndicadoresTecnicos.media_movel_exponencial (adjust=False).
+    """
+    
+    def __init__(self, periodo=20):
+        """
+        Args:
+            periodo (int): Período para cálculo da média móvel exponencial.
+        """
+        self.periodo = periodo
+        self.alpha = 2.0 / (periodo + 1)
+        self.valor = math.nan
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço.
+        
+        Args:
+            preco (float): Novo preço (NaN mantém o valor anterior).
+        
+        Returns:
+            float: Valor atualizado da média móvel exponencial.
+        """
+        if math.isnan(self.valor):
+            self.valor = preco
+        elif not math.isnan(preco):
+            self.valor = self.alpha * preco + (1 - self.alpha) * self.valor
+        return self.valor
+
+class MACDIncremental:
+    """
+    MACD incremental.
+    
+    Equivale a IndicadoresTecnicos.macd.
+    """
+    
+    def __init__(self, periodo_rapido=12, periodo_lento=26, periodo_sinal=9):
+        """
+        Args:
+            periodo_rapido (int): Período para a média móvel rápida.
+            periodo_lento (int): Período para a média móvel lenta.
+            periodo_sinal (int): Período para a linha de sinal.
+        """
+        self._ema_rapida = MediaMovelExponencialIncremental(periodo_rapido)
+        self._ema_lenta = MediaMovelExponencialIncremental(periodo_lento)
+        self._ema_sinal = MediaMovelExponencialIncremental(periodo_sinal)
+        self.valor = (math.nan, math.nan, math.nan)
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço.
+        
+        Args:
+            preco (float): Novo preço.
+        
+        Returns:
+            tuple: (MACD, Sinal, Histograma)
+        """
+        macd_linha = self._ema_rapida.atualizar(preco) - self._ema_lenta.atualizar(preco)
+        sinal = self._ema_sinal.atualizar(macd_linha)
+        self.valor = (macd_linha, sinal, macd_linha - sinal)
+        return self.valor
+
+class RSIIncremental:
+    """
+    RSI incremental.
+    
+    Equivale a IndicadoresTecnicos.rsi (médias simples de ganhos e perdas).
+    """
+    
+    def __init__(self, periodo=14):
+        """
+        Args:
+            periodo (int): Período para cálculo do RSI.
+        """
+        self.periodo = periodo
+        self._ganhos = _JanelaMovel(periodo, centralizar=False)
+        self._perdas = _JanelaMovel(periodo, centralizar=False)
+        self._preco_anterior = math.nan
+        self.valor = math.nan
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço.
+        
+        Args:
+            preco (float): Novo preço.
+        
+        Returns:
+            float: Valor atualizado do RSI.
+        """
+        delta = preco - self._preco_anterior
+        self._preco_anterior = preco
+        
+        # NaN (primeira barra) entra nas duas janelas, como no diff do pandas
+        self._ganhos.adicionar(delta if math.isnan(delta) else max(delta, 0.0))
+        self._perdas.adicionar(delta if math.isnan(delta) else abs(min(delta, 0.0)))
+        
+        media_ganhos = self._ganhos.media()
+        media_perdas = self._perdas.media()
+        
+        if math.isnan(media_ganhos) or math.isnan(media_perdas):
+            self.valor = math.nan
+        else:
+            rs = _dividir(media_ganhos, media_perdas)
+            self.valor = 100 - (100 / (1 + rs))
+        return self.valor
+
+class BandasBollingerIncremental:
+    """
+    Bandas de Bollinger incrementais.
+    
+    Equivale a IndicadoresTecnicos.bandas_bollinger.
+    """
+    
+    def __init__(self, periodo=20, desvios=2):
+        """
+        Args:
+            periodo (int): Período para cálculo da média móvel.
+            desvios (int): Número de desvios padrão para as bandas.
+        """
+        self.periodo = periodo
+        self.desvios = desvios
+        self._janela = _JanelaMovel(periodo)
+        self.valor = (math.nan, math.nan, math.nan)
+    
+    def atualizar(self, preco):
+        """
+        Processa um novo preço.
+        
+        Args:
+            preco (float): Novo preço.
+        
+        Returns:
+            tuple: (Banda Superior, Média Móvel, Banda Inferior)
+        """
+        self._janela.adicionar(preco)
+        media_movel = self._janela.media()
+        desvio_padrao = self._janela.desvio_padrao()
+        
+        self.valor = (
+            media_movel + (desvio_padrao * self.desvios),
+            media_movel,
+            media_movel - (desvio_padrao * self.desvios)
+        )
+        return self.valor
+
+class EstocasticoIncremental:
+    """
+    Oscilador Estocástico incremental.
+    
+    Equivale a IndicadoresTecnicos.estocastico.
+    """
+    
+    def __init__(self, periodo_k=14, periodo_d=3):
+        """
+        Args:
+            periodo_k (int): Período para cálculo do %K.
+            periodo_d (int): Período para cálculo do %D.
+        """
+        self._minimo = _ExtremoMovel(periodo_k, maximo=False)
+        self._maximo = _ExtremoMovel(periodo_k, maximo=True)
+        self._media_k = _JanelaMovel(periodo_d)
+        self.valor = (math.nan, math.nan)
+    
+    def atualizar(self, high, low, close):
+        """
+        Processa uma nova barra.
+        
+        Args:
+            high (float): Preço máximo da barra.
+            low (float): Preço mínimo da barra.
+            close (float): Preço de fechamento da barra.
+        
+        Returns:
+            tuple: (%K, %D)
+        """
+        minimo_periodo = self._minimo.adicionar(low)
+        maximo_periodo = self._maximo.adicionar(high)
+        
+        k = 100 * _dividir(close - minimo_periodo, maximo_periodo - minimo_periodo)
+        self._media_k.adicionar(k)
+        
+        self.valor = (k, self._media_k.media())
+        return self.valor
+
+class ATRIncremental:
+    """
+    ATR (Average True Range) incremental.
+    
+    Equivale a IndicadoresTecnicos.atr.
+    """
+    
+    def __init__(self, periodo=14):
+        """
+        Args:
+            periodo (int): Período para cálculo do ATR.
+        """
+        self.periodo = periodo
+        self._janela = _JanelaMovel(periodo)
+        self._close_anterior = math.nan
+        self.valor = math.nan
+    
+    def atualizar(self, high, low, close):
+        """
+        Processa uma nova barra.
+        
+        Args:
+            high (float): Preço máximo da barra.
+            low (float): Preço mínimo da barra.
+            close (float): Preço de fechamento da barra.
+        
+        Returns:
+            float: Valor atualizado do ATR.
+        """
+        # True Range (sem fechamento anterior, vale apenas high - low)
+        faixas = [high - low, abs(high - self._close_anterior), abs(low - self._close_anterior)]
+        faixas = [f for f in faixas if not math.isnan(f)]
+        tr = max(faixas) if faixas else math.nan
+        self._close_anterior = close
+        
+        self._janela.adicionar(tr)
+        self.valor = self._janela.media()
+        return self.valor
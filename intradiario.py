@@ -0,0 +1,283 @@
+"""
+Módulo de Barras Intradiárias para o Robô Trader
+
+Este módulo reúne o suporte a barras de 1 e 5 minutos (e demais intervalos
+intradiários) usado pelo backtesting e pelos carregadores de dados:
+conversão e inferência do intervalo das barras, fator de anualização de
+acordo com o intervalo e a duração do pregão, limites de sessão (última
+barra de cada pregão) e reamostragem vetorizada de barras finas em barras
+mais longas.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Intervalos no formato do Yahoo Finance e a duração correspondente
+INTERVALOS = {
+    '1m': pd.Timedelta(minutes=1),
+    '2m': pd.Timedelta(minutes=2),
+    '5m': pd.Timedelta(minutes=5),
+    '15m': pd.Timedelta(minutes=15),
+    '30m': pd.Timedelta(minutes=30),
+    '60m': pd.Timedelta(minutes=60),
+    '90m': pd.Timedelta(minutes=90),
+    '1h': pd.Timedelta(hours=1),
+    '1d': pd.Timedelta(days=1),
+    '5d': pd.Timedelta(days=5),
+    '1wk': pd.Timedelta(weeks=1),
+    '1mo': pd.Timedelta(days=30)
+}
+
+# Horário do pregão regular (início, fim), no horário local da bolsa
+SESSAO_PADRAO = ('10:00', '17:00')
+
+# Fuso horário da bolsa, em que o horário do pregão é definido
+FUSO_BOLSA = 'America/Sao_Paulo'
+
+# Dias de pregão por ano, usados na anualização
+DIAS_POR_ANO = 252
+
+_NANOSSEGUNDOS_DIA = 86_400_000_000_000
+
+# 1970-01-01 foi uma quinta-feira: a primeira segunda-feira da época fica 4 dias depois
+_SEGUNDA_FEIRA = 4 * _NANOSSEGUNDOS_DIA
+
+def converter_intervalo(intervalo):
+    """
+    Converte um intervalo ('1m', '5m', '1d', '5min', Timedelta...) em Timedelta.
+    
+    Args:
+        intervalo (str ou pandas.Timedelta): Intervalo das barras.
+    
+    Returns:
+        pandas.Timedelta: Duração de uma barra.
+    """
+    if isinstance(intervalo, str) and intervalo in INTERVALOS:
+        return INTERVALOS[intervalo]
+    return pd.Timedelta(intervalo)
+
+def inferir_intervalo(indice):
+    """
+    Infere o intervalo das barras a partir do índice de datas.
+    
+    Usa a mediana das diferenças entre barras consecutivas, que ignora as
+    lacunas entre pregões, fins de semana e feriados.
+    
+    Args:
+        indice (pandas.Index): Índice dos dados.
+    
+    Returns:
+        pandas.Timedelta: Intervalo inferido (None se o índice não for de datas
+            ou tiver menos de 2 barras).
+    """
+    if not isinstance(indice, pd.DatetimeIndex) or len(indice) < 2:
+        return None
+    diferencas = np.diff(indice.as_unit('ns').asi8)
+    return pd.Timedelta(int(np.median(diferencas)), unit='ns')
+
+def _duracao_sessao(sessao):
+    """
+    Duração do pregão (fim - início).
+    """
+    inicio, fim = (pd.Timedelta(f'{horario}:00') for horario in sessao)
+    return fim - inicio
+
+def eh_intradiario(intervalo):
+    """
+    Indica se o intervalo é menor que um dia.
+    
+    Args:
+        intervalo (str ou pandas.Timedelta): Intervalo das barras (None: diário).
+    
+    Returns:
+        bool: True para barras intradiárias.
+    """
+    return intervalo is not None and converter_intervalo(intervalo) < pd.Timedelta(days=1)
+
+def periodos_por_ano(intervalo, sessao=SESSAO_PADRAO):
+    """
+    Calcula o número de barras por ano, usado para anualizar o Sharpe Ratio.
+    
+    Barras diárias contam 252 por ano; barras intradiárias, 252 vezes o
+    número de barras de um pregão.
+    
+    Args:
+        intervalo (str ou pandas.Timedelta): Intervalo das barras (None: diário).
+        sessao (tuple): Horário do pregão (início, fim), ex: ('10:00', '17:00').
+    
+    Returns:
+        float: Barras por ano.
+    """
+    if intervalo is None:
+        return DIAS_POR_ANO
+    duracao = converter_intervalo(intervalo)
+    
+    if duracao >= pd.Timedelta(days=28):
+        return 12
+    if duracao >= pd.Timedelta(weeks=1):
+        return 52
+    if duracao >= pd.Timedelta(days=1):
+        return DIAS_POR_ANO / (duracao / pd.Timedelta(days=1))
+    return DIAS_POR_ANO * math.ceil(_duracao_sessao(sessao) / duracao)
+
+def _horario_local(indice):
+    """
+    Datas do índice no horário local (de parede), em nanossegundos.
+    """
+    if indice.tz is not None:
+        indice = indice.tz_localize(None)
+    return indice.as_unit('ns').asi8
+
+def fins_sessao(indice):
+    """
+    Marca a última barra de cada pregão.
+    
+    Cada dia do calendário (no horário local) é um pregão; a última barra do
+    histórico também é marcada.
+    
+    Args:
+        indice (pandas.DatetimeIndex): Índice dos dados, em ordem crescente.
+    
+    Returns:
+        numpy.ndarray: Array booleano com uma posição por barra.
+    """
+    dias = _horario_local(indice) // _NANOSSEGUNDOS_DIA
+    fins = np.ones(len(dias), dtype=bool)
+    fins[:-1] = dias[1:] != dias[:-1]
+    return fins
+
+def filtrar_sessao(dados, sessao=SESSAO_PADRAO):
+    """
+    Mantém apenas as barras dentro do pregão regular (início <= horário < fim).
+    
+    Args:
+        dados (pandas.DataFrame): DataFrame com índice de datas.
+        sessao (tuple): Horário do pregão (início, fim).
+    
+    Returns:
+        pandas.DataFrame: Barras do pregão regular.
+    """
+    inicio, fim = (pd.Timedelta(f'{horario}:00').value for horario in sessao)
+    horarios = _horario_local(dados.index) % _NANOSSEGUNDOS_DIA
+    return dados[(horarios >= inicio) & (horarios < fim)]
+
+def proximo_fechamento(data, sessao=SESSAO_PADRAO):
+    """
+    Calcula o primeiro fechamento de pregão (dia útil) posterior a uma data.
+    
+    Args:
+        data (pandas.Timestamp): Data no horário local (de parede) da bolsa.
+        sessao (tuple): Horário do pregão (início, fim).
+    
+    Returns:
+        pandas.Timestamp: Data e hora do fechamento, no horário local.
+    """
+    data = pd.Timestamp(data)
+    if data.tz is not None:
+        data = data.tz_localize(None)
+    dia = data.normalize()
+    fechamento = pd.Timedelta(f'{sessao[1]}:00')
+    if dia.dayofweek < 5 and data < dia + fechamento:
+        return dia + fechamento
+    return dia + pd.offsets.BDay(1) + fechamento
+
+def reamostrar(dados, intervalo, sessao=SESSAO_PADRAO):
+    """
+    Agrega barras OHLCV em barras de um intervalo maior.
+    
+    Os grupos são calculados diretamente sobre as datas em nanossegundos e
+    agregados com reduções segmentadas do NumPy (reduceat), em uma passada
+    por coluna e sem criar grupos vazios (noites, fins de semana). Barras
+    intradiárias são alinhadas ao início do pregão (ex: 10:00, 10:05...) e
+    nunca atravessam a virada do dia; barras semanais começam na
+    segunda-feira e barras mensais ('1mo') seguem os meses do calendário.
+    Cada barra é rotulada pelo seu início.
+    
+    Args:
+        dados (pandas.DataFrame): Dados OHLCV com índice de datas em ordem crescente.
+        intervalo (str ou pandas.Timedelta): Intervalo de destino (ex: '5m', '15m', '1d').
+        sessao (tuple): Horário do pregão (início, fim), usado no alinhamento.
+    
+    Returns:
+        pandas.DataFrame: Dados OHLCV no novo intervalo (colunas extras
+            recebem o último valor de cada barra).
+    
+    Raises:
+        ValueError: Para intervalos de mais de um dia que não sejam semanas
+            inteiras nem meses (ex: '5d').
+    """
+    duracao = converter_intervalo(intervalo).value
+    mensal = intervalo == '1mo'
+    if duracao > _NANOSSEGUNDOS_DIA and not mensal and duracao % (7 * _NANOSSEGUNDOS_DIA):
+        raise ValueError(f"Intervalo '{intervalo}' não suportado: use barras intradiárias, diárias, semanais ou '1mo'.")
+    if len(dados) == 0:
+        return dados.copy()
+    
+    horarios = _horario_local(dados.index)
+    if duracao < _NANOSSEGUNDOS_DIA:
+        ancora = pd.Timedelta(f'{sessao[0]}:00').value
+        dias = horarios // _NANOSSEGUNDOS_DIA
+        inicio_dia = dias * _NANOSSEGUNDOS_DIA
+        inicio_barra = inicio_dia + ancora + (horarios - inicio_dia - ancora) // duracao * duracao
+        inicio_barra = np.maximum(inicio_barra, inicio_dia)
+    elif mensal:
+        inicio_barra = horarios.view('datetime64[ns]').astype('datetime64[M]').astype('datetime64[ns]').view(np.int64)
+    else:
+        # Dias inteiros e semanas iniciadas na segunda-feira
+        inicio_barra = (horarios - _SEGUNDA_FEIRA) // duracao * duracao + _SEGUNDA_FEIRA
+    
+    inicios = np.flatnonzero(np.diff(inicio_barra)) + 1
+    inicios = np.concatenate(([0], inicios))
+    fins = np.append(inicios[1:], len(dados)) - 1
+    
+    agregacoes = {
+        'open': lambda valores: valores[inicios],
+        'high': lambda valores: np.maximum.reduceat(valores, inicios),
+        'low': lambda valores: np.minimum.reduceat(valores, inicios),
+        'close': lambda valores: valores[fins],
+        'volume': lambda valores: np.add.reduceat(valores, inicios)
+    }
+    colunas = {
+        coluna: agregacoes.get(coluna, lambda valores: valores[fins])(dados[coluna].to_numpy())
+        for coluna in dados.columns
+    }
+    
+    # Rótulo: início da barra, com o mesmo fuso do índice original
+    indice = dados.index[inicios] - pd.to_timedelta(horarios[inicios] - inicio_barra[inicios], unit='ns')
+    return pd.DataFrame(colunas, index=indice)
+
+def horarios_sessao(intervalo, sessao=SESSAO_PADRAO):
+    """
+    Calcula o horário de início de cada barra de um pregão.
+    
+    Args:
+        intervalo (str ou pandas.Timedelta): Intervalo das barras.
+        sessao (tuple): Horário do pregão (início, fim).
+    
+    Returns:
+        numpy.ndarray: Deslocamentos (nanossegundos int64) em relação à meia-noite.
+    """
+    duracao = converter_intervalo(intervalo)
+    inicio = pd.Timedelta(f'{sessao[0]}:00')
+    return inicio.value + duracao.value * np.arange(math.ceil(_duracao_sessao(sessao) / duracao), dtype=np.int64)
+
+def gerar_indice_sessoes(dias, intervalo, sessao=SESSAO_PADRAO, data_final=None):
+    """
+    Gera as datas das barras de `dias` pregões (dias úteis) consecutivos.
+    
+    Args:
+        dias (int): Número de pregões.
+        intervalo (str ou pandas.Timedelta): Intervalo das barras.
+        sessao (tuple): Horário do pregão (início, fim).
+        data_final (datetime): Data do último pregão (padrão: hoje).
+    
+    Returns:
+        pandas.DatetimeIndex: Datas de início de cada barra.
+    """
+    datas = pd.bdate_range(end=pd.Timestamp(data_final or 'today').normalize(), periods=dias)
+    horarios = horarios_sessao(intervalo, sessao)
+    
+    valores = datas.as_unit('ns').asi8[:, np.newaxis] + horarios[np.newaxis, :]
+    return pd.DatetimeIndex(valores.ravel().view('datetime64[ns]'))
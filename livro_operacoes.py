@@ -0,0 +1,130 @@
+"""
+Módulo do Livro de Operações para o Robô Trader
+
+Este módulo define o formato colunar em que o backtesting registra as
+operações: um array estruturado do NumPy (um registro por operação, com
+campos de tipo fixo), no lugar de uma lista de dicionários. Tipo e motivo
+de saída são guardados como códigos de 1 byte e só viram texto na hora de
+montar relatórios (tabela_operacoes).
+"""
+
+import numpy as np
+import pandas as pd
+from .simulacao import MOTIVOS_SAIDA
+
+# Tipos de operação, pelo código gravado no campo 'tipo'
+TIPOS_OPERACAO = {1: 'Compra', -1: 'Venda'}
+
+def _valores_datas(datas):
+    """
+    Converte datas (Index ou array) em um array NumPy de tipo fixo.
+    
+    Datas com fuso horário são guardadas em UTC (datetime64 sem fuso).
+    """
+    if isinstance(datas, pd.DatetimeIndex):
+        return datas.tz_convert(None).to_numpy() if datas.tz is not None else datas.to_numpy()
+    return np.asarray(datas)
+
+def tipo_livro(tipo_datas, extras=()):
+    """
+    Monta o dtype estruturado do livro de operações.
+    
+    Args:
+        tipo_datas (numpy.dtype): Tipo das datas de entrada e saída (ex: datetime64[ns] ou int64).
+        extras (list): Campos adicionais, como tuplas (nome, dtype), após os campos padrão.
+    
+    Returns:
+        numpy.dtype: Tipo estruturado com um campo por coluna do livro.
+    """
+    return np.dtype([
+        ('data_entrada', tipo_datas),
+        ('data_saida', tipo_datas),
+        ('tipo', np.int8),
+        ('preco_entrada', np.float64),
+        ('preco_saida', np.float64),
+        ('resultado', np.float64),
+        ('motivo_saida', np.int8),
+        *extras
+    ])
+
+def criar_livro(datas_entrada, datas_saida, tipos, precos_entrada, precos_saida, resultados, motivos_saida,
+                **extras):
+    """
+    Cria o livro de operações a partir de colunas já calculadas.
+    
+    Colunas adicionais (ex: o ativo de cada operação em uma carteira) são
+    passadas por nome e viram campos extras, com o tipo dos próprios valores.
+    
+    Args:
+        datas_entrada (array-like): Data de entrada de cada operação.
+        datas_saida (array-like): Data de saída de cada operação.
+        tipos (array-like): 1 para compra, -1 para venda.
+        precos_entrada (array-like): Preço de entrada.
+        precos_saida (array-like): Preço de saída.
+        resultados (array-like): Resultado líquido da operação (percentual).
+        motivos_saida (array-like): Índice do motivo de saída em MOTIVOS_SAIDA.
+        **extras (array-like): Colunas adicionais do livro.
+    
+    Returns:
+        numpy.ndarray: Array estruturado com uma linha por operação.
+    """
+    datas_entrada = _valores_datas(datas_entrada)
+    extras = {nome: np.asarray(valores) for nome, valores in extras.items()}
+    campos_extras = [(nome, valores.dtype) for nome, valores in extras.items()]
+    livro = np.empty(len(datas_entrada), dtype=tipo_livro(datas_entrada.dtype, campos_extras))
+    livro['data_entrada'] = datas_entrada
+    livro['data_saida'] = _valores_datas(datas_saida)
+    livro['tipo'] = tipos
+    livro['preco_entrada'] = precos_entrada
+    livro['preco_saida'] = precos_saida
+    livro['resultado'] = resultados
+    livro['motivo_saida'] = motivos_saida
+    for nome, valores in extras.items():
+        livro[nome] = valores
+    return livro
+
+def livro_de_dicionarios(operacoes, indice=None):
+    """
+    Converte uma lista de operações em dicionários (formato do laço original) em livro.
+    
+    Args:
+        operacoes (list): Dicionários com as chaves do livro, com 'tipo' e
+            'motivo_saida' em texto.
+        indice (pandas.Index): Índice dos dados, que define o tipo das datas quando a lista está vazia.
+    
+    Returns:
+        numpy.ndarray: Livro de operações.
+    """
+    codigos_tipo = {nome: codigo for codigo, nome in TIPOS_OPERACAO.items()}
+    if not operacoes:
+        tipo_datas = _valores_datas(indice[:0]).dtype if indice is not None else np.int64
+        return np.empty(0, dtype=tipo_livro(tipo_datas))
+    
+    return criar_livro(
+        pd.Index([op['data_entrada'] for op in operacoes]),
+        pd.Index([op['data_saida'] for op in operacoes]),
+        [codigos_tipo[op['tipo']] for op in operacoes],
+        [op['preco_entrada'] for op in operacoes],
+        [op['preco_saida'] for op in operacoes],
+        [op['resultado'] for op in operacoes],
+        [MOTIVOS_SAIDA.index(op['motivo_saida']) for op in operacoes]
+    )
+
+def tabela_operacoes(livro, fuso=None):
+    """
+    Monta a tabela legível do livro, com tipo e motivo de saída em texto.
+    
+    Args:
+        livro (numpy.ndarray): Livro de operações.
+        fuso (str ou tzinfo): Fuso horário das datas originais (None: datas sem fuso).
+    
+    Returns:
+        pandas.DataFrame: Uma linha por operação, com as colunas do livro.
+    """
+    tabela = pd.DataFrame(livro)
+    if fuso is not None:
+        for coluna in ('data_entrada', 'data_saida'):
+            tabela[coluna] = tabela[coluna].dt.tz_localize('UTC').dt.tz_convert(fuso)
+    tabela['tipo'] = tabela['tipo'].map(TIPOS_OPERACAO)
+    tabela['motivo_saida'] = np.asarray(MOTIVOS_SAIDA, dtype=object)[livro['motivo_saida']]
+    return tabela
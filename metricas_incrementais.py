@@ -0,0 +1,241 @@
+"""
+Módulo de Métricas Incrementais para o Robô Trader
+
+Este módulo acumula as métricas de desempenho do backtesting em uma única
+passada, à medida que a simulação avança: média e variância dos retornos
+por barra (algoritmo de Welford), pico e drawdown máximo correntes e
+contagens e somas de operações ganhadoras e perdedoras.
+
+O estado fica em um vetor float64 de tamanho fixo, atualizado pelas funções
+_atualizar_capital, _repetir_capital e _registrar_operacao. Elas são
+compiladas com numba quando disponível e chamadas pelo núcleo de simulação
+(ver simulacao); MetricasIncrementais embala o vetor e devolve as métricas
+a qualquer momento, inclusive durante uma simulação longa, a partir de
+outra thread.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Posições do vetor de estado
+BARRAS, MEDIA, M2, CAPITAL, PICO, MAX_DRAWDOWN, OPERACOES, GANHADORAS, GANHOS, PERDAS = range(10)
+TAMANHO_ESTADO = 10
+
+def _atualizar_capital(estado, capital):
+    """
+    Acumula o capital de uma nova barra.
+    
+    Returns:
+        float: Drawdown da barra (percentual, em relação ao pico).
+    """
+    anterior = estado[CAPITAL]
+    retorno = capital / anterior - 1 if anterior != 0 else math.nan
+    estado[BARRAS] += 1
+    delta = retorno - estado[MEDIA]
+    estado[MEDIA] += delta / estado[BARRAS]
+    estado[M2] += delta * (retorno - estado[MEDIA])
+    
+    estado[CAPITAL] = capital
+    if capital > estado[PICO]:
+        estado[PICO] = capital
+    drawdown = (capital - estado[PICO]) / estado[PICO] * 100 if estado[PICO] != 0 else math.nan
+    if drawdown < estado[MAX_DRAWDOWN]:
+        estado[MAX_DRAWDOWN] = drawdown
+    return drawdown
+
+def _repetir_capital(estado, barras):
+    """
+    Acumula `barras` barras seguidas sem variação de capital (retorno nulo).
+    """
+    if barras <= 0:
+        return
+    total = estado[BARRAS] + barras
+    delta = -estado[MEDIA]
+    estado[M2] += delta * delta * estado[BARRAS] * barras / total
+    estado[MEDIA] += delta * barras / total
+    estado[BARRAS] = total
+
+def _registrar_operacao(estado, resultado):
+    """
+    Acumula o resultado líquido (percentual) de uma operação encerrada.
+    """
+    estado[OPERACOES] += 1
+    if resultado > 0:
+        estado[GANHADORAS] += 1
+        estado[GANHOS] += resultado
+    else:
+        estado[PERDAS] += resultado
+
+if numba is not None:
+    _atualizar_capital = numba.njit(cache=True, nogil=True)(_atualizar_capital)
+    _repetir_capital = numba.njit(cache=True, nogil=True)(_repetir_capital)
+    _registrar_operacao = numba.njit(cache=True, nogil=True)(_registrar_operacao)
+
+class MetricasIncrementais:
+    """
+    Acumulador das métricas de desempenho de um backtest.
+    """
+    
+    def __init__(self, capital_inicial=10000.0, periodos_por_ano=252):
+        """
+        Inicializa o acumulador.
+        
+        Args:
+            capital_inicial (float): Capital inicial da simulação (primeira barra).
+            periodos_por_ano (float): Barras por ano, usado na anualização do Sharpe Ratio
+                (ver intradiario.periodos_por_ano).
+        """
+        self.capital_inicial = capital_inicial
+        self.periodos_por_ano = periodos_por_ano
+        self.estado = np.zeros(TAMANHO_ESTADO)
+        self.estado[CAPITAL] = capital_inicial
+        self.estado[PICO] = capital_inicial
+    
+    @property
+    def barras_processadas(self):
+        """int: Número de barras acumuladas, além da inicial."""
+        return int(self.estado[BARRAS])
+    
+    def atualizar(self, capital):
+        """
+        Acumula o capital de uma nova barra.
+        
+        Args:
+            capital (float): Capital ao fim da barra.
+        
+        Returns:
+            float: Drawdown da barra (percentual).
+        """
+        return _atualizar_capital(self.estado, float(capital))
+    
+    def registrar_operacao(self, resultado):
+        """
+        Acumula uma operação encerrada.
+        
+        Args:
+            resultado (float): Resultado líquido da operação (percentual).
+        """
+        _registrar_operacao(self.estado, float(resultado))
+    
+    def atualizar_lote(self, capitais):
+        """
+        Acumula o capital de várias barras seguidas com operações vetorizadas.
+        
+        As estatísticas do lote são combinadas às acumuladas com a fórmula de
+        Chan et al., de modo que lotes consecutivos (por exemplo, trechos de
+        um histórico processado em partes) equivalem a uma única passada.
+        
+        Args:
+            capitais (array-like): Capital ao fim de cada barra.
+        
+        Returns:
+            numpy.ndarray: Drawdown (percentual) de cada barra.
+        """
+        capitais = np.asarray(capitais, dtype=np.float64)
+        if len(capitais) == 0:
+            return np.empty(0)
+        estado = self.estado
+        
+        anteriores = np.empty_like(capitais)
+        anteriores[0] = estado[CAPITAL]
+        anteriores[1:] = capitais[:-1]
+        retornos = capitais / anteriores - 1
+        
+        barras_lote = len(retornos)
+        media_lote = retornos.mean()
+        m2_lote = np.sum((retornos - media_lote) ** 2)
+        total = estado[BARRAS] + barras_lote
+        delta = media_lote - estado[MEDIA]
+        estado[M2] += m2_lote + delta * delta * estado[BARRAS] * barras_lote / total
+        estado[MEDIA] += delta * barras_lote / total
+        estado[BARRAS] = total
+        
+        pico = np.maximum(np.maximum.accumulate(capitais), estado[PICO])
+        drawdown = (capitais - pico) / pico * 100
+        estado[MAX_DRAWDOWN] = min(estado[MAX_DRAWDOWN], drawdown.min())
+        estado[PICO] = pico[-1]
+        estado[CAPITAL] = capitais[-1]
+        return drawdown
+    
+    def registrar_operacoes(self, resultados):
+        """
+        Acumula várias operações encerradas com operações vetorizadas.
+        
+        Args:
+            resultados (array-like): Resultado líquido de cada operação (percentual).
+        """
+        resultados = np.asarray(resultados, dtype=np.float64)
+        ganhadoras = resultados > 0
+        self.estado[OPERACOES] += len(resultados)
+        self.estado[GANHADORAS] += np.count_nonzero(ganhadoras)
+        self.estado[GANHOS] += resultados[ganhadoras].sum()
+        self.estado[PERDAS] += resultados[~ganhadoras].sum()
+    
+    def instantaneo(self):
+        """
+        Calcula as métricas de desempenho a partir do estado acumulado.
+        
+        Pode ser chamado durante a simulação para acompanhar o progresso;
+        nesse caso, o resultado reflete as barras processadas até o momento.
+        
+        Returns:
+            dict: Métricas no formato de Backtesting._calcular_metricas (sem os históricos).
+        """
+        estado = self.estado.copy()
+        capital_final = estado[CAPITAL]
+        retorno_total = (capital_final / self.capital_inicial - 1) * 100
+        
+        total_operacoes = int(estado[OPERACOES])
+        if total_operacoes > 0:
+            operacoes_ganhadoras = int(estado[GANHADORAS])
+            operacoes_perdedoras = total_operacoes - operacoes_ganhadoras
+            
+            win_rate = (operacoes_ganhadoras / total_operacoes) * 100
+            
+            ganhos = estado[GANHOS]
+            perdas = abs(estado[PERDAS])
+            
+            profit_factor = ganhos / perdas if perdas > 0 else float('inf')
+            
+            media_ganhos = ganhos / operacoes_ganhadoras if operacoes_ganhadoras > 0 else 0
+            media_perdas = perdas / operacoes_perdedoras if operacoes_perdedoras > 0 else 0
+            
+            expectativa = (win_rate / 100 * media_ganhos) - ((100 - win_rate) / 100 * media_perdas)
+        else:
+            operacoes_ganhadoras = 0
+            operacoes_perdedoras = 0
+            win_rate = 0
+            profit_factor = 0
+            media_ganhos = 0
+            media_perdas = 0
+            expectativa = 0
+        
+        # Desvio padrão populacional dos retornos por barra (como np.std)
+        desvio = np.sqrt(estado[M2] / estado[BARRAS]) if estado[BARRAS] > 0 else np.float64(np.nan)
+        volatilidade = desvio * 100
+        
+        # Sharpe Ratio (assumindo retorno livre de risco de 0%)
+        sharpe_ratio = (estado[MEDIA] / desvio) * np.sqrt(self.periodos_por_ano) if desvio > 0 else 0
+        
+        return {
+            'capital_inicial': self.capital_inicial,
+            'capital_final': capital_final,
+            'retorno_total': retorno_total,
+            'total_operacoes': total_operacoes,
+            'operacoes_ganhadoras': operacoes_ganhadoras,
+            'operacoes_perdedoras': operacoes_perdedoras,
+            'win_rate': win_rate,
+            'profit_factor': profit_factor,
+            'media_ganhos': media_ganhos,
+            'media_perdas': media_perdas,
+            'expectativa': expectativa,
+            'max_drawdown': estado[MAX_DRAWDOWN],
+            'volatilidade': volatilidade,
+            'sharpe_ratio': sharpe_ratio
+        }
@@ -0,0 +1,150 @@
+"""
+Módulo de Análise Monte Carlo para o Robô Trader
+
+Este módulo avalia a robustez de um backtest reamostrando a sequência de
+operações: em vez de um único drawdown máximo e capital final, obtém-se a
+distribuição dessas métricas sobre dezenas de milhares de sequências
+alternativas, com intervalos de confiança e o risco de ruína.
+
+Todas as sequências de um lote são calculadas de uma vez, como uma matriz
+(simulações x operações), em espaço logarítmico: o capital acumulado é a
+soma cumulativa dos logaritmos dos fatores de capital de cada operação.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Métodos de reamostragem aceitos
+METODOS_REAMOSTRAGEM = ('bootstrap', 'embaralhar')
+
+class AnaliseMonteCarlo:
+    """
+    Classe que implementa a reamostragem Monte Carlo das operações de um backtest.
+    """
+    
+    @staticmethod
+    def fatores_capital(operacoes, risco_por_operacao=1.0):
+        """
+        Calcula o fator pelo qual cada operação multiplicou o capital.
+        
+        Segue a regra de Backtesting: o capital é multiplicado por
+        1 + resultado * risco_por_operacao / 100, com o resultado líquido da
+        operação em percentual.
+        
+        Args:
+            operacoes (numpy.ndarray ou list): Livro de operações de Backtesting ou
+                lista de dicionários com a chave 'resultado'.
+            risco_por_operacao (float): Percentual do capital arriscado por operação no backtest.
+        
+        Returns:
+            numpy.ndarray: Fator de capital de cada operação.
+        """
+        if isinstance(operacoes, np.ndarray):
+            resultados = operacoes['resultado'].astype(np.float64)
+        else:
+            resultados = np.fromiter((op['resultado'] for op in operacoes), dtype=np.float64, count=len(operacoes))
+        return 1 + resultados * risco_por_operacao / 100
+    
+    @staticmethod
+    def _simular_lote(log_fatores, simulacoes, metodo, rng):
+        """
+        Gera um lote de sequências reamostradas e calcula suas métricas.
+        
+        Returns:
+            tuple: (log do capital final, log do menor capital, log do maior
+                recuo em relação ao pico), um valor por simulação.
+        """
+        total = len(log_fatores)
+        if metodo == 'bootstrap':
+            sequencias = log_fatores[rng.integers(0, total, size=(simulacoes, total))]
+        else:
+            sequencias = rng.permuted(np.broadcast_to(log_fatores, (simulacoes, total)), axis=1)
+        
+        # Capital acumulado (em log, relativo ao inicial), com o ponto de partida 0 na primeira coluna
+        acumulado = np.zeros((simulacoes, total + 1))
+        np.cumsum(sequencias, axis=1, out=acumulado[:, 1:])
+        
+        recuo = np.min(acumulado - np.maximum.accumulate(acumulado, axis=1), axis=1)
+        return acumulado[:, -1], acumulado.min(axis=1), recuo
+    
+    @staticmethod
+    def simular(operacoes, capital_inicial=10000.0, risco_por_operacao=1.0, simulacoes=10000, metodo='bootstrap',
+                nivel_confianca=0.95, limite_ruina=50.0, semente=None, tamanho_lote=5000):
+        """
+        Reamostra as operações de um backtest e calcula a distribuição das métricas.
+        
+        No método 'bootstrap', cada sequência sorteia o mesmo número de
+        operações com reposição; no método 'embaralhar', cada sequência é uma
+        permutação das operações originais (o capital final é sempre o mesmo
+        e apenas o caminho, e portanto o drawdown, muda).
+        
+        Args:
+            operacoes (numpy.ndarray ou list): Operações (resultados['operacoes'] de Backtesting).
+            capital_inicial (float): Capital inicial do backtest.
+            risco_por_operacao (float): Percentual do capital arriscado por operação no backtest.
+            simulacoes (int): Número de sequências reamostradas.
+            metodo (str): 'bootstrap' ou 'embaralhar'.
+            nivel_confianca (float): Nível dos intervalos de confiança (ex: 0.95).
+            limite_ruina (float): Perda percentual do capital inicial considerada ruína.
+            semente (int): Semente do gerador aleatório, para resultados reprodutíveis.
+            tamanho_lote (int): Simulações calculadas por vez (limita a memória a
+                cerca de tamanho_lote * operações * 16 bytes).
+        
+        Returns:
+            dict: Distribuições ('capital_final', 'max_drawdown', 'retorno_total'),
+                'risco_ruina' (percentual das sequências que atingem a ruína) e
+                'resumo' (DataFrame com valor original, média, mediana e
+                intervalo de confiança de cada métrica).
+        """
+        if metodo not in METODOS_REAMOSTRAGEM:
+            raise ValueError(f"Método de reamostragem '{metodo}' não reconhecido.")
+        
+        fatores = AnaliseMonteCarlo.fatores_capital(operacoes, risco_por_operacao)
+        if len(fatores) == 0:
+            raise ValueError("O backtest não tem operações para reamostrar.")
+        if np.any(fatores <= 0):
+            # Uma operação que zera o capital leva todas as sequências que a contêm à ruína
+            fatores = np.maximum(fatores, np.finfo(np.float64).tiny)
+        log_fatores = np.log(fatores)
+        
+        rng = np.random.default_rng(semente)
+        log_finais = np.empty(simulacoes)
+        log_minimos = np.empty(simulacoes)
+        log_recuos = np.empty(simulacoes)
+        for inicio in range(0, simulacoes, tamanho_lote):
+            fim = min(inicio + tamanho_lote, simulacoes)
+            log_finais[inicio:fim], log_minimos[inicio:fim], log_recuos[inicio:fim] = \
+                AnaliseMonteCarlo._simular_lote(log_fatores, fim - inicio, metodo, rng)
+        
+        distribuicoes = {
+            'capital_final': capital_inicial * np.exp(log_finais),
+            'retorno_total': np.expm1(log_finais) * 100,
+            'max_drawdown': np.expm1(log_recuos) * 100
+        }
+        ruina = log_minimos <= np.log1p(-min(limite_ruina, 100.0) / 100)
+        
+        # Valores da sequência original, para comparação
+        acumulado = np.concatenate(([0.0], np.cumsum(log_fatores)))
+        originais = {
+            'capital_final': capital_inicial * np.exp(acumulado[-1]),
+            'retorno_total': np.expm1(acumulado[-1]) * 100,
+            'max_drawdown': np.expm1(np.min(acumulado - np.maximum.accumulate(acumulado))) * 100
+        }
+        
+        cauda = (1 - nivel_confianca) / 2
+        resumo = pd.DataFrame({
+            metrica: {
+                'original': originais[metrica],
+                'media': valores.mean(),
+                'mediana': np.median(valores),
+                'inferior': np.quantile(valores, cauda),
+                'superior': np.quantile(valores, 1 - cauda)
+            }
+            for metrica, valores in distribuicoes.items()
+        }).T
+        
+        return {
+            **distribuicoes,
+            'risco_ruina': ruina.mean() * 100,
+            'resumo': resumo
+        }
@@ -0,0 +1,270 @@
+"""
+Módulo de Níveis de Suporte e Resistência para o Robô Trader
+
+Este módulo implementa a detecção vetorizada de pivôs (topos e fundos locais)
+e o agrupamento incremental de níveis de preço usado por PriceAction.
+"""
+
+from bisect import bisect_left
+from collections import deque
+
+import numpy as np
+
+def localizar_pivos(valores, maximo=True):
+    """
+    Localiza pivôs (extremos locais estritos) em uma única passada vetorizada.
+    
+    Uma barra é pivô de alta se seu valor é maior que o das duas vizinhas e
+    pivô de baixa se é menor.
+    
+    Args:
+        valores (array-like): Série de preços (máximos para topos, mínimos para fundos).
+        maximo (bool): True para topos (resistências), False para fundos (suportes).
+    
+    Returns:
+        numpy.ndarray: Posições dos pivôs, em ordem crescente.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if len(valores) < 3:
+        return np.empty(0, dtype=np.int64)
+    
+    centro, anterior, posterior = valores[1:-1], valores[:-2], valores[2:]
+    if maximo:
+        pivo = (centro > anterior) & (centro > posterior)
+    else:
+        pivo = (centro < anterior) & (centro < posterior)
+    
+    return np.flatnonzero(pivo) + 1
+
+def multiplicidade_pivos(posicoes, total_barras, periodo):
+    """
+    Conta em quantas janelas deslizantes de `periodo` barras cada pivô aparece.
+    
+    Reproduz o peso que cada pivô tinha quando as janelas [i-periodo, i), para
+    i de `periodo` até o fim, eram varridas uma a uma: o pivô na posição p é
+    visto pelas janelas com i entre p+2 e p+periodo-1.
+    
+    Args:
+        posicoes (numpy.ndarray): Posições dos pivôs.
+        total_barras (int): Número de barras da série.
+        periodo (int): Tamanho da janela.
+    
+    Returns:
+        numpy.ndarray: Número de janelas que contêm cada pivô.
+    """
+    primeira = np.maximum(posicoes + 2, periodo)
+    ultima = np.minimum(posicoes + periodo - 1, total_barras - 1)
+    return np.maximum(ultima - primeira + 1, 0)
+
+class AgrupadorNiveis:
+    """
+    Mantém níveis de preço ordenados e os agrupa de forma incremental.
+    
+    Os níveis são guardados como valores distintos com peso (multiplicidade),
+    o que permite adicionar e remover níveis sem reordenar a coleção. Níveis
+    vizinhos cuja distância relativa não passa de `threshold` pertencem ao
+    mesmo grupo, e cada grupo é representado pela média ponderada de seus
+    níveis, como em PriceAction._agrupar_niveis.
+    """
+    
+    def __init__(self, threshold=0.03):
+        """
+        Args:
+            threshold (float): Limiar percentual para considerar níveis como próximos.
+        """
+        self.threshold = threshold
+        self._valores = []
+        self._pesos = []
+    
+    def __len__(self):
+        return len(self._valores)
+    
+    def adicionar(self, nivel, peso=1):
+        """
+        Adiciona um nível (ou aumenta seu peso, se já existir).
+        
+        Args:
+            nivel (float): Nível de preço.
+            peso (int): Multiplicidade do nível.
+        """
+        posicao = bisect_left(self._valores, nivel)
+        if posicao < len(self._valores) and self._valores[posicao] == nivel:
+            self._pesos[posicao] += peso
+        else:
+            self._valores.insert(posicao, nivel)
+            self._pesos.insert(posicao, peso)
+    
+    def adicionar_varios(self, niveis, pesos=None):
+        """
+        Adiciona vários níveis de uma vez.
+        
+        Args:
+            niveis (array-like): Níveis de preço.
+            pesos (array-like): Multiplicidade de cada nível (padrão: 1).
+        """
+        niveis = np.asarray(niveis, dtype=np.float64)
+        pesos = np.ones(len(niveis), dtype=np.int64) if pesos is None else np.asarray(pesos, dtype=np.int64)
+        
+        distintos, inverso = np.unique(niveis, return_inverse=True)
+        pesos_distintos = np.bincount(inverso, weights=pesos, minlength=len(distintos)).astype(np.int64)
+        
+        if not self._valores:
+            selecionados = pesos_distintos > 0
+            self._valores = distintos[selecionados].tolist()
+            self._pesos = pesos_distintos[selecionados].tolist()
+            return
+        
+        for nivel, peso in zip(distintos.tolist(), pesos_distintos.tolist()):
+            if peso > 0:
+                self.adicionar(nivel, peso)
+    
+    def remover(self, nivel, peso=1):
+        """
+        Remove um nível (ou reduz seu peso).
+        
+        Args:
+            nivel (float): Nível de preço previamente adicionado.
+            peso (int): Multiplicidade a remover.
+        
+        Raises:
+            KeyError: Se o nível não estiver presente.
+        """
+        posicao = bisect_left(self._valores, nivel)
+        if posicao == len(self._valores) or self._valores[posicao] != nivel:
+            raise KeyError(nivel)
+        
+        self._pesos[posicao] -= peso
+        if self._pesos[posicao] <= 0:
+            del self._valores[posicao]
+            del self._pesos[posicao]
+    
+    def _proximo(self, anterior, nivel):
+        return abs(nivel - anterior) / anterior <= self.threshold
+    
+    def menor_grupo(self):
+        """
+        Retorna a média do grupo de níveis mais baixo, sem agrupar os demais.
+        
+        Returns:
+            float: Média do grupo mais baixo (None se não houver níveis).
+        """
+        if not self._valores:
+            return None
+        
+        soma = self._valores[0] * self._pesos[0]
+        total = self._pesos[0]
+        for k in range(1, len(self._valores)):
+            if not self._proximo(self._valores[k-1], self._valores[k]):
+                break
+            soma += self._valores[k] * self._pesos[k]
+            total += self._pesos[k]
+        return soma / total
+    
+    def maior_grupo(self):
+        """
+        Retorna a média do grupo de níveis mais alto, sem agrupar os demais.
+        
+        Returns:
+            float: Média do grupo mais alto (None se não houver níveis).
+        """
+        if not self._valores:
+            return None
+        
+        soma = self._valores[-1] * self._pesos[-1]
+        total = self._pesos[-1]
+        for k in range(len(self._valores) - 1, 0, -1):
+            if not self._proximo(self._valores[k-1], self._valores[k]):
+                break
+            soma += self._valores[k-1] * self._pesos[k-1]
+            total += self._pesos[k-1]
+        return soma / total
+    
+    def niveis(self):
+        """
+        Agrupa os níveis atuais.
+        
+        Returns:
+            list: Médias dos grupos, em ordem crescente.
+        """
+        if not self._valores:
+            return []
+        
+        valores = np.asarray(self._valores)
+        pesos = np.asarray(self._pesos, dtype=np.float64)
+        
+        distancia = np.abs(valores[1:] - valores[:-1]) / valores[:-1]
+        inicios = np.concatenate(([0], np.flatnonzero(distancia > self.threshold) + 1))
+        
+        somas = np.add.reduceat(valores * pesos, inicios)
+        totais = np.add.reduceat(pesos, inicios)
+        return (somas / totais).tolist()
+
+class RastreadorSuporteResistencia:
+    """
+    Mantém os suportes e resistências de uma janela deslizante de barras.
+    
+    A cada barra recebida, o pivô confirmado pela nova barra entra nos
+    agrupadores e os pivôs que saíram da janela são removidos, de modo que o
+    custo por barra depende apenas do número de pivôs na janela.
+    
+    Após `atualizar` ser chamado com a barra t, os níveis refletem os pivôs
+    p da janela [t-periodo+1, t] com ambas as vizinhas dentro da janela.
+    """
+    
+    def __init__(self, periodo=14, threshold=0.03):
+        """
+        Args:
+            periodo (int): Tamanho da janela em barras.
+            threshold (float): Limiar percentual para considerar níveis como próximos.
+        """
+        self.periodo = periodo
+        self.suportes = AgrupadorNiveis(threshold)
+        self.resistencias = AgrupadorNiveis(threshold)
+        self._ultimas = deque(maxlen=3)  # pares (high, low) das últimas barras
+        self._pivos = deque()  # triplas (posição, valor, é_resistência)
+        self._contador = 0
+    
+    def atualizar(self, high, low):
+        """
+        Processa uma nova barra.
+        
+        Args:
+            high (float): Preço máximo da barra.
+            low (float): Preço mínimo da barra.
+        """
+        posicao = self._contador
+        self._contador += 1
+        self._ultimas.append((high, low))
+        
+        # A nova barra confirma (ou não) a barra anterior como pivô
+        primeira_valida = posicao + 2 - self.periodo
+        if len(self._ultimas) == 3 and posicao - 1 >= primeira_valida:
+            (high_a, low_a), (high_b, low_b), (high_c, low_c) = self._ultimas
+            if high_b > high_a and high_b > high_c:
+                self.resistencias.adicionar(high_b)
+                self._pivos.append((posicao - 1, high_b, True))
+            if low_b < low_a and low_b < low_c:
+                self.suportes.adicionar(low_b)
+                self._pivos.append((posicao - 1, low_b, False))
+        
+        # Remover pivôs que saíram da janela
+        while self._pivos and self._pivos[0][0] < primeira_valida:
+            _, valor, resistencia = self._pivos.popleft()
+            if resistencia:
+                self.resistencias.remover(valor)
+            else:
+                self.suportes.remover(valor)
+    
+    def menor_resistencia(self):
+        """
+        Returns:
+            float: Nível da resistência mais baixa (None se não houver).
+        """
+        return self.resistencias.menor_grupo()
+    
+    def maior_suporte(self):
+        """
+        Returns:
+            float: Nível do suporte mais alto (None se não houver).
+        """
+        return self.suportes.maior_grupo()
@@ -0,0 +1,183 @@
+"""
+Módulo de Otimização de Parâmetros para o Robô Trader
+
+Este módulo executa o backtesting de uma estratégia para todas as
+combinações de uma grade de parâmetros, distribuindo os backtests entre os
+núcleos da máquina com um pool de processos. Os dados OHLCV são publicados
+uma única vez em memória compartilhada e lidos pelos processos sem cópia.
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from testes.backtesting import Backtesting
+from testes.dados_compartilhados import DadosCompartilhados
+
+# Resultados de Backtesting.executar_backtest que não seguem para a tabela de ranking
+CAMPOS_DESCARTADOS = ('capital_historico', 'operacoes', 'drawdown', 'posicoes')
+
+# Estado de cada processo de trabalho, criado por _inicializar_trabalhador
+_segmento = None
+_backtest = None
+
+def _inicializar_trabalhador(descritor, capital_inicial, comissao, precisao):
+    """
+    Anexa os dados compartilhados e cria o Backtesting do processo de trabalho.
+    """
+    global _segmento, _backtest
+    _segmento, dados = DadosCompartilhados.anexar(descritor)
+    _backtest = Backtesting(dados, capital_inicial=capital_inicial, comissao=comissao, precisao=precisao)
+
+def _executar_tarefa(tarefa, backtest=None):
+    """
+    Executa um backtest da grade (no Backtesting do processo, se `backtest` for None).
+    
+    Returns:
+        dict: Índice da combinação, parâmetros e métricas resumidas.
+    """
+    indice, estrategia, params, parametros_simulacao = tarefa
+    backtest = backtest or _backtest
+    resultados = backtest.executar_backtest(estrategia, params, **parametros_simulacao)
+    
+    metricas = {chave: valor for chave, valor in resultados.items() if chave not in CAMPOS_DESCARTADOS}
+    return {'combinacao': indice, **params, **metricas}
+
+class OtimizadorParametros:
+    """
+    Otimiza os parâmetros de uma estratégia com backtests em paralelo.
+    """
+    
+    def __init__(self, dados_historicos, capital_inicial=10000.0, comissao=0.0, precisao=None, processos=None):
+        """
+        Inicializa o otimizador.
+        
+        Args:
+            dados_historicos (pandas.DataFrame): DataFrame com dados históricos (OHLCV).
+            capital_inicial (float): Capital inicial para simulação.
+            comissao (float): Valor da comissão por operação (percentual).
+            precisao (str): Precisão dos dados e indicadores ('float64' ou 'float32').
+            processos (int): Número de processos de trabalho (padrão: número de núcleos).
+        """
+        self.dados = dados_historicos
+        self.capital_inicial = capital_inicial
+        self.comissao = comissao
+        self.precisao = precisao
+        self.processos = processos or os.cpu_count() or 1
+    
+    @staticmethod
+    def gerar_combinacoes(grade):
+        """
+        Expande uma grade de parâmetros em todas as suas combinações.
+        
+        Args:
+            grade (dict): Dicionário {parâmetro: lista de valores}. Valores que
+                não são listas, tuplas ou ranges são mantidos fixos.
+        
+        Returns:
+            list: Lista de dicionários `params`, no formato aceito por Backtesting._gerar_sinais.
+        """
+        nomes = list(grade)
+        valores = [
+            list(valor) if isinstance(valor, (list, tuple, range)) else [valor]
+            for valor in grade.values()
+        ]
+        return [dict(zip(nomes, combinacao)) for combinacao in itertools.product(*valores)]
+    
+    def iterar(self, estrategia, grade, risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, modo='barras',
+               encerrar_sessao=False, trailing_stop=0.0):
+        """
+        Executa os backtests da grade e devolve cada resultado assim que fica pronto.
+        
+        As combinações são distribuídas em lotes contíguos, de modo que
+        combinações vizinhas (que compartilham indicadores) caiam no mesmo
+        processo e reaproveitem o cache de indicadores dele.
+        
+        Args:
+            estrategia (str): Nome da estratégia (ver Backtesting._gerar_sinais).
+            grade (dict): Grade de parâmetros (ver gerar_combinacoes).
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            modo (str): Modo de simulação ('barras' ou 'eventos').
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão.
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+        
+        Yields:
+            dict: Índice da combinação, parâmetros e métricas do backtest, na ordem de conclusão.
+        """
+        combinacoes = self.gerar_combinacoes(grade)
+        parametros_simulacao = {
+            'risco_por_operacao': risco_por_operacao,
+            'stop_atr': stop_atr,
+            'take_profit_rr': take_profit_rr,
+            'modo': modo,
+            'encerrar_sessao': encerrar_sessao,
+            'trailing_stop': trailing_stop
+        }
+        tarefas = [(indice, estrategia, params, parametros_simulacao) for indice, params in enumerate(combinacoes)]
+        
+        if self.processos == 1 or len(tarefas) <= 1:
+            backtest = Backtesting(self.dados, self.capital_inicial, self.comissao, self.precisao)
+            for tarefa in tarefas:
+                yield _executar_tarefa(tarefa, backtest)
+            return
+        
+        with DadosCompartilhados(self.dados) as compartilhados:
+            argumentos = (compartilhados.descritor, self.capital_inicial, self.comissao, self.precisao)
+            tamanho_lote = max(1, len(tarefas) // (self.processos * 4))
+            with multiprocessing.Pool(self.processos, _inicializar_trabalhador, argumentos) as pool:
+                yield from pool.imap_unordered(_executar_tarefa, tarefas, chunksize=tamanho_lote)
+    
+    def otimizar(self, estrategia, grade, metrica='sharpe_ratio', risco_por_operacao=1.0, stop_atr=2.0,
+                 take_profit_rr=2.0, modo='barras', encerrar_sessao=False, trailing_stop=0.0, mostrar_progresso=True,
+                 intervalo_progresso=2.0):
+        """
+        Otimiza os parâmetros de uma estratégia e retorna a tabela ordenada.
+        
+        Durante a execução, informa periodicamente o progresso, a vazão
+        (backtests por segundo) e a melhor combinação encontrada até o momento.
+        
+        Args:
+            estrategia (str): Nome da estratégia (ver Backtesting._gerar_sinais).
+            grade (dict): Grade de parâmetros, ex.: {'periodo_curto': [5, 9, 13], 'periodo_longo': [21, 50]}.
+            metrica (str): Métrica de Backtesting usada no ranking (maior é melhor).
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            modo (str): Modo de simulação ('barras' ou 'eventos').
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão.
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+            mostrar_progresso (bool): Se True, imprime o progresso.
+            intervalo_progresso (float): Intervalo mínimo, em segundos, entre duas mensagens.
+        
+        Returns:
+            pandas.DataFrame: Uma linha por combinação, ordenada pela métrica.
+        """
+        total = len(self.gerar_combinacoes(grade))
+        resultados = []
+        melhor = None
+        inicio = time.perf_counter()
+        ultima_mensagem = inicio
+        
+        for resultado in self.iterar(estrategia, grade, risco_por_operacao, stop_atr, take_profit_rr, modo,
+                                     encerrar_sessao, trailing_stop):
+            resultados.append(resultado)
+            if melhor is None or resultado[metrica] > melhor[metrica] or melhor[metrica] != melhor[metrica]:
+                melhor = resultado
+            
+            agora = time.perf_counter()
+            if mostrar_progresso and (agora - ultima_mensagem >= intervalo_progresso or len(resultados) == total):
+                vazao = len(resultados) / max(agora - inicio, 1e-9)
+                print(f"[{len(resultados)}/{total}] {vazao:.1f} backtests/s - "
+                      f"melhor {metrica}: {melhor[metrica]:.4f} (combinação {melhor['combinacao']})")
+                ultima_mensagem = agora
+        
+        tabela = pd.DataFrame(resultados)
+        if tabela.empty:
+            return tabela
+        return tabela.sort_values(metrica, ascending=False, na_position='last', kind='stable').reset_index(drop=True)
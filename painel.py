@@ -0,0 +1,132 @@
+"""
+Módulo de Painéis (ativos x tempo) para o Robô Trader
+
+Este módulo permite que indicadores, padrões de price action e estratégias
+recebam painéis 2-D (DataFrames com uma coluna por ativo e uma linha por
+barra) e calculem todos os ativos em uma única chamada vetorizada.
+"""
+
+import functools
+
+import numpy as np
+import pandas as pd
+
+def montar_painel(dados_por_ativo, colunas=('open', 'high', 'low', 'close', 'volume')):
+    """
+    Alinha os dados OHLCV de vários ativos em painéis.
+    
+    Os índices são unidos; barras em que um ativo não negociou ficam NaN.
+    
+    Args:
+        dados_por_ativo (dict): Dicionário {ativo: DataFrame OHLCV}.
+        colunas (tuple): Colunas a extrair de cada DataFrame.
+    
+    Returns:
+        dict: Dicionário {coluna: DataFrame (barras x ativos)}.
+    """
+    return {
+        coluna: pd.DataFrame({ativo: dados[coluna] for ativo, dados in dados_por_ativo.items()}).sort_index()
+        for coluna in colunas
+    }
+
+def como_dados(valores, referencia):
+    """
+    Embala um array no mesmo formato (Series ou DataFrame) dos dados de referência.
+    
+    Args:
+        valores (numpy.ndarray): Valores calculados.
+        referencia (pandas.Series ou pandas.DataFrame): Dados de entrada.
+    
+    Returns:
+        pandas.Series ou pandas.DataFrame: Valores com o índice (e colunas) da referência.
+    """
+    if isinstance(referencia, pd.DataFrame):
+        return pd.DataFrame(valores, index=referencia.index, columns=referencia.columns)
+    return pd.Series(valores, index=referencia.index)
+
+def _valor_ausente(dtype):
+    """
+    Valor usado nas barras em que o ativo não negociou.
+    """
+    if dtype == bool:
+        return False
+    if np.issubdtype(dtype, np.integer):
+        return 0
+    return np.nan
+
+def _espalhar(resultado, ordem, validos):
+    """
+    Devolve um resultado calculado no painel compactado às posições originais
+    (ordem None: painel não foi reordenado) e marca as barras ausentes.
+    """
+    if isinstance(resultado, tuple):
+        return tuple(_espalhar(r, ordem, validos) for r in resultado)
+    if isinstance(resultado, dict):
+        return {chave: _espalhar(r, ordem, validos) for chave, r in resultado.items()}
+    if not isinstance(resultado, pd.DataFrame):
+        return resultado
+    
+    if ordem is None:
+        valores = resultado.to_numpy().copy()
+    else:
+        compactado = resultado.to_numpy()
+        valores = np.empty_like(compactado)
+        np.put_along_axis(valores, ordem, compactado, axis=0)
+    valores[~validos] = _valor_ausente(valores.dtype)
+    return pd.DataFrame(valores, index=resultado.index, columns=resultado.columns)
+
+def suportar_painel(funcao):
+    """
+    Decorador que torna uma função de séries tolerante a painéis desalinhados.
+    
+    Quando a função recebe DataFrames (barras x ativos) com lacunas internas
+    (dias em que algum ativo não negociou), as barras válidas de cada ativo
+    são compactadas para o topo da coluna, a função é chamada uma única vez
+    sobre o painel compactado e o resultado é devolvido às posições originais.
+    Assim, janelas móveis e cruzamentos de cada ativo consideram apenas as
+    barras em que ele negociou. Barras ausentes recebem NaN (ou 0/False em
+    sinais e padrões).
+    
+    Séries e painéis sem NaN são repassados diretamente, assim como painéis
+    cujas lacunas estão apenas no fim das colunas (sem compactação).
+    
+    Args:
+        funcao (callable): Função que aceita Series ou DataFrames alinhados.
+    
+    Returns:
+        callable: Função decorada.
+    """
+    @functools.wraps(funcao)
+    def wrapper(*args, **kwargs):
+        posicionais = [k for k, a in enumerate(args) if isinstance(a, pd.DataFrame)]
+        nomeados = [k for k, a in kwargs.items() if isinstance(a, pd.DataFrame)]
+        if not posicionais and not nomeados:
+            return funcao(*args, **kwargs)
+        
+        paineis = [args[k] for k in posicionais] + [kwargs[k] for k in nomeados]
+        validos = np.logical_and.reduce([p.notna().to_numpy() for p in paineis])
+        
+        if validos.all():
+            return funcao(*args, **kwargs)
+        
+        # Sem lacunas internas: cada coluna é válida até um ponto e vazia depois
+        if not np.diff(validos.astype(np.int8), axis=0).clip(min=0).any():
+            return _espalhar(funcao(*args, **kwargs), None, validos)
+        
+        ordem = np.argsort(~validos, axis=0, kind='stable')
+        validos_compactados = np.take_along_axis(validos, ordem, axis=0)
+        
+        def compactar(painel):
+            valores = np.take_along_axis(painel.to_numpy(dtype=np.float64), ordem, axis=0)
+            valores[~validos_compactados] = np.nan
+            return pd.DataFrame(valores, index=painel.index, columns=painel.columns)
+        
+        args = list(args)
+        for k in posicionais:
+            args[k] = compactar(args[k])
+        for k in nomeados:
+            kwargs[k] = compactar(kwargs[k])
+        
+        return _espalhar(funcao(*args, **kwargs), ordem, validos)
+    
+    return wrapper
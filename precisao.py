@@ -0,0 +1,169 @@
+"""
+Módulo de Precisão Numérica para o Robô Trader
+
+Este módulo controla o tipo de ponto flutuante (float64 ou float32) usado
+por IndicadoresTecnicos, PriceAction e Backtesting. Em históricos longos
+(anos de barras de 1 minuto para muitos ativos), o modo compacto float32
+reduz pela metade a memória ocupada pelos dados OHLCV e pelos indicadores.
+
+A precisão pode ser definida globalmente (definir_precisao), para um bloco
+de código (usar_precisao) ou por chamada (argumento `precisao` das funções
+decoradas com com_precisao). Chamadas aninhadas herdam a precisão da
+chamada externa.
+
+Precisão esperada do modo float32 em relação ao float64, medida por
+executar_benchmark.verificar_precisao em 1 milhão de barras de 1 minuto: o
+float32 guarda cerca de 7 dígitos significativos, então médias, bandas,
+MACD e ATR diferem em erro relativo da ordem de 1e-5 ou menos; RSI e
+estocástico, que dividem diferenças entre preços próximos, chegam a ~1e-2
+em janelas curtas quase planas. Sinais de cruzamento podem mudar de barra
+quando as duas curvas estão praticamente empatadas.
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+
+import numpy as np
+import pandas as pd
+
+# Tipos de ponto flutuante aceitos
+PRECISOES = {
+    'float64': np.float64,
+    'float32': np.float32
+}
+
+_precisao_padrao = np.float64
+_precisao_atual = contextvars.ContextVar('precisao', default=None)
+
+def _normalizar(precisao):
+    """
+    Converte 'float32', np.float32 ou np.dtype('float32') no tipo NumPy correspondente.
+    """
+    nome = np.dtype(precisao).name
+    if nome not in PRECISOES:
+        raise ValueError(f"Precisão '{precisao}' não suportada. Use 'float64' ou 'float32'.")
+    return PRECISOES[nome]
+
+def definir_precisao(precisao):
+    """
+    Define a precisão padrão de todo o processo.
+    
+    Args:
+        precisao (str ou numpy.dtype): 'float64' (padrão) ou 'float32'.
+    """
+    global _precisao_padrao
+    _precisao_padrao = _normalizar(precisao)
+
+def obter_precisao(precisao=None):
+    """
+    Resolve a precisão efetiva de uma chamada.
+    
+    Args:
+        precisao (str ou numpy.dtype): Precisão pedida explicitamente (None: herdada).
+    
+    Returns:
+        type: np.float64 ou np.float32.
+    """
+    if precisao is not None:
+        return _normalizar(precisao)
+    atual = _precisao_atual.get()
+    return atual if atual is not None else _precisao_padrao
+
+@contextlib.contextmanager
+def usar_precisao(precisao):
+    """
+    Gerenciador de contexto que define a precisão de um bloco de código.
+    
+    Args:
+        precisao (str ou numpy.dtype): Precisão do bloco (None: mantém a atual).
+    """
+    token = _precisao_atual.set(obter_precisao(precisao))
+    try:
+        yield
+    finally:
+        _precisao_atual.reset(token)
+
+def converter(dados, precisao=None):
+    """
+    Converte dados de ponto flutuante para a precisão indicada.
+    
+    Colunas inteiras, booleanas e de texto são preservadas; dados que já
+    estão na precisão pedida são devolvidos sem cópia.
+    
+    Args:
+        dados (pandas.Series, pandas.DataFrame, numpy.ndarray, tuple ou dict): Dados a converter.
+        precisao (str ou numpy.dtype): Precisão de destino (None: precisão atual).
+    
+    Returns:
+        object: Dados no mesmo formato, com valores de ponto flutuante na precisão pedida.
+    """
+    precisao = obter_precisao(precisao)
+    
+    if isinstance(dados, tuple):
+        return tuple(converter(d, precisao) for d in dados)
+    if isinstance(dados, dict):
+        return {chave: converter(d, precisao) for chave, d in dados.items()}
+    if isinstance(dados, pd.DataFrame):
+        flutuantes = [coluna for coluna, dtype in dados.dtypes.items() if dtype.kind == 'f' and dtype != precisao]
+        if not flutuantes:
+            return dados
+        return dados.astype({coluna: precisao for coluna in flutuantes})
+    if isinstance(dados, (pd.Series, np.ndarray)):
+        if dados.dtype.kind == 'f' and dados.dtype != precisao:
+            return dados.astype(precisao)
+    return dados
+
+def erro_relativo(referencia, aproximado):
+    """
+    Calcula o maior erro relativo entre dois resultados, ignorando NaN.
+    
+    Usado para comparar um resultado em float32 com a referência em float64.
+    
+    Args:
+        referencia (array-like): Resultado de referência.
+        aproximado (array-like): Resultado a comparar.
+    
+    Returns:
+        float: Maior |aproximado - referencia| / max(|referencia|, 1).
+    """
+    referencia = np.asarray(referencia, dtype=np.float64)
+    aproximado = np.asarray(aproximado, dtype=np.float64)
+    validos = np.isfinite(referencia) & np.isfinite(aproximado)
+    if not validos.any():
+        return 0.0
+    
+    diferenca = np.abs(aproximado[validos] - referencia[validos])
+    return float(np.max(diferenca / np.maximum(np.abs(referencia[validos]), 1.0)))
+
+def com_precisao(funcao):
+    """
+    Decorador que executa uma função na precisão resolvida para a chamada.
+    
+    Acrescenta o argumento nomeado `precisao` à função. As entradas de ponto
+    flutuante são convertidas antes da chamada, as saídas depois dela, e as
+    funções chamadas internamente herdam a mesma precisão.
+    
+    Args:
+        funcao (callable): Função que aceita Series, DataFrames ou arrays.
+    
+    Returns:
+        callable: Função decorada.
+    """
+    assinatura = inspect.signature(funcao)
+    
+    @functools.wraps(funcao)
+    def wrapper(*args, precisao=None, **kwargs):
+        precisao = obter_precisao(precisao)
+        args = [converter(a, precisao) for a in args]
+        kwargs = {chave: converter(a, precisao) for chave, a in kwargs.items()}
+        
+        with usar_precisao(precisao):
+            return converter(funcao(*args, **kwargs), precisao)
+    
+    wrapper.__signature__ = assinatura.replace(parameters=[
+        *assinatura.parameters.values(),
+        inspect.Parameter('precisao', inspect.Parameter.KEYWORD_ONLY, default=None)
+    ])
+    return wrapper
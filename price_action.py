@@ -6,11 +6,16 @@ identificação de padrões e geração de sinais de trading.
 """
 
 import numpy as np
-import pandas as pd
+from .niveis import AgrupadorNiveis, localizar_pivos, multiplicidade_pivos
+from .painel import como_dados, suportar_painel
+from .precisao import com_precisao
 
 class PriceAction:
     """
     Classe que implementa técnicas de price action para análise de mercado.
+    
+    Os padrões e a tendência aceitam o argumento nomeado `precisao`
+    ('float64' ou 'float32'), ver precisao.
     """
     
     @staticmethod
@@ -18,6 +23,10 @@ class PriceAction:
         """
         Identifica níveis de suporte e resistência baseados em máximos e mínimos recentes.
         
+        Os pivôs são os extremos locais vistos pelas janelas de `periodo` barras;
+        cada pivô é localizado uma vez e pesa no agrupamento tantas vezes quanto
+        o número de janelas que o contêm.
+        
         Args:
             dados_high (pandas.Series): Série de preços máximos.
             dados_low (pandas.Series): Série de preços mínimos.
@@ -28,29 +37,23 @@ class PriceAction:
         Returns:
             tuple: (Níveis de Suporte, Níveis de Resistência)
         """
-        suportes = []
-        resistencias = []
+        total_barras = len(dados_close)
         
-        for i in range(periodo, len(dados_close)):
-            # Analisar janela de dados
-            janela_low = dados_low.iloc[i-periodo:i]
-            janela_high = dados_high.iloc[i-periodo:i]
-            
-            # Encontrar mínimos locais (potenciais suportes)
-            for j in range(1, len(janela_low)-1):
-                if janela_low.iloc[j] < janela_low.iloc[j-1] and janela_low.iloc[j] < janela_low.iloc[j+1]:
-                    suportes.append(janela_low.iloc[j])
-            
-            # Encontrar máximos locais (potenciais resistências)
-            for j in range(1, len(janela_high)-1):
-                if janela_high.iloc[j] > janela_high.iloc[j-1] and janela_high.iloc[j] > janela_high.iloc[j+1]:
-                    resistencias.append(janela_high.iloc[j])
+        # Localizar cada pivô uma única vez, com o peso que teria ao varrer as janelas
+        posicoes_suporte = localizar_pivos(dados_low, maximo=False)
+        posicoes_resistencia = localizar_pivos(dados_high, maximo=True)
+        
+        pesos_suporte = multiplicidade_pivos(posicoes_suporte, total_barras, periodo)
+        pesos_resistencia = multiplicidade_pivos(posicoes_resistencia, total_barras, periodo)
         
         # Agrupar níveis próximos
-        suportes = PriceAction._agrupar_niveis(suportes, threshold)
-        resistencias = PriceAction._agrupar_niveis(resistencias, threshold)
+        agrupador_suportes = AgrupadorNiveis(threshold)
+        agrupador_suportes.adicionar_varios(np.asarray(dados_low, dtype=np.float64)[posicoes_suporte], pesos_suporte)
         
-        return suportes, resistencias
+        agrupador_resistencias = AgrupadorNiveis(threshold)
+        agrupador_resistencias.adicionar_varios(np.asarray(dados_high, dtype=np.float64)[posicoes_resistencia], pesos_resistencia)
+        
+        return agrupador_suportes.niveis(), agrupador_resistencias.niveis()
     
     @staticmethod
     def _agrupar_niveis(niveis, threshold):
@@ -87,6 +90,8 @@ class PriceAction:
         return niveis_agrupados
     
     @staticmethod
+    @com_precisao
+    @suportar_painel
     def identificar_tendencia(dados_close, periodo_curto=20, periodo_longo=50):
         """
         Identifica a tendência atual do mercado usando médias móveis.
@@ -104,22 +109,29 @@ class PriceAction:
         ma_curta = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_curto)
         ma_longa = IndicadoresTecnicos.media_movel_simples(dados_close, periodo_longo)
         
-        tendencia = pd.Series(0, index=dados_close.index)
-        tendencia[ma_curta > ma_longa] = 1  # Tendência de alta
-        tendencia[ma_curta < ma_longa] = -1  # Tendência de baixa
+        tendencia = np.where(ma_curta > ma_longa, 1, 0)  # Tendência de alta
+        tendencia = np.where(ma_curta < ma_longa, -1, tendencia)  # Tendência de baixa
         
-        return tendencia
+        return como_dados(tendencia, dados_close)
     
     @staticmethod
-    def identificar_candle_patterns(dados_open, dados_high, dados_low, dados_close):
+    @com_precisao
+    @suportar_painel
+    def identificar_candle_patterns(dados_open, dados_high, dados_low, dados_close, periodo_doji=20):
         """
         Identifica padrões de candles comuns em price action.
         
+        Todos os padrões são calculados com deslocamentos das séries, sem laços.
+        O doji é comparado com o corpo médio das últimas `periodo_doji` barras
+        (incluindo a atual), de modo que o resultado em cada barra depende apenas
+        do passado e pode ser calculado em janelas de streaming.
+        
         Args:
             dados_open (pandas.Series): Série de preços de abertura.
             dados_high (pandas.Series): Série de preços máximos.
             dados_low (pandas.Series): Série de preços mínimos.
             dados_close (pandas.Series): Série de preços de fechamento.
+            periodo_doji (int): Período da média móvel do corpo usada como referência do doji.
             
         Returns:
             dict: Dicionário com padrões identificados.
@@ -133,19 +145,20 @@ class PriceAction:
         candle_alta = dados_close > dados_open
         candle_baixa = dados_close < dados_open
         
+        # Valores das barras anteriores
+        open_1, close_1 = dados_open.shift(1), dados_close.shift(1)
+        open_2, close_2 = dados_open.shift(2), dados_close.shift(2)
+        corpo_1, corpo_2 = corpo.shift(1), corpo.shift(2)
+        candle_alta_1 = candle_alta.shift(1, fill_value=False)
+        candle_baixa_1 = candle_baixa.shift(1, fill_value=False)
+        candle_alta_2 = candle_alta.shift(2, fill_value=False)
+        candle_baixa_2 = candle_baixa.shift(2, fill_value=False)
+        
         # Identificar padrões
-        padroes = {
-            'doji': pd.Series(False, index=dados_close.index),
-            'martelo': pd.Series(False, index=dados_close.index),
-            'martelo_invertido': pd.Series(False, index=dados_close.index),
-            'engolfo_alta': pd.Series(False, index=dados_close.index),
-            'engolfo_baixa': pd.Series(False, index=dados_close.index),
-            'estrela_da_manha': pd.Series(False, index=dados_close.index),
-            'estrela_da_noite': pd.Series(False, index=dados_close.index)
-        }
-        
-        # Doji (corpo muito pequeno)
-        corpo_medio = corpo.mean()
+        padroes = {}
+        
+        # Doji (corpo muito pequeno em relação ao corpo médio recente)
+        corpo_medio = corpo.rolling(window=periodo_doji, min_periods=1).mean()
         padroes['doji'] = corpo < (0.1 * corpo_medio)
         
         # Martelo (sombra inferior longa, corpo pequeno, sombra superior pequena)
@@ -155,38 +168,40 @@ class PriceAction:
         padroes['martelo_invertido'] = (sombra_superior > (2 * corpo)) & (sombra_inferior < (0.3 * corpo))
         
         # Engolfo de alta (candle atual de alta engole o anterior de baixa)
-        for i in range(1, len(dados_close)):
-            if (candle_alta.iloc[i] and candle_baixa.iloc[i-1] and 
-                dados_open.iloc[i] <= dados_close.iloc[i-1] and 
-                dados_close.iloc[i] >= dados_open.iloc[i-1]):
-                padroes['engolfo_alta'].iloc[i] = True
+        padroes['engolfo_alta'] = (
+            candle_alta & candle_baixa_1 &
+            (dados_open <= close_1) &
+            (dados_close >= open_1)
+        )
         
         # Engolfo de baixa (candle atual de baixa engole o anterior de alta)
-        for i in range(1, len(dados_close)):
-            if (candle_baixa.iloc[i] and candle_alta.iloc[i-1] and 
-                dados_open.iloc[i] >= dados_close.iloc[i-1] and 
-                dados_close.iloc[i] <= dados_open.iloc[i-1]):
-                padroes['engolfo_baixa'].iloc[i] = True
+        padroes['engolfo_baixa'] = (
+            candle_baixa & candle_alta_1 &
+            (dados_open >= close_1) &
+            (dados_close <= open_1)
+        )
         
         # Estrela da manhã (padrão de reversão de baixa para alta)
-        for i in range(2, len(dados_close)):
-            if (candle_baixa.iloc[i-2] and 
-                corpo.iloc[i-1] < (0.5 * corpo.iloc[i-2]) and 
-                candle_alta.iloc[i] and 
-                dados_close.iloc[i] > (dados_open.iloc[i-2] + dados_close.iloc[i-2]) / 2):
-                padroes['estrela_da_manha'].iloc[i] = True
+        padroes['estrela_da_manha'] = (
+            candle_baixa_2 &
+            (corpo_1 < (0.5 * corpo_2)) &
+            candle_alta &
+            (dados_close > (open_2 + close_2) / 2)
+        )
         
         # Estrela da noite (padrão de reversão de alta para baixa)
-        for i in range(2, len(dados_close)):
-            if (candle_alta.iloc[i-2] and 
-                corpo.iloc[i-1] < (0.5 * corpo.iloc[i-2]) and 
-                candle_baixa.iloc[i] and 
-                dados_close.iloc[i] < (dados_open.iloc[i-2] + dados_close.iloc[i-2]) / 2):
-                padroes['estrela_da_noite'].iloc[i] = True
+        padroes['estrela_da_noite'] = (
+            candle_alta_2 &
+            (corpo_1 < (0.5 * corpo_2)) &
+            candle_baixa &
+            (dados_close < (open_2 + close_2) / 2)
+        )
         
         return padroes
     
     @staticmethod
+    @com_precisao
+    @suportar_painel
     def identificar_pin_bars(dados_open, dados_high, dados_low, dados_close, fator_sombra=2.0):
         """
         Identifica pin bars (barras de reversão) no gráfico.
@@ -215,6 +230,8 @@ class PriceAction:
         return pin_bar_alta, pin_bar_baixa
     
     @staticmethod
+    @com_precisao
+    @suportar_painel
     def identificar_inside_bars(dados_high, dados_low):
         """
         Identifica inside bars (barras internas) no gráfico.
@@ -226,11 +243,6 @@ class PriceAction:
         Returns:
             pandas.Series: Série booleana indicando onde ocorrem inside bars.
         """
-        inside_bars = pd.Series(False, index=dados_high.index)
-        
-        for i in range(1, len(dados_high)):
-            if (dados_high.iloc[i] <= dados_high.iloc[i-1] and 
-                dados_low.iloc[i] >= dados_low.iloc[i-1]):
-                inside_bars.iloc[i] = True
+        inside_bars = (dados_high <= dados_high.shift(1)) & (dados_low >= dados_low.shift(1))
         
         return inside_bars
@@ -0,0 +1,476 @@
+"""
+Módulo de Simulação de Operações para o Robô Trader
+
+Este módulo implementa o núcleo de simulação do backtesting sobre arrays
+NumPy: a máquina de estados de stop loss, take profit e sinal contrário de
+Backtesting.executar_backtest, sem acesso a Series nem criação de objetos
+por barra. Quando o numba está instalado, o núcleo é compilado (JIT); caso
+contrário, roda em Python puro sobre listas.
+
+O modo por eventos (simular_eventos) produz o mesmo resultado saltando
+direto de um sinal ao próximo e localizando a saída de cada posição com
+buscas vetorizadas, em tempo proporcional ao número de operações.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+from .metricas_incrementais import MetricasIncrementais, _atualizar_capital, _registrar_operacao, _repetir_capital
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Motivos de saída, na ordem dos códigos gravados por _simular
+MOTIVOS_SAIDA = ('Stop Loss', 'Take Profit', 'Sinal Contrário', 'Fim do Pregão', 'Trailing Stop')
+
+# Posições do vetor de estado da posição aberta, levado de uma simulação para a seguinte
+POSICAO, PRECO_ENTRADA, STOP_LOSS, STOP_INICIAL, TAKE_PROFIT, EXTREMO, FATOR_TRAILING = range(7)
+TAMANHO_ESTADO_POSICAO = 7
+
+# Tipos dos arrays de operações devolvidos pelas simulações
+TIPOS_OPERACOES = {
+    'barra_saida': np.int64,
+    'tipo': np.int8,
+    'preco_entrada': np.float64,
+    'preco_saida': np.float64,
+    'resultado': np.float64,
+    'motivo_saida': np.int8
+}
+
+def _registrar_saida(i, posicao, preco_entrada, preco_saida, motivo, capital, comissao, risco_por_operacao,
+                     estado, total_operacoes, barras_saida, tipos, precos_entrada, precos_saida, resultados, motivos):
+    """
+    Encerra a posição na barra i, grava a operação e acumula suas métricas.
+    
+    Returns:
+        float: Capital após a operação.
+    """
+    resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
+    resultado_liquido = resultado - comissao
+    capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
+    
+    barras_saida[total_operacoes] = i
+    tipos[total_operacoes] = posicao
+    precos_entrada[total_operacoes] = preco_entrada
+    precos_saida[total_operacoes] = preco_saida
+    resultados[total_operacoes] = resultado_liquido
+    motivos[total_operacoes] = motivo
+    _registrar_operacao(estado, resultado_liquido)
+    return capital
+
+def _simular(abertura, maxima, minima, fechamento, sinais, atr, fim_sessao, capital_inicial, comissao,
+             risco_por_operacao, stop_atr, take_profit_rr, trailing_stop, estado_posicao, capital_historico, posicoes,
+             estado, drawdown_historico, barras_saida, tipos, precos_entrada, precos_saida, resultados, motivos):
+    """
+    Executa a simulação barra a barra, gravando nos arrays de saída e
+    acumulando as métricas em `estado` (ver metricas_incrementais).
+    
+    A posição aberta é lida de `estado_posicao` no início e gravada nele no
+    fim, de modo que um histórico pode ser simulado em trechos consecutivos
+    (a última barra de um trecho é a primeira do seguinte).
+    
+    Com `trailing_stop` > 0, o stop acompanha o fechamento mais favorável
+    desde a entrada (o mesmo rastreamento O(1) de
+    gerenciamento_risco.TrailingStopIncremental) e nunca recua.
+    
+    Returns:
+        int: Número de operações gravadas.
+    """
+    n = len(sinais)
+    capital = capital_inicial
+    posicao = int(estado_posicao[POSICAO])
+    preco_entrada = estado_posicao[PRECO_ENTRADA]
+    stop_loss = estado_posicao[STOP_LOSS]
+    stop_inicial = estado_posicao[STOP_INICIAL]
+    take_profit = estado_posicao[TAKE_PROFIT]
+    extremo = estado_posicao[EXTREMO]
+    fator_trailing = estado_posicao[FATOR_TRAILING]
+    total_operacoes = 0
+    
+    capital_historico[0] = capital
+    drawdown_historico[0] = 0.0
+    
+    for i in range(1, n):
+        if posicao != 0:
+            motivo = -1
+            preco_saida = 0.0
+            
+            # Stop loss, take profit e sinal contrário, nesta ordem de prioridade
+            if (posicao == 1 and minima[i] <= stop_loss) or (posicao == -1 and maxima[i] >= stop_loss):
+                motivo = 0 if stop_loss == stop_inicial else 4
+                preco_saida = stop_loss
+            elif (posicao == 1 and maxima[i] >= take_profit) or (posicao == -1 and minima[i] <= take_profit):
+                motivo = 1
+                preco_saida = take_profit
+            elif (posicao == 1 and sinais[i] == -1) or (posicao == -1 and sinais[i] == 1):
+                motivo = 2
+                preco_saida = abertura[i]
+            
+            if motivo >= 0:
+                capital = _registrar_saida(i, posicao, preco_entrada, preco_saida, motivo, capital, comissao,
+                                           risco_por_operacao, estado, total_operacoes, barras_saida, tipos,
+                                           precos_entrada, precos_saida, resultados, motivos)
+                total_operacoes += 1
+                posicao = 0
+        
+        # Abrir nova posição no preço de abertura da barra do sinal
+        if posicao == 0 and sinais[i] != 0:
+            posicao = sinais[i]
+            preco_entrada = abertura[i]
+            distancia_stop = stop_atr * atr[i]
+            
+            if posicao == 1:
+                stop_loss = preco_entrada - distancia_stop
+                take_profit = preco_entrada + (distancia_stop * take_profit_rr)
+            else:
+                stop_loss = preco_entrada + distancia_stop
+                take_profit = preco_entrada - (distancia_stop * take_profit_rr)
+            stop_inicial = stop_loss
+            extremo = preco_entrada
+            fator_trailing = 1 - posicao * trailing_stop / 100
+        
+        # Zerar a posição no fechamento da última barra do pregão
+        if posicao != 0 and fim_sessao[i]:
+            capital = _registrar_saida(i, posicao, preco_entrada, fechamento[i], 3, capital, comissao,
+                                       risco_por_operacao, estado, total_operacoes, barras_saida, tipos,
+                                       precos_entrada, precos_saida, resultados, motivos)
+            total_operacoes += 1
+            posicao = 0
+        
+        # Acompanhar o fechamento mais favorável desde a entrada, valendo a partir da próxima barra
+        if posicao != 0 and trailing_stop > 0:
+            if posicao * (fechamento[i] - extremo) > 0:
+                extremo = fechamento[i]
+            nivel = extremo * fator_trailing
+            if posicao * (nivel - stop_loss) > 0:
+                stop_loss = nivel
+        
+        capital_historico[i] = capital
+        drawdown_historico[i] = _atualizar_capital(estado, capital)
+        posicoes[i-1] = posicao
+    
+    estado_posicao[POSICAO] = posicao
+    estado_posicao[PRECO_ENTRADA] = preco_entrada
+    estado_posicao[STOP_LOSS] = stop_loss
+    estado_posicao[STOP_INICIAL] = stop_inicial
+    estado_posicao[TAKE_PROFIT] = take_profit
+    estado_posicao[EXTREMO] = extremo
+    estado_posicao[FATOR_TRAILING] = fator_trailing
+    return total_operacoes
+
+if numba is not None:
+    _registrar_saida = numba.njit(cache=True, nogil=True)(_registrar_saida)
+    _simular = numba.njit(cache=True, nogil=True)(_simular)
+
+def _preparar_sessoes(dados_close, fim_sessao, n, trailing_stop=0.0):
+    """
+    Converte fechamentos e fins de pregão em arrays contíguos (sem pregões: nenhum fim marcado).
+    """
+    if dados_close is None and (fim_sessao is not None or trailing_stop > 0):
+        raise ValueError("A zeragem no fim do pregão e o trailing stop precisam dos preços de fechamento.")
+    fechamento = np.ascontiguousarray(dados_close, dtype=np.float64) if dados_close is not None else np.zeros(n)
+    if fim_sessao is None:
+        return fechamento, np.zeros(n, dtype=np.bool_)
+    return fechamento, np.ascontiguousarray(fim_sessao, dtype=np.bool_)
+
+def simular_operacoes(dados_open, dados_high, dados_low, sinais, atr, capital_inicial=10000.0, comissao=0.0,
+                      risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, dados_close=None, fim_sessao=None,
+                      metricas=None, trailing_stop=0.0, estado_posicao=None):
+    """
+    Simula as operações de uma série de sinais sobre arrays de preços.
+    
+    Reproduz exatamente o laço de Backtesting.executar_backtest: a posição é
+    aberta na abertura da barra do sinal, com stop loss e take profit a
+    `stop_atr` ATRs, e fechada no stop, no alvo ou na abertura da barra de um
+    sinal contrário. Com `fim_sessao`, posições ainda abertas na última barra
+    de um pregão são zeradas no fechamento dessa barra (day trade). Com
+    `trailing_stop`, o stop é puxado a cada fechamento para o percentual
+    indicado abaixo (compra) ou acima (venda) do fechamento mais favorável
+    desde a entrada, sem nunca recuar. Os preços e o capital são calculados
+    em float64.
+    
+    Args:
+        dados_open (array-like): Preços de abertura.
+        dados_high (array-like): Preços máximos.
+        dados_low (array-like): Preços mínimos.
+        sinais (array-like): Sinais (1 para compra, -1 para venda, 0 para neutro).
+        atr (array-like): ATR de cada barra.
+        capital_inicial (float): Capital inicial.
+        comissao (float): Comissão por operação (percentual).
+        risco_por_operacao (float): Percentual do capital arriscado por operação.
+        stop_atr (float): Multiplicador do ATR para stop loss.
+        take_profit_rr (float): Relação risco/retorno para take profit.
+        dados_close (array-like): Preços de fechamento (necessários com `fim_sessao` ou `trailing_stop`).
+        fim_sessao (array-like): Booleano, True na última barra de cada pregão
+            (ver intradiario.fins_sessao); None: sem zeragem no fim do pregão.
+        metricas (MetricasIncrementais): Acumulador atualizado durante a
+            simulação (padrão: um novo acumulador). Com o numba, o núcleo
+            libera o GIL e o acumulador pode ser lido de outra thread.
+        trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+        estado_posicao (numpy.ndarray): Posição aberta no fim de uma simulação
+            anterior ('estado_posicao' do resultado), para continuar o mesmo
+            histórico a partir da última barra simulada (padrão: sem posição).
+    
+    Returns:
+        dict: Arrays 'capital_historico' e 'drawdown_historico' (uma posição
+            por barra), 'posicoes' (a partir da segunda barra) e, por
+            operação, 'barra_saida', 'tipo' (1 ou -1), 'preco_entrada',
+            'preco_saida', 'resultado' e 'motivo_saida' (índice em
+            MOTIVOS_SAIDA), além do acumulador 'metricas' e da posição
+            aberta ao fim ('estado_posicao').
+    """
+    abertura = np.ascontiguousarray(dados_open, dtype=np.float64)
+    maxima = np.ascontiguousarray(dados_high, dtype=np.float64)
+    minima = np.ascontiguousarray(dados_low, dtype=np.float64)
+    sinais = np.ascontiguousarray(sinais, dtype=np.int64)
+    atr = np.ascontiguousarray(atr, dtype=np.float64)
+    n = len(sinais)
+    fechamento, fim_sessao = _preparar_sessoes(dados_close, fim_sessao, n, trailing_stop)
+    
+    metricas = metricas or MetricasIncrementais(capital_inicial)
+    if estado_posicao is None:
+        estado_posicao = np.zeros(TAMANHO_ESTADO_POSICAO)
+        estado_posicao[FATOR_TRAILING] = 1.0
+    estado_posicao = np.array(estado_posicao, dtype=np.float64)
+    
+    # Cada operação é aberta por um sinal não nulo (mais a posição já aberta), o que limita o total
+    max_operacoes = int(np.count_nonzero(sinais)) + 1
+    
+    entradas = (abertura, maxima, minima, fechamento, sinais, atr, fim_sessao)
+    if numba is None:
+        # Em Python puro, listas são indexadas muito mais rápido que arrays
+        entradas = tuple(a.tolist() for a in entradas)
+        capital_historico = [float(capital_inicial)] * max(n, 1)
+        drawdown_historico = [0.0] * max(n, 1)
+        posicoes = [0] * max(n - 1, 0)
+        estado = metricas.estado.tolist()
+        posicao_aberta = estado_posicao.tolist()
+        operacoes = {chave: [0] * max_operacoes for chave in TIPOS_OPERACOES}
+    else:
+        capital_historico = np.full(max(n, 1), float(capital_inicial))
+        drawdown_historico = np.zeros(max(n, 1))
+        posicoes = np.zeros(max(n - 1, 0), dtype=np.int8)
+        estado = metricas.estado
+        posicao_aberta = estado_posicao
+        operacoes = {chave: np.empty(max_operacoes, dtype=tipo) for chave, tipo in TIPOS_OPERACOES.items()}
+    
+    total_operacoes = 0
+    if n > 1:
+        total_operacoes = _simular(*entradas, float(capital_inicial), float(comissao), float(risco_por_operacao),
+                                   float(stop_atr), float(take_profit_rr), float(trailing_stop), posicao_aberta,
+                                   capital_historico, posicoes, estado, drawdown_historico, *operacoes.values())
+    metricas.estado[:] = estado
+    estado_posicao[:] = posicao_aberta
+    
+    resultado = {
+        chave: np.asarray(operacoes[chave][:total_operacoes], dtype=tipo)
+        for chave, tipo in TIPOS_OPERACOES.items()
+    }
+    resultado['capital_historico'] = np.asarray(capital_historico, dtype=np.float64)
+    resultado['drawdown_historico'] = np.asarray(drawdown_historico, dtype=np.float64)
+    resultado['posicoes'] = np.asarray(posicoes, dtype=np.int8)
+    resultado['metricas'] = metricas
+    resultado['estado_posicao'] = estado_posicao
+    return resultado
+
+def _primeiro_toque(minima, maxima, fechamento, inicio, fim, posicao, stop_loss, take_profit, trailing_stop=0.0,
+                    preco_entrada=0.0, bloco_inicial=32):
+    """
+    Localiza a primeira barra de [inicio, fim) que atinge o stop ou o alvo.
+    
+    A busca é galopante: blocos vetorizados que dobram de tamanho a cada
+    passo, de modo que saídas próximas custam pouco e posições longas
+    custam O(log) blocos. Com trailing stop, o nível de cada barra do bloco
+    vem do máximo (compra) ou mínimo (venda) acumulado dos fechamentos
+    anteriores, continuando do bloco anterior.
+    
+    Returns:
+        tuple: (posição da barra, nível do stop nessa barra); a posição é
+            fim se nenhuma barra atingir os níveis.
+    """
+    extremo = preco_entrada
+    fator_trailing = 1 - posicao * trailing_stop / 100
+    acumular = np.maximum.accumulate if posicao == 1 else np.minimum.accumulate
+    
+    tamanho = bloco_inicial
+    while inicio < fim:
+        parada = min(inicio + tamanho, fim)
+        niveis = stop_loss
+        if trailing_stop > 0:
+            # Fechamentos de inicio-1 a parada-2: cada barra usa os fechamentos até a anterior
+            extremos = acumular(np.concatenate(([extremo], fechamento[inicio - 1:parada - 1])))[1:]
+            extremo = extremos[-1]
+            niveis = np.maximum(extremos * fator_trailing, stop_loss) if posicao == 1 else \
+                np.minimum(extremos * fator_trailing, stop_loss)
+        
+        if posicao == 1:
+            toque = (minima[inicio:parada] <= niveis) | (maxima[inicio:parada] >= take_profit)
+        else:
+            toque = (maxima[inicio:parada] >= niveis) | (minima[inicio:parada] <= take_profit)
+        
+        k = int(toque.argmax())
+        if toque[k]:
+            return inicio + k, float(niveis[k]) if trailing_stop > 0 else stop_loss
+        
+        inicio = parada
+        tamanho *= 2
+    
+    return fim, stop_loss
+
+def simular_eventos(dados_open, dados_high, dados_low, sinais, atr, capital_inicial=10000.0, comissao=0.0,
+                    risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, dados_close=None, fim_sessao=None,
+                    metricas=None, trailing_stop=0.0):
+    """
+    Simula as operações saltando entre eventos, sem percorrer barra a barra.
+    
+    Sem posição, a simulação salta direto para o próximo sinal não nulo
+    (busca binária nas posições dos sinais). Com posição aberta, a saída é a
+    primeira barra que atinge o stop loss ou o take profit (busca galopante
+    vetorizada) ou, se vier antes, o próximo sinal contrário ou o fim do
+    pregão (buscas binárias).
+    O resultado é idêntico ao de simular_operacoes, e o custo cresce com o
+    número de operações e de barras em posição, não com o total de barras;
+    as barras sem variação de capital entre duas saídas entram de uma vez
+    no acumulador de métricas.
+    
+    Args:
+        dados_open (array-like): Preços de abertura.
+        dados_high (array-like): Preços máximos.
+        dados_low (array-like): Preços mínimos.
+        sinais (array-like): Sinais (1 para compra, -1 para venda, 0 para neutro).
+        atr (array-like): ATR de cada barra.
+        capital_inicial (float): Capital inicial.
+        comissao (float): Comissão por operação (percentual).
+        risco_por_operacao (float): Percentual do capital arriscado por operação.
+        stop_atr (float): Multiplicador do ATR para stop loss.
+        take_profit_rr (float): Relação risco/retorno para take profit.
+        dados_close (array-like): Preços de fechamento (necessários com `fim_sessao` ou `trailing_stop`).
+        fim_sessao (array-like): Booleano, True na última barra de cada pregão.
+        metricas (MetricasIncrementais): Acumulador atualizado durante a simulação.
+        trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+    
+    Returns:
+        dict: Mesmo formato de simular_operacoes.
+    """
+    abertura = np.ascontiguousarray(dados_open, dtype=np.float64)
+    maxima = np.ascontiguousarray(dados_high, dtype=np.float64)
+    minima = np.ascontiguousarray(dados_low, dtype=np.float64)
+    sinais = np.ascontiguousarray(sinais, dtype=np.int64)
+    atr = np.ascontiguousarray(atr, dtype=np.float64)
+    n = len(sinais)
+    fechamento, fim_sessao = _preparar_sessoes(dados_close, fim_sessao, n, trailing_stop)
+    barras_fim_sessao = np.flatnonzero(fim_sessao).tolist()
+    
+    # Posições dos sinais (a primeira barra nunca abre posição), em listas para busca binária rápida
+    barras_sinal = np.flatnonzero(sinais[1:]) + 1
+    barras_compra = barras_sinal[sinais[barras_sinal] == 1].tolist()
+    barras_venda = barras_sinal[sinais[barras_sinal] == -1].tolist()
+    tipos_sinal = sinais[barras_sinal].tolist()
+    barras_sinal = barras_sinal.tolist()
+    
+    operacoes = {chave: [] for chave in TIPOS_OPERACOES}
+    capitais = [float(capital_inicial)]
+    variacao_posicao = np.zeros(n + 1, dtype=np.int64)
+    capital = float(capital_inicial)
+    cursor = 1
+    
+    metricas = metricas or MetricasIncrementais(capital_inicial)
+    estado = metricas.estado
+    ultima_saida = 0
+    pendente = False
+    
+    while True:
+        # Saltar para o próximo sinal
+        proximo = bisect_left(barras_sinal, cursor)
+        if proximo == len(barras_sinal):
+            break
+        
+        entrada = barras_sinal[proximo]
+        posicao = tipos_sinal[proximo]
+        preco_entrada = float(abertura[entrada])
+        distancia_stop = stop_atr * float(atr[entrada])
+        
+        if posicao == 1:
+            stop_loss = preco_entrada - distancia_stop
+            take_profit = preco_entrada + (distancia_stop * take_profit_rr)
+            opostos = barras_venda
+        else:
+            stop_loss = preco_entrada + distancia_stop
+            take_profit = preco_entrada - (distancia_stop * take_profit_rr)
+            opostos = barras_compra
+        
+        # Próximo sinal contrário, fim do pregão e primeiro toque no stop ou no alvo até eles
+        indice_oposto = bisect_left(opostos, entrada + 1)
+        oposto = opostos[indice_oposto] if indice_oposto < len(opostos) else n
+        indice_fim = bisect_left(barras_fim_sessao, entrada)
+        fim = barras_fim_sessao[indice_fim] if indice_fim < len(barras_fim_sessao) else n
+        limite = min(oposto + 1, fim + 1, n)
+        saida, nivel_stop = _primeiro_toque(minima, maxima, fechamento, entrada + 1, limite, posicao, stop_loss,
+                                            take_profit, trailing_stop, preco_entrada)
+        
+        variacao_posicao[entrada] += posicao
+        if saida < limite:
+            stop = minima[saida] <= nivel_stop if posicao == 1 else maxima[saida] >= nivel_stop
+            motivo = (0 if nivel_stop == stop_loss else 4) if stop else 1
+            preco_saida = nivel_stop if stop else take_profit
+        elif oposto <= fim and oposto < n:
+            saida = oposto
+            motivo = 2
+            preco_saida = float(abertura[saida])
+        elif fim < n:
+            # A posição é zerada no fechamento; o sinal contrário da mesma barra já foi tratado acima
+            saida = fim
+            motivo = 3
+            preco_saida = float(fechamento[saida])
+        else:
+            # Posição aberta até o fim do histórico
+            break
+        variacao_posicao[saida] -= posicao
+        
+        resultado = posicao * (preco_saida - preco_entrada) / preco_entrada * 100
+        resultado_liquido = resultado - comissao
+        capital = capital * (1 + (resultado_liquido / 100) * (risco_por_operacao / 100) * 100)
+        capitais.append(capital)
+        
+        # O capital de uma barra entra nas métricas uma única vez, após a última saída da barra
+        # (um stop seguido de reentrada e zeragem no fechamento do pregão encerra duas operações)
+        if saida != ultima_saida:
+            if pendente:
+                _atualizar_capital(estado, capital_pendente)
+            _repetir_capital(estado, saida - ultima_saida - 1)
+        capital_pendente = capital
+        pendente = True
+        _registrar_operacao(estado, resultado_liquido)
+        ultima_saida = saida
+        
+        operacoes['barra_saida'].append(saida)
+        operacoes['tipo'].append(posicao)
+        operacoes['preco_entrada'].append(preco_entrada)
+        operacoes['preco_saida'].append(preco_saida)
+        operacoes['resultado'].append(resultado_liquido)
+        operacoes['motivo_saida'].append(motivo)
+        
+        # A barra da saída pode abrir uma nova posição, exceto quando a saída é no fechamento do pregão
+        cursor = saida + 1 if motivo == 3 else saida
+    
+    if pendente:
+        _atualizar_capital(estado, capital_pendente)
+    _repetir_capital(estado, n - ultima_saida - 1)
+    
+    resultado = {chave: np.asarray(operacoes[chave], dtype=tipo) for chave, tipo in TIPOS_OPERACOES.items()}
+    
+    # Capital constante entre saídas e posição constante entre entrada e saída
+    barras = np.arange(max(n, 1))
+    indices_capital = np.searchsorted(resultado['barra_saida'], barras, side='right')
+    resultado['capital_historico'] = np.asarray(capitais)[indices_capital]
+    # O pico considera apenas o capital ao fim de cada barra (a última saída de cada barra)
+    saidas = resultado['barra_saida']
+    finais = np.ones(len(capitais), dtype=bool)
+    finais[1:-1] = saidas[1:] != saidas[:-1]
+    picos = np.maximum.accumulate(np.where(finais, capitais, capitais[0]))
+    resultado['drawdown_historico'] = ((np.asarray(capitais) - picos) / picos * 100)[indices_capital]
+    resultado['posicoes'] = np.cumsum(variacao_posicao[:n])[1:].astype(np.int8)
+    resultado['metricas'] = metricas
+    return resultado
@@ -0,0 +1,219 @@
+"""
+Módulo de Análise Walk-Forward para o Robô Trader
+
+Este módulo valida estratégias fora da amostra: os parâmetros são
+otimizados em uma janela de treino e aplicados na janela seguinte (teste),
+que então avança pelo histórico. Os sinais de cada combinação da grade são
+calculados uma única vez sobre o histórico completo (os indicadores são
+causais, então o valor em uma barra não depende das barras seguintes) e
+reaproveitados por todas as janelas que se sobrepõem; cada janela apenas
+simula o seu trecho. As janelas são avaliadas em paralelo por um pool de
+processos que lê os dados e os sinais em memória compartilhada.
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append('/home/ubuntu/robo_trader/src')
+from testes.backtesting import Backtesting
+from testes.dados_compartilhados import DadosCompartilhados
+from testes.otimizador import CAMPOS_DESCARTADOS, OtimizadorParametros
+
+# Estado de cada processo de trabalho, criado por _inicializar_trabalhador
+_segmentos = None
+_backtest = None
+_sinais = None
+
+def _inicializar_trabalhador(descritor_dados, descritor_sinais, capital_inicial, comissao, precisao):
+    """
+    Anexa os dados e os sinais compartilhados e cria o Backtesting do processo de trabalho.
+    """
+    global _segmentos, _backtest, _sinais
+    segmento_dados, dados = DadosCompartilhados.anexar(descritor_dados)
+    segmento_sinais, sinais = DadosCompartilhados.anexar(descritor_sinais)
+    _segmentos = (segmento_dados, segmento_sinais)
+    _backtest = Backtesting(dados, capital_inicial=capital_inicial, comissao=comissao, precisao=precisao)
+    _sinais = [sinais[coluna].to_numpy() for coluna in sinais.columns]
+
+def _avaliar_janela(tarefa, backtest=None, sinais=None):
+    """
+    Escolhe a melhor combinação no treino de uma janela e a simula no teste.
+    
+    Returns:
+        dict: Índice da janela, combinação escolhida, métrica de treino e resultados do teste.
+    """
+    indice, treino, teste, metrica, parametros_simulacao = tarefa
+    backtest = backtest or _backtest
+    sinais = sinais if sinais is not None else _sinais
+    
+    melhor, melhor_valor = None, None
+    for combinacao, sinais_combinacao in enumerate(sinais):
+        valor = backtest.simular(sinais_combinacao, barras=slice(*treino), **parametros_simulacao)[metrica]
+        # NaN nunca é escolhido enquanto houver uma combinação com métrica válida
+        if melhor is None or valor > melhor_valor or (melhor_valor != melhor_valor and valor == valor):
+            melhor, melhor_valor = combinacao, valor
+    
+    resultados_teste = backtest.simular(sinais[melhor], barras=slice(*teste), **parametros_simulacao)
+    return {'janela': indice, 'combinacao': melhor, 'metrica_treino': melhor_valor, 'teste': resultados_teste}
+
+class WalkForward:
+    """
+    Executa a otimização walk-forward de uma estratégia.
+    """
+    
+    def __init__(self, dados_historicos, capital_inicial=10000.0, comissao=0.0, precisao=None, processos=None):
+        """
+        Inicializa a análise walk-forward.
+        
+        Args:
+            dados_historicos (pandas.DataFrame): DataFrame com dados históricos (OHLCV).
+            capital_inicial (float): Capital inicial para simulação.
+            comissao (float): Valor da comissão por operação (percentual).
+            precisao (str): Precisão dos dados e indicadores ('float64' ou 'float32').
+            processos (int): Número de processos de trabalho (padrão: número de núcleos).
+        """
+        self.backtest = Backtesting(dados_historicos, capital_inicial, comissao, precisao)
+        self.capital_inicial = capital_inicial
+        self.comissao = comissao
+        self.precisao = precisao
+        self.processos = processos or os.cpu_count() or 1
+        self.resultados = None
+    
+    @staticmethod
+    def gerar_janelas(total_barras, barras_treino, barras_teste, ancorado=False):
+        """
+        Divide o histórico em janelas consecutivas de treino e teste.
+        
+        As janelas de teste são contíguas e não se sobrepõem, de modo que
+        juntas formam um único período fora da amostra.
+        
+        Args:
+            total_barras (int): Número de barras do histórico.
+            barras_treino (int): Tamanho da janela de treino.
+            barras_teste (int): Tamanho da janela de teste.
+            ancorado (bool): Se True, o treino sempre começa na primeira barra e cresce a cada janela.
+        
+        Returns:
+            list: Lista de tuplas ((inicio_treino, fim_treino), (inicio_teste, fim_teste)),
+                com fins exclusivos.
+        """
+        if barras_treino < 2 or barras_teste < 2:
+            raise ValueError("As janelas de treino e de teste precisam de pelo menos 2 barras.")
+        
+        janelas = []
+        inicio_teste = barras_treino
+        while inicio_teste < total_barras:
+            fim_teste = min(inicio_teste + barras_teste, total_barras)
+            if fim_teste - inicio_teste < 2:
+                break
+            inicio_treino = 0 if ancorado else inicio_teste - barras_treino
+            janelas.append(((inicio_treino, inicio_teste), (inicio_teste, fim_teste)))
+            inicio_teste = fim_teste
+        return janelas
+    
+    def _gerar_sinais(self, estrategia, combinacoes):
+        """
+        Gera, sobre o histórico completo, a matriz de sinais (barras x combinações).
+        """
+        return pd.DataFrame({
+            f'combinacao_{indice}': self.backtest.gerar_sinais(estrategia, params).to_numpy(dtype=np.int8)
+            for indice, params in enumerate(combinacoes)
+        })
+    
+    def executar(self, estrategia, grade, barras_treino, barras_teste, ancorado=False,
+                 metrica='sharpe_ratio', risco_por_operacao=1.0, stop_atr=2.0, take_profit_rr=2.0, modo='barras',
+                 encerrar_sessao=False, trailing_stop=0.0):
+        """
+        Executa a análise walk-forward.
+        
+        Args:
+            estrategia (str): Nome da estratégia (ver Backtesting._gerar_sinais).
+            grade (dict): Grade de parâmetros (ver OtimizadorParametros.gerar_combinacoes).
+            barras_treino (int): Tamanho da janela de treino.
+            barras_teste (int): Tamanho da janela de teste.
+            ancorado (bool): Se True, o treino sempre começa na primeira barra.
+            metrica (str): Métrica de Backtesting usada na escolha dos parâmetros (maior é melhor).
+            risco_por_operacao (float): Percentual do capital a ser arriscado por operação.
+            stop_atr (float): Multiplicador do ATR para stop loss.
+            take_profit_rr (float): Relação risco/retorno para take profit.
+            modo (str): Modo de simulação ('barras' ou 'eventos').
+            encerrar_sessao (bool): Se True, zera as posições no fechamento de cada pregão.
+            trailing_stop (float): Distância percentual do trailing stop (0: desativado).
+        
+        Returns:
+            dict: 'janelas' (DataFrame com os limites, parâmetros escolhidos e
+                métricas de cada janela), 'capital_historico' (curva de capital
+                fora da amostra, emendada entre as janelas), 'operacoes' e as
+                métricas de desempenho fora da amostra.
+        """
+        dados = self.backtest.dados
+        janelas = self.gerar_janelas(len(dados), barras_treino, barras_teste, ancorado)
+        if not janelas:
+            raise ValueError("Histórico insuficiente para uma janela de treino e uma de teste.")
+        
+        combinacoes = OtimizadorParametros.gerar_combinacoes(grade)
+        sinais = self._gerar_sinais(estrategia, combinacoes)
+        parametros_simulacao = {
+            'risco_por_operacao': risco_por_operacao,
+            'stop_atr': stop_atr,
+            'take_profit_rr': take_profit_rr,
+            'modo': modo,
+            'encerrar_sessao': encerrar_sessao,
+            'trailing_stop': trailing_stop
+        }
+        tarefas = [(indice, treino, teste, metrica, parametros_simulacao) for indice, (treino, teste) in enumerate(janelas)]
+        
+        if self.processos == 1 or len(tarefas) <= 1:
+            colunas = [sinais[coluna].to_numpy() for coluna in sinais.columns]
+            avaliacoes = [_avaliar_janela(tarefa, self.backtest, colunas) for tarefa in tarefas]
+        else:
+            with DadosCompartilhados(dados) as dados_compartilhados, DadosCompartilhados(sinais) as sinais_compartilhados:
+                argumentos = (dados_compartilhados.descritor, sinais_compartilhados.descritor,
+                              self.capital_inicial, self.comissao, self.precisao)
+                with multiprocessing.Pool(min(self.processos, len(tarefas)), _inicializar_trabalhador, argumentos) as pool:
+                    avaliacoes = pool.map(_avaliar_janela, tarefas, chunksize=1)
+        
+        self.resultados = self._consolidar(janelas, combinacoes, avaliacoes, metrica)
+        return self.resultados
+    
+    def _consolidar(self, janelas, combinacoes, avaliacoes, metrica):
+        """
+        Emenda as curvas de capital das janelas de teste e calcula as métricas fora da amostra.
+        
+        Cada janela de teste começa com o capital inicial; sua curva é
+        escalada pelo capital acumulado nas janelas anteriores, como se o
+        capital fosse reinvestido. Os livros de operações são concatenados.
+        """
+        indice = self.backtest.dados.index
+        linhas = []
+        curvas = []
+        operacoes = []
+        escala = 1.0
+        
+        for ((inicio_treino, fim_treino), (inicio_teste, fim_teste)), avaliacao in zip(janelas, avaliacoes):
+            teste = avaliacao['teste']
+            linhas.append({
+                'janela': avaliacao['janela'],
+                'inicio_treino': indice[inicio_treino],
+                'fim_treino': indice[fim_treino - 1],
+                'inicio_teste': indice[inicio_teste],
+                'fim_teste': indice[fim_teste - 1],
+                'combinacao': avaliacao['combinacao'],
+                **combinacoes[avaliacao['combinacao']],
+                f'{metrica}_treino': avaliacao['metrica_treino'],
+                **{chave: valor for chave, valor in teste.items() if chave not in CAMPOS_DESCARTADOS}
+            })
+            
+            curva = teste['capital_historico'] * escala
+            curvas.append(pd.Series(curva, index=indice[inicio_teste:fim_teste]))
+            operacoes.append(teste['operacoes'])
+            escala = curva[-1] / self.capital_inicial
+        
+        capital_historico = pd.concat(curvas)
+        resultados = self.backtest._calcular_metricas(capital_historico.to_numpy(), np.concatenate(operacoes))
+        resultados['capital_historico'] = capital_historico
+        resultados['janelas'] = pd.DataFrame(linhas)
+        return resultados